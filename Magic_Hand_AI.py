@@ -1,135 +1,249 @@
+import time
 import os
 import cv2
-import mediapipe as mp
 import numpy as np
-import time
 import threading
 import queue
-from collections import deque
-import pyautogui
+import multiprocessing
+import concurrent.futures
+from multiprocessing import shared_memory
+from collections import deque, OrderedDict
 import traceback
 import platform
-import comtypes
 import logging
 import warnings
 import sys
+import argparse
+import json
+import bisect
+import http.server
+import asyncio
+import subprocess
+import tempfile
+import shutil
+import socket
+import socketserver
+import signal
+import urllib.request
+import contextlib
+import zlib
+import types
+import abc
 
-# Try to import pyfiglet and colorama for enhanced ASCII art banner
-try:
-    import pyfiglet
-    from colorama import init, Fore, Back, Style
-    init(autoreset=True)  # Initialize colorama
-    pyfiglet_available = True
-    colorama_available = True
-except ImportError:
-    pyfiglet_available = False
-    colorama_available = False
-    print("For a better experience, install pyfiglet and colorama: pip install pyfiglet colorama")
-    
-# Try to import termcolor for additional color options
-try:
-    from termcolor import colored
-    termcolor_available = True
-except ImportError:
-    termcolor_available = False
+MODULE_LOAD_START = time.perf_counter()  # Start of the "import" phase (module body) in the startup profile
 
 # Suppress MediaPipe warnings
 os.environ["MEDIAPIPE_DISABLE_GPU"] = "1"  # Force CPU to avoid some warnings
 logging.getLogger("absl").setLevel(logging.ERROR)  # Suppress absl warnings
 warnings.filterwarnings("ignore", category=UserWarning)  # Suppress general warnings
 
-# Import and initialize system volume control library (Windows)
-try:
-    from ctypes import cast, POINTER
-    from comtypes import CLSCTX_ALL
-    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-    volume_lib_available = True
-except ImportError:
-    volume_lib_available = False
-    print("Could not import pycaw library. Volume will be controlled using shortcut keys.")
-    print("To install: pip install pycaw comtypes")
-
-# Try to import Selenium
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.service import Service
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from webdriver_manager.chrome import ChromeDriverManager
-    selenium_available = True
-except ImportError:
-    selenium_available = False
-    print("Could not import Selenium library. Please install: pip install selenium webdriver-manager")
-
-# Setup MediaPipe Hands with optimized configuration
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
-    max_num_hands=2,
-    min_detection_confidence=0.7,  # Increase detection accuracy
-    min_tracking_confidence=0.7,   # Increase tracking accuracy
-    static_image_mode=False
-)
-mp_drawing = mp.solutions.drawing_utils
-mp_drawing_styles = mp.solutions.drawing_styles
+# Heavy and platform specific libraries are imported on first use by the load_* functions below,
+# so importing this module is cheap and works without a browser or the Windows audio stack.
+# The loaders return the library (None if it can't be used), these are their caches
+mp = None
+pyautogui = None
+selenium = None              # webdriver, Service and ChromeDriverManager
+websocket = None
+pyautogui_available = None   # None: not tried yet
+selenium_available = None
+websocket_available = None
+volume_lib_available = False
+
+# MediaPipe Hands configuration
+MAX_HANDS = 2
+
+def load_mediapipe():
+    """Import MediaPipe (takes a good part of a second), return the module"""
+    global mp
+    if mp is None:
+        import mediapipe
+        mp = mediapipe
+    return mp
+
+def create_hands_model(max_hands=MAX_HANDS, static_image_mode=False):
+    """New MediaPipe Hands instance with the optimized configuration
+
+    static_image_mode: detect palms on every frame instead of tracking the hands of the previous one
+    """
+    return load_mediapipe().solutions.hands.Hands(
+        max_num_hands=max_hands,
+        min_detection_confidence=0.7,  # Increase detection accuracy
+        min_tracking_confidence=0.7,   # Increase tracking accuracy
+        static_image_mode=static_image_mode
+    )
+
+def load_pyautogui():
+    """Import pyautogui for the volume key fallback, None if it can't be used (e.g. no display)"""
+    global pyautogui, pyautogui_available
+    if pyautogui_available is None:
+        try:
+            import pyautogui as module
+            pyautogui = module
+            pyautogui_available = True
+        except Exception as e:
+            pyautogui_available = False
+            print(f"Volume keys not available ({type(e).__name__}: {e})")
+    return pyautogui
+
+def load_selenium():
+    """Import Selenium for the selenium browser backend -> namespace with webdriver, Service, ChromeDriverManager,
+    WebDriverWait and the WebDriverException/TimeoutException types, None if it isn't installed"""
+    global selenium, selenium_available
+    if selenium_available is None:
+        try:
+            from selenium import webdriver
+            from selenium.common.exceptions import TimeoutException, WebDriverException
+            from selenium.webdriver.chrome.service import Service
+            from selenium.webdriver.support.ui import WebDriverWait
+            from webdriver_manager.chrome import ChromeDriverManager
+            selenium = types.SimpleNamespace(webdriver=webdriver, Service=Service, ChromeDriverManager=ChromeDriverManager,
+                                             WebDriverWait=WebDriverWait, WebDriverException=WebDriverException,
+                                             TimeoutException=TimeoutException)
+            selenium_available = True
+        except ImportError:
+            selenium_available = False
+            print("Could not import Selenium library. Please install: pip install selenium webdriver-manager")
+    return selenium
+
+def load_websocket():
+    """Import websocket-client (installed with Selenium) for the DevTools browser backend, None if it isn't installed"""
+    global websocket, websocket_available
+    if websocket_available is None:
+        try:
+            import websocket as module
+            websocket = module
+            websocket_available = True
+        except ImportError:
+            websocket_available = False
+    return websocket
+
+class StartupProfile:
+    """Wall-clock phases of the startup, relative to the start of the module import (--startup-profile)"""
+    def __init__(self, origin):
+        self.origin = origin
+        self.phases = []  # (name, start, end), end == start for single events
+        self.lock = threading.Lock()
+
+    def add(self, name, start, end=None):
+        with self.lock:
+            self.phases.append((name, start, start if end is None else end))
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter())
+
+    def mark(self, name):
+        """Record an event, only its first occurrence counts"""
+        with self.lock:
+            if any(phase[0] == name for phase in self.phases):
+                return
+            now = time.perf_counter()
+            self.phases.append((name, now, now))
+
+    def report(self):
+        """Print the phases in start order, return them as a list of dicts (milliseconds)"""
+        with self.lock:
+            phases = sorted(self.phases, key=lambda phase: phase[1])
+        rows = [{'phase': name, 'start_ms': round((start - self.origin) * 1000, 1),
+                 'end_ms': round((end - self.origin) * 1000, 1), 'duration_ms': round((end - start) * 1000, 1)}
+                for name, start, end in phases]
+        print(f"\n{'startup phase':<28}{'start ms':>10}{'end ms':>10}{'took ms':>10}")
+        for row in rows:
+            print(f"{row['phase']:<28}{row['start_ms']:>10}{row['end_ms']:>10}{row['duration_ms']:>10}")
+        return rows
+
+startup_profile = StartupProfile(MODULE_LOAD_START)
 
-# Optimized queue with small size
-frame_queue = queue.Queue(maxsize=1)
-result_queue = queue.Queue(maxsize=1)
 
 # Global variables
 current_volume = 50                # Internal volume
 system_volume = 50                 # Actual system volume
-last_volume_change_time = 0
+last_volume_change_time = 0        # Capture time (time.perf_counter()) of the frame that last changed the volume
 fps_values = deque(maxlen=10)      # Reduced size for faster response
 processing_active = True
+frame_source = None                # Where camera_reader gets frames from (webcam by default)
+landmark_recorder = None           # LandmarkRecorder of --record-landmarks
 
 # Variables for YouTube playback speed control
 current_speed = 1.0
 target_speed = 1.0
-last_speed_change_time = 0
+last_speed_change_time = 0         # Capture time (time.perf_counter()) of the frame that last changed the speed
 prev_left_hand_distance = None
 speed_values = [0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0]
 speed_index = 3  # Initial speed = 1.0
-speed_direction_bias = 0  # To track change trend
+
+# Status shown next to the volume and speed bars
+last_volume_status = ""
+last_speed_status = ""
+speed_trend = 0  # 0: no change, 1: increase, -1: decrease
 
 # Distance history (for motion prediction)
 distance_history = deque(maxlen=5)
 filtered_distance_history = deque(maxlen=20)  # Store filtered values
 
-# Global variables for Selenium driver
-driver = None
+# Global variables for the browser connection
+browser = None  # BrowserBackend of the video tab
+browser_backend = "selenium"  # Key of BROWSER_BACKENDS
 video_url = None
 selenium_active = False
 browser_type = "chrome"  # Default browser type
+browser_settings = None  # BrowserBackend.launch() arguments, kept for reconnecting
+browser_remote_url = None  # WebDriver server to connect to instead of starting a browser
+browser_health_interval = 2.0  # Seconds between controller liveness checks, 0 disables them
 
-# Initialize system volume control
+# System volume control (pycaw, Windows only), set up by init_volume_control()
 volume_controller = None
-if volume_lib_available:
+
+def init_volume_control():
+    """Import pycaw and connect to the system volume, falling back to the volume keys"""
+    global volume_lib_available, volume_controller, system_volume, current_volume
+    
+    if platform.system() != "Windows":
+        print("Direct system volume control needs Windows (pycaw). Volume will be controlled using shortcut keys.")
+        return False
+    try:
+        from ctypes import cast, POINTER
+        from comtypes import CLSCTX_ALL
+        from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+        volume_lib_available = True
+    except ImportError:
+        volume_lib_available = False
+        print("Could not import pycaw library. Volume will be controlled using shortcut keys.")
+        print("To install: pip install pycaw comtypes")
+        return False
+    
     try:
         devices = AudioUtilities.GetSpeakers()
         interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
         volume_controller = cast(interface, POINTER(IAudioEndpointVolume))
         
         # Read current volume
-        volume_range = volume_controller.GetVolumeRange()
-        min_vol, max_vol = volume_range[0], volume_range[1]
         vol = volume_controller.GetMasterVolumeLevelScalar()
         system_volume = int(vol * 100)
         current_volume = system_volume  # Update internal volume
         print(f"Connected to system volume control. Current volume: {system_volume}%")
+        return True
     except Exception as e:
         print(f"Could not initialize volume control: {e}")
         volume_controller = None
+        return False
 
 # Advanced noise reduction filter for hand gestures
 class AdvancedSmoothFilter:
-    def __init__(self, alpha=0.5, responsiveness=0.5, min_alpha=0.2, max_alpha=0.95):
+    def __init__(self, alpha=0.5, responsiveness=0.5, min_alpha=0.2, max_alpha=0.95, prediction_factor=0.4,
+                 max_deviation=0.12, predict=False):
         self.value = None
         self.base_alpha = alpha
         self.responsiveness = responsiveness  # Sensitivity to changes (0-1)
         self.min_alpha = min_alpha  # Minimum alpha
         self.max_alpha = max_alpha  # Maximum alpha
+        self.prediction_factor = prediction_factor  # How far ahead the speed filter extrapolates
+        self.max_deviation = max_deviation  # Largest distance the prediction may add
+        self.predict = predict  # Return the predicted instead of the filtered value
         self.velocity = 0  # Rate of change
         self.acceleration = 0  # Acceleration of change
         self.last_values = deque(maxlen=3)  # Store recent values
@@ -159,37 +273,480 @@ class AdvancedSmoothFilter:
         filtered_value = adjusted_alpha * new_value + (1 - adjusted_alpha) * self.value
         
         # Enhanced motion prediction for near-zero latency response
-        prediction_factor = 0.4  # Slightly reduced prediction factor
-        predicted_value = filtered_value + self.velocity * prediction_factor + self.acceleration * 0.15
+        predicted_value = filtered_value + self.velocity * self.prediction_factor + self.acceleration * 0.15
         
         # Apply prediction with bounds checking to prevent overshooting
-        max_deviation = 0.12  # Slightly reduced max deviation
+        max_deviation = self.max_deviation
         if abs(predicted_value - filtered_value) > max_deviation:
             # Limit prediction range but keep direction
             direction = 1 if predicted_value > filtered_value else -1
             predicted_value = filtered_value + (direction * max_deviation)
             
-        # Return predicted value for speed control instead of filtered value
-        # This creates a more immediate response
-        if self.responsiveness > 0.8:  # Identify speed filter by high responsiveness
-            self.value = filtered_value
-            self.last_values.append(filtered_value)
-            return predicted_value
-        else:
-            # For volume and other controls, use normal filtered value
-            self.value = filtered_value
-            self.last_values.append(filtered_value)
-            return filtered_value
+        # Predicted value for speed control instead of filtered value, this creates a more immediate response.
+        # For volume and other controls, use normal filtered value
+        self.value = filtered_value
+        self.last_values.append(filtered_value)
+        return predicted_value if self.predict else filtered_value
 
-# Optimized filters for each gesture type
+# Optimized filters for each gesture type (--volume-filter-* and --speed-filter-* options)
 # For volume: More stable, less responsive
-distance_filter = AdvancedSmoothFilter(alpha=0.7, responsiveness=0.3, min_alpha=0.3, max_alpha=0.9)
-# For playback speed: Responsive but not too sensitive 
-left_hand_filter = AdvancedSmoothFilter(alpha=0.2, responsiveness=0.85, min_alpha=0.05, max_alpha=0.5)  # Slightly reduced sensitivity
+volume_filter_options = {'alpha': 0.7, 'responsiveness': 0.3, 'min_alpha': 0.3, 'max_alpha': 0.9}
+distance_filter = AdvancedSmoothFilter(**volume_filter_options)
+# For playback speed: Responsive but not too sensitive, and predicting the movement
+speed_filter_options = {'alpha': 0.2, 'responsiveness': 0.85, 'min_alpha': 0.05, 'max_alpha': 0.5,  # Slightly reduced sensitivity
+                        'prediction_factor': 0.4, 'max_deviation': 0.12, 'predict': True}
+left_hand_filter = AdvancedSmoothFilter(**speed_filter_options)
+
+class FilterBank:
+    """Smooth a whole feature array (e.g. every landmark coordinate) in one vectorised call per frame
+
+    model "one_euro": One-Euro filter (min_cutoff in Hz, beta, d_cutoff in Hz)
+    model "kalman": constant-velocity Kalman filter (process_noise, measurement_noise)
+
+    Every parameter is a scalar or an array broadcastable to the filter shape, so each channel can be
+    tuned separately. Updates take the measurement timestamp in seconds, so the amount of smoothing
+    depends on elapsed time rather than on the frame rate.
+    """
+    MODELS = ("one_euro", "kalman")
+
+    def __init__(self, shape, model="one_euro", min_cutoff=1.0, beta=20.0, d_cutoff=1.0,
+                 process_noise=1.0, measurement_noise=1e-5):
+        if model not in self.MODELS:
+            raise ValueError(f"Unknown filter model: {model}")
+        self.shape = tuple(shape) if np.iterable(shape) else (shape,)
+        self.model = model
+        channel = lambda value: np.broadcast_to(np.asarray(value, dtype=np.float64), self.shape).copy()
+        self.min_cutoff = channel(min_cutoff)
+        self.beta = channel(beta)
+        self.d_cutoff = channel(d_cutoff)
+        self.process_noise = channel(process_noise)
+        self.measurement_noise = channel(measurement_noise)
+
+        self.value = np.zeros(self.shape)        # Filtered value (Kalman: position estimate)
+        self.velocity = np.zeros(self.shape)     # One-Euro: smoothed derivative, Kalman: velocity estimate
+        self.last_time = np.zeros(self.shape)
+        self.initialized = np.zeros(self.shape, dtype=bool)
+        # Kalman covariance [[p00, p01], [p01, p11]] per channel
+        self.p00 = np.zeros(self.shape)
+        self.p01 = np.zeros(self.shape)
+        self.p11 = np.zeros(self.shape)
+
+    def reset(self, mask=None):
+        """Forget the state of all channels, or only of the channels selected by a boolean mask"""
+        if mask is None:
+            self.initialized[...] = False
+        else:
+            self.initialized[np.broadcast_to(mask, self.shape)] = False
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2.0 * np.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, values, timestamp, mask=None):
+        """Filter one measurement of every channel taken at `timestamp` (seconds), return the filtered array
+
+        Channels outside the optional boolean mask keep their state and are returned unchanged.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        update = np.ones(self.shape, dtype=bool) if mask is None else np.broadcast_to(mask, self.shape).copy()
+
+        # First measurement of a channel: take it as is
+        fresh = update & ~self.initialized
+        if fresh.any():
+            self.value[fresh] = values[fresh]
+            self.velocity[fresh] = 0.0
+            self.last_time[fresh] = timestamp
+            self.p00[fresh] = self.measurement_noise[fresh]
+            self.p01[fresh] = 0.0
+            self.p11[fresh] = 1.0
+            self.initialized |= fresh
+
+        active = update & ~fresh
+        dt = np.where(active, timestamp - self.last_time, 1.0)
+        active &= dt > 0  # Repeated timestamps carry no new information
+        if active.any():
+            dt = np.where(active, dt, 1.0)
+            if self.model == "one_euro":
+                self._update_one_euro(values, dt, active)
+            else:
+                self._update_kalman(values, dt, active)
+            self.last_time[active] = timestamp
+
+        return np.where(update, self.value, values)
+
+    def _update_one_euro(self, values, dt, active):
+        derivative = (values - self.value) / dt
+        velocity = self.velocity + self._alpha(self.d_cutoff, dt) * (derivative - self.velocity)
+        cutoff = self.min_cutoff + self.beta * np.abs(velocity)
+        value = self.value + self._alpha(cutoff, dt) * (values - self.value)
+        np.copyto(self.velocity, velocity, where=active)
+        np.copyto(self.value, value, where=active)
+
+    def _update_kalman(self, values, dt, active):
+        # Predict with constant velocity, process noise as continuous white acceleration
+        q = self.process_noise
+        position = self.value + self.velocity * dt
+        p00 = self.p00 + dt * (2.0 * self.p01 + dt * self.p11) + q * dt ** 3 / 3.0
+        p01 = self.p01 + dt * self.p11 + q * dt ** 2 / 2.0
+        p11 = self.p11 + q * dt
+
+        # Correct with the measured position
+        innovation = values - position
+        k0 = p00 / (p00 + self.measurement_noise)
+        k1 = p01 / (p00 + self.measurement_noise)
+        np.copyto(self.value, position + k0 * innovation, where=active)
+        np.copyto(self.velocity, self.velocity + k1 * innovation, where=active)
+        np.copyto(self.p00, (1.0 - k0) * p00, where=active)
+        np.copyto(self.p01, (1.0 - k0) * p01, where=active)
+        np.copyto(self.p11, p11 - k1 * p01, where=active)
+
+# Optional smoothing of all landmark coordinates, indexed by hand side (left/right) so hands keep their state
+landmark_filter = None
+
+def create_landmark_filter(model, min_cutoff=1.0, beta=20.0, process_noise=1.0, measurement_noise=1e-5):
+    """Filter bank over the 21 x (x, y, z) landmarks of both hand sides, or None when disabled"""
+    if model in (None, "none"):
+        return None
+    return FilterBank((2, 21, 3), model=model, min_cutoff=min_cutoff, beta=beta,
+                      process_noise=process_noise, measurement_noise=measurement_noise)
+
+# Lightweight metrics: fixed-bucket histograms, counters and gauges
+# Each metric is updated from a single thread, so plain attribute updates are enough (no locks in the hot path)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus style, values in seconds)"""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=None, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels or {}
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimate a quantile from the bucket counts (upper bound of the bucket)"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return bound
+        return float('inf')
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts))
+        }
+
+class Counter:
+    """Monotonic counter"""
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=None):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels or {}
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+class Gauge:
+    """Value that can go up and down"""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labels=None):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels or {}
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def snapshot(self):
+        return self.value
+
+class MetricsRegistry:
+    """All metrics of the app, rendered as Prometheus text or JSON"""
+    def __init__(self, prefix="magic_hand"):
+        self.prefix = prefix
+        self.metrics = []
+        self.start_time = time.time()
+
+    def _register(self, metric):
+        metric.name = f"{self.prefix}_{metric.name}"
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, labels=None, buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def counter(self, name, help_text, labels=None):
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=None):
+        return self._register(Gauge(name, help_text, labels))
+
+    @staticmethod
+    def _format_labels(labels, extra=None):
+        items = dict(labels)
+        if extra:
+            items.update(extra)
+        if not items:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in items.items()) + "}"
+
+    def render_prometheus(self):
+        """Prometheus text exposition format"""
+        lines = []
+        described = set()
+        for metric in self.metrics:
+            if metric.name not in described:
+                lines.append(f"# HELP {metric.name} {metric.help_text}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                described.add(metric.name)
+            if metric.kind == "histogram":
+                cumulative = 0
+                for bound, bucket_count in zip(list(metric.buckets) + ['+Inf'], metric.counts):
+                    cumulative += bucket_count
+                    lines.append(f"{metric.name}_bucket{self._format_labels(metric.labels, {'le': bound})} {cumulative}")
+                lines.append(f"{metric.name}_sum{self._format_labels(metric.labels)} {metric.sum}")
+                lines.append(f"{metric.name}_count{self._format_labels(metric.labels)} {metric.count}")
+            else:
+                lines.append(f"{metric.name}{self._format_labels(metric.labels)} {metric.value}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """Plain dict of every metric, for the periodic JSON dump"""
+        data = {'timestamp': time.time(), 'uptime_s': round(time.time() - self.start_time, 3), 'metrics': {}}
+        for metric in self.metrics:
+            key = metric.name + self._format_labels(metric.labels)
+            data['metrics'][key] = metric.snapshot()
+        return data
+
+metrics = MetricsRegistry()
+STAGE_CAPTURE = metrics.histogram("stage_seconds", "Time spent per pipeline stage", {'stage': 'capture'})
+STAGE_PREPROCESS = metrics.histogram("stage_seconds", "Time spent per pipeline stage", {'stage': 'preprocess'})
+STAGE_INFERENCE = metrics.histogram("stage_seconds", "Time spent per pipeline stage", {'stage': 'inference'})
+STAGE_EXTRACT = metrics.histogram("stage_seconds", "Time spent per pipeline stage", {'stage': 'extract'})
+STAGE_OVERLAY = metrics.histogram("stage_seconds", "Time spent per pipeline stage", {'stage': 'overlay'})
+STAGE_DISPLAY = metrics.histogram("stage_seconds", "Time spent per pipeline stage", {'stage': 'display'})
+ACTUATOR_VOLUME = metrics.histogram("actuator_seconds", "Time spent in actuator calls", {'actuator': 'volume'})
+ACTUATOR_SPEED = metrics.histogram("actuator_seconds", "Time spent in actuator calls", {'actuator': 'speed'})
+FRAMES_CAPTURED = metrics.counter("frames_captured_total", "Frames read from the frame source")
+FRAMES_PROCESSED = metrics.counter("frames_processed_total", "Frames run through hand detection")
+FRAMES_CONTROLLED = metrics.counter("frames_controlled_total", "Frames run through the gesture logic")
+FRAMES_DISPLAYED = metrics.counter("frames_displayed_total", "Frames shown in the window")
+FRAMES_DROPPED_CAPTURE = metrics.counter("frames_dropped_total", "Frames replaced before being consumed", {'stage': 'captured'})
+FRAMES_DROPPED_RESULT = metrics.counter("frames_dropped_total", "Frames replaced before being consumed", {'stage': 'processed'})
+FRAMES_DROPPED_DISPLAY = metrics.counter("frames_dropped_total", "Frames replaced before being consumed", {'stage': 'controlled'})
+FRAMES_STALE = {stage: metrics.counter("frames_stale_total", "Frames dropped for being older than the age budget", {'stage': stage})
+                for stage in ('captured', 'processed', 'controlled')}
+FRAMES_FLUSHED = metrics.counter("frames_flushed_total", "Camera frames left in the driver's buffer, grabbed but never decoded")
+RECORDS_WRITTEN = metrics.counter("landmark_records_written_total", "Frames written to the landmark recording")
+RECORDS_DROPPED = metrics.counter("landmark_records_dropped_total", "Frames not recorded because the recording writer fell behind")
+FRAME_AGE = metrics.histogram("frame_age_seconds", "Time since capture when the control loop used a frame")
+HANDS_VISIBLE = metrics.gauge("hands_visible", "Number of hands in the latest processed frame")
+DETECTOR_IDLE = metrics.gauge("detector_idle", "1 while hand detection runs at the low idle rate, 0 at full rate")
+IDLE_TRANSITIONS = metrics.counter("detector_mode_changes_total", "Switches between full-rate and idle detection")
+BROWSER_RTT = metrics.histogram("browser_rtt_seconds", "WebDriver round trip of a playback speed command")
+BROWSER_RECONNECTS = metrics.counter("browser_reconnects_total", "Attempts to bring back the browser connection")
+BROWSER_CONNECTED = metrics.gauge("browser_connected", "1 while browser commands succeed, 0 after a failed command")
+BROWSER_HEALTH_CHECK = metrics.histogram("browser_health_check_seconds", "Duration of the periodic controller liveness check")
+CONTROLLER_REINJECTIONS = metrics.counter("controller_reinjections_total", "Times the page lost the speed controller and it was injected again")
+INFERENCE_RESULTS_DROPPED = metrics.counter("inference_results_dropped_total", "Worker results discarded because a newer frame was already published")
+INFERENCE_TASKS_LOST = metrics.counter("inference_tasks_lost_total", "Frames whose worker died or hung before returning the result")
+INFERENCE_WORKER_RESTARTS = metrics.counter("inference_worker_restarts_total", "Inference worker processes restarted after dying or hanging")
+FRAMES_SKIPPED_IDLE = metrics.counter("frames_skipped_idle_total", "Frames not run through detection while idle")
+
+class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serve /metrics (Prometheus text) and /metrics.json"""
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = metrics.render_prometheus().encode()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics.json":
+            body = json.dumps(metrics.snapshot()).encode()
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep the console clean
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Expose the metrics on a local HTTP endpoint (background thread)"""
+    try:
+        server = http.server.ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    except OSError as e:
+        print(f"Could not start metrics endpoint on port {port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Metrics available at http://{host}:{port}/metrics")
+    return server
+
+def metrics_json_writer(path, interval):
+    """Periodically dump the metrics to a JSON file"""
+    while processing_active:
+        time.sleep(interval)
+        try:
+            temp_path = path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(metrics.snapshot(), f, indent=2)
+            os.replace(temp_path, path)  # Readers never see a half written file
+        except Exception as e:
+            print(f"Error writing metrics file: {e}")
+
+class ControlRequestHandler(socketserver.StreamRequestHandler):
+    """One command per line, one JSON line back (see RemoteControl)"""
+    def handle(self):
+        for line in self.rfile:
+            command = line.decode(errors="replace").strip()
+            if not command:
+                continue
+            response = self.server.remote_control.handle(command)
+            self.wfile.write((json.dumps(response) + "\n").encode())
+            if command.lower() == "stop":
+                break
+
+class ControlServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class RemoteControl:
+    """Stop, pause and query the controller without the window, for unattended (headless) runs
+
+    Control socket commands: status, pause, resume, stop, metrics. Signals: SIGTERM (and SIGBREAK on Windows)
+    stop like ESC, SIGUSR1 toggles pause, SIGUSR2 prints the status. While paused, frames are still detected
+    but no gesture reaches the actuators.
+    """
+    COMMANDS = ("status", "pause", "resume", "stop", "metrics")
+
+    def __init__(self):
+        self.stop_requested = threading.Event()
+        self.paused = False
+        self.frames = 0
+        self.hands = 0
+        self.fps = 0
+        self.start_time = time.time()
+        self.server = None
+
+    def frame_handled(self, result):
+        self.frames += 1
+        self.hands = result.num_hands
+        self.fps = result.fps
+
+    def status(self):
+        state = "stopping" if self.stop_requested.is_set() else ("paused" if self.paused else "running")
+        return {'state': state, 'uptime_s': round(time.time() - self.start_time, 1), 'frames': self.frames,
+                'fps': self.fps, 'hands': self.hands, 'volume': system_volume, 'speed': current_speed,
+                'browser_connected': bool(selenium_active),
+                'camera': getattr(frame_source, 'negotiated', None)}
+
+    def handle(self, command):
+        """Run a control command, return the JSON-serialisable reply"""
+        command = command.strip().lower()
+        if command == "metrics":
+            return metrics.snapshot()
+        if command == "pause":
+            self.paused = True
+        elif command == "resume":
+            self.paused = False
+        elif command == "stop":
+            self.stop_requested.set()
+        elif command != "status":
+            return {'error': f"unknown command '{command}', expected one of: {', '.join(self.COMMANDS)}"}
+        return self.status()
+
+    def install_signal_handlers(self):
+        """Must run on the main thread; SIGINT keeps raising KeyboardInterrupt"""
+        stop = lambda signum, frame: self.stop_requested.set()
+        signal.signal(signal.SIGTERM, stop)
+        if hasattr(signal, "SIGBREAK"):
+            signal.signal(signal.SIGBREAK, stop)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.handle("resume" if self.paused else "pause"))
+            signal.signal(signal.SIGUSR2, lambda signum, frame: print(json.dumps(self.status())))
+
+    def start_server(self, port, host="127.0.0.1"):
+        """Accept control commands on a local TCP port (background thread)"""
+        try:
+            self.server = ControlServer((host, port), ControlRequestHandler)
+        except OSError as e:
+            print(f"Could not start control socket on port {port}: {e}")
+            return None
+        self.server.remote_control = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"Control socket on {host}:{port} (commands: {', '.join(self.COMMANDS)})")
+        return self.server
+
+    def stop_server(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+remote_control = RemoteControl()
+
+def display_available():
+    """Whether cv2.imshow can open a window (unattended Linux boxes usually have no X11/Wayland display)"""
+    if sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+        return False
+    try:
+        cv2.namedWindow('AI Hand Controller', cv2.WINDOW_NORMAL)
+    except cv2.error:
+        return False
+    return True
 
 def display_fancy_banner():
     """Display a fancy colorful banner with LePhiAnhDev text"""
     
+    # Try to import pyfiglet and colorama for enhanced ASCII art banner
+    try:
+        import pyfiglet
+        from colorama import init, Fore, Style
+        init(autoreset=True)  # Initialize colorama
+        pyfiglet_available = True
+        colorama_available = True
+    except ImportError:
+        pyfiglet_available = False
+        colorama_available = False
+        print("For a better experience, install pyfiglet and colorama: pip install pyfiglet colorama")
+    
+    # Try to import termcolor for additional color options
+    try:
+        import termcolor
+        termcolor_available = True
+    except ImportError:
+        termcolor_available = False
+    
     if not (pyfiglet_available and (colorama_available or termcolor_available)):
         print("\n========== LePhiAnhDev ==========")
         print("Install pyfiglet, colorama, and termcolor for a fancy banner!")
@@ -290,128 +847,481 @@ def get_browser_user_data_dir(browser_type="chrome"):
     
     return None
 
-def setup_selenium():
-    """Initialize Chrome or Brave browser and open YouTube"""
-    global driver, video_url, selenium_active, browser_type
-    
-    if not selenium_available:
-        print("Selenium is not available - skipping browser initialization")
-        return False
-    
-    print("\nInitializing browser to control YouTube...")
-    print("\n*** IMPORTANT: Please ensure that your browser is closed before making a selection. ***\n")
-    
-    # Choose browser type
-    browser_choice = input("Select browser (1 for Chrome, 2 for Brave, Enter for Chrome): ")
-    browser_type = "brave" if browser_choice == "2" else "chrome"
-    
-    # Get path to browser's user data
-    default_user_data_dir = get_browser_user_data_dir(browser_type)
-    if default_user_data_dir and os.path.exists(default_user_data_dir):
-        print(f"Found default User Data directory: {default_user_data_dir}")
-    else:
-        print(f"Default User Data directory for {browser_type.capitalize()} not found")
-        default_user_data_dir = None
-    
-    # Allow user to input custom path
-    custom_user_data_dir = input(f"Enter path to {browser_type.capitalize()} User Data directory (Press Enter to use {'default' if default_user_data_dir else 'no profile'}): ")
-    
-    # Use custom or default path
-    user_data_dir = custom_user_data_dir if custom_user_data_dir else default_user_data_dir
-    
-    # Allow user to choose Profile
-    if user_data_dir:
-        profile = input("Enter Profile name (usually 'Default' or 'Profile 1', press Enter to use default): ")
-    else:
-        profile = None
-    
-    # Setup browser options
+def find_browser_binary(browser_type="chrome"):
+    """Path of the Chrome/Brave executable, or None if it can't be found"""
+    system = platform.system()
     if browser_type == "brave":
-        options = webdriver.ChromeOptions()
-        options.binary_location = ""  # Will be set based on OS
-        
-        # Detect Brave browser location based on OS
-        if platform.system() == "Windows":
-            brave_paths = [
+        if system == "Windows":
+            candidates = [
                 "C:\\Program Files\\BraveSoftware\\Brave-Browser\\Application\\brave.exe",
                 "C:\\Program Files (x86)\\BraveSoftware\\Brave-Browser\\Application\\brave.exe",
-                os.path.join(os.environ["LOCALAPPDATA"], "BraveSoftware", "Brave-Browser", "Application", "brave.exe")
+                os.path.join(os.environ.get("LOCALAPPDATA", ""), "BraveSoftware", "Brave-Browser", "Application", "brave.exe")
             ]
-            for path in brave_paths:
-                if os.path.exists(path):
-                    options.binary_location = path
-                    break
-        elif platform.system() == "Darwin":  # macOS
-            options.binary_location = "/Applications/Brave Browser.app/Contents/MacOS/Brave Browser"
-        elif platform.system() == "Linux":
-            options.binary_location = "/usr/bin/brave-browser"
+        elif system == "Darwin":  # macOS
+            candidates = ["/Applications/Brave Browser.app/Contents/MacOS/Brave Browser"]
+        else:
+            candidates = ["/usr/bin/brave-browser"]
     else:
+        if system == "Windows":
+            candidates = [
+                "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
+                "C:\\Program Files (x86)\\Google\\Chrome\\Application\\chrome.exe",
+                os.path.join(os.environ.get("LOCALAPPDATA", ""), "Google", "Chrome", "Application", "chrome.exe")
+            ]
+        elif system == "Darwin":  # macOS
+            candidates = ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"]
+        else:
+            candidates = [shutil.which(name) for name in ("google-chrome", "chromium", "chromium-browser")]
+
+    for path in candidates:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+# Browser backends: one persistent connection to the video tab, all of them run JavaScript in the page
+class BrowserBackend(abc.ABC):
+    """Open a page and run scripts in it; run() has the semantics of Selenium's execute_script (function body)"""
+    name = None
+    controller_registered = False  # CONTROLLER_INSTALLER runs in every new document of this tab
+    command_errors = (RuntimeError, OSError)  # What a failed command raises, set by each backend
+    stale_handle_messages = ()  # Parts of a command error that mean a cached function handle outlived its document
+
+    @abc.abstractmethod
+    def launch(self, browser_type="chrome", user_data_dir=None, profile=None, remote_url=None, headless=False):
+        """Start (or connect to) the browser"""
+
+    @abc.abstractmethod
+    def open(self, url):
+        """Load url in the controlled tab"""
+
+    @abc.abstractmethod
+    def run(self, script, *args):
+        """Run a JavaScript function body in the page with arguments, return its result"""
+
+    def evaluate(self, expression):
+        """Value of a JavaScript expression in the page"""
+        return self.run(f"return ({expression});")
+
+    def wait_until(self, expression, timeout=10.0):
+        """Wait until a JavaScript expression is truthy in the page, TimeoutError if it doesn't get there"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            try:
+                if self.evaluate(expression):
+                    return True
+            except self.command_errors:
+                pass  # Page still navigating
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Timed out waiting for: {expression}")
+            time.sleep(0.1)
+
+    def add_init_script(self, script):
+        """Run script at the start of every new document in the tab; False if the backend can't"""
+        return False
+
+    def call(self, function_name, *args):
+        """Call window.<function_name> with JSON arguments; the script text never changes, only the arguments do"""
+        return self.run(f"return window.{function_name}.apply(null, arguments);", *args)
+
+    def stale_handle(self, error):
+        """Did a command fail because its cached handle belongs to a document that is gone (safe to resolve again
+        and retry), rather than in the page script or the connection"""
+        return any(message in str(error) for message in self.stale_handle_messages)
+
+    def close(self):
+        pass
+
+class SeleniumBackend(BrowserBackend):
+    """Selenium WebDriver: every command is an HTTP request to chromedriver, which forwards it over DevTools"""
+    name = "selenium"
+
+    def __init__(self):
+        self.driver = None
+        self.headless = False
+
+    def launch(self, browser_type="chrome", user_data_dir=None, profile=None, remote_url=None, headless=False):
+        selenium = load_selenium()
+        if selenium is None:
+            raise ImportError("Selenium is not installed: pip install selenium webdriver-manager")
+        webdriver = selenium.webdriver
+        self.command_errors = (selenium.WebDriverException,)
+        self.headless = headless
+
+        # Setup browser options
         options = webdriver.ChromeOptions()
-    
-    options.add_argument("--start-maximized")  # Maximize window for better visibility
-    
-    # Add option to use user data if available
-    if user_data_dir:
-        options.add_argument(f"--user-data-dir={user_data_dir}")
-        if profile:
-            options.add_argument(f"--profile-directory={profile}")
-        print(f"Using User Data: {user_data_dir}")
-        if profile:
-            print(f"With Profile: {profile}")
-    
-    # Add option to keep browser open when selenium closes
-    options.add_experimental_option("detach", True)
-    
-    # Options to reduce unnecessary notifications
-    options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
-    options.add_experimental_option('useAutomationExtension', False)
-    
-    try:
-        # Initialize driver
+        if browser_type == "brave":
+            options.binary_location = find_browser_binary("brave") or ""
+
+        options.add_argument("--start-maximized")  # Maximize window for better visibility
+        if headless:
+            options.add_argument("--headless=new")
+
+        # Add option to use user data if available
         if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+            if profile:
+                options.add_argument(f"--profile-directory={profile}")
+            print(f"Using User Data: {user_data_dir}")
+            if profile:
+                print(f"With Profile: {profile}")
+
+        # Add option to keep browser open when selenium closes
+        options.add_experimental_option("detach", True)
+
+        # Options to reduce unnecessary notifications
+        options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+        options.add_experimental_option('useAutomationExtension', False)
+
+        if remote_url:
+            # Already running WebDriver server (e.g. a chromedriver started by hand, or a stand-in for tests)
+            self.driver = webdriver.Remote(command_executor=remote_url, options=options)
+        elif user_data_dir:
             # When using user-data-dir, shouldn't use webdriver_manager
-            driver = webdriver.Chrome(options=options)
+            self.driver = webdriver.Chrome(options=options)
         else:
             # Use webdriver_manager when not using user-data-dir
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+            self.driver = webdriver.Chrome(service=selenium.Service(selenium.ChromeDriverManager().install()),
+                                           options=options)
+
+    def open(self, url):
+        self.driver.get(url)
+
+    def run(self, script, *args):
+        return self.driver.execute_script(script, *args)
+
+    def wait_until(self, expression, timeout=10.0):
+        selenium = load_selenium()
+        try:
+            return selenium.WebDriverWait(self.driver, timeout, poll_frequency=0.1,
+                                          ignored_exceptions=self.command_errors).until(
+                lambda driver: driver.execute_script(f"return ({expression});"))
+        except selenium.TimeoutException:
+            raise TimeoutError(f"Timed out waiting for: {expression}") from None
+
+    def add_init_script(self, script):
+        # Goes through chromedriver's DevTools passthrough, which other WebDriver servers may not have
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {'source': script})
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        # The browser stays open for the user (detach), only a headless one is ours to quit
+        if self.headless and self.driver is not None:
+            self.driver.quit()
+        self.driver = None
+
+class PlaywrightBackend(BrowserBackend):
+    """Async Playwright on its own event loop thread, talking to the browser over one persistent connection"""
+    name = "playwright"
+    stale_handle_messages = ("Execution context was destroyed", "Cannot find context with specified id",
+                             "JSHandle is disposed")
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.handles = {}
+
+    def _call(self, coroutine, timeout=60.0):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    async def _launch(self, browser_type, user_data_dir, profile, remote_url, headless):
+        from playwright.async_api import Error, async_playwright
+
+        self.command_errors = (Error, TimeoutError)
+        self.playwright = await async_playwright().start()
+        chromium = self.playwright.chromium
+        # Brave needs its own binary, Chrome uses the browser installed by `playwright install`
+        executable = find_browser_binary("brave") if browser_type == "brave" else None
+        if remote_url:
+            self.browser = await chromium.connect_over_cdp(remote_url)
+            self.context = self.browser.contexts[0] if self.browser.contexts else await self.browser.new_context()
+        elif user_data_dir:
+            args = [f"--profile-directory={profile}"] if profile else []
+            self.context = await chromium.launch_persistent_context(user_data_dir, headless=headless, no_viewport=True,
+                                                                   executable_path=executable, args=args)
+        else:
+            self.browser = await chromium.launch(headless=headless, executable_path=executable)
+            self.context = await self.browser.new_context(no_viewport=True)
+        self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+
+    async def _close(self):
+        if self.browser is not None:
+            await self.browser.close()
+        elif self.context is not None:
+            await self.context.close()
+        if self.playwright is not None:
+            await self.playwright.stop()
+
+    def launch(self, browser_type="chrome", user_data_dir=None, profile=None, remote_url=None, headless=False):
+        self._call(self._launch(browser_type, user_data_dir, profile, remote_url, headless))
+
+    def open(self, url):
+        self._call(self.page.goto(url))
+
+    def run(self, script, *args):
+        return self._call(self.page.evaluate(f"args => (function() {{ {script} }}).apply(null, args)", list(args)))
+
+    def add_init_script(self, script):
+        self._call(self.page.add_init_script(script))
+        return True
+
+    def wait_until(self, expression, timeout=10.0):
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        try:
+            self._call(self.page.wait_for_function(expression, timeout=timeout * 1000), timeout=timeout + 5.0)
+            return True
+        except PlaywrightTimeoutError:
+            raise TimeoutError(f"Timed out waiting for: {expression}") from None
+
+    def call(self, function_name, *args):
+        # Keep a handle to the function itself, only the arguments cross the connection
+        handle = self.handles.get(function_name)
+        if handle is not None:
+            try:
+                return self._call(handle.evaluate("(fn, args) => fn(...args)", list(args)))
+            except self.command_errors as e:
+                if not self.stale_handle(e):
+                    raise  # The call itself failed, running it again could apply it twice
+                self.handles.pop(function_name, None)  # The handle dies with its document, resolve it again
+        handle = self.handles[function_name] = self._call(self.page.evaluate_handle(f"() => window.{function_name}"))
+        return self._call(handle.evaluate("(fn, args) => fn(...args)", list(args)))
+
+    def close(self):
+        try:
+            self._call(self._close(), timeout=10.0)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+class DevToolsBackend(BrowserBackend):
+    """Chrome DevTools protocol over a single websocket, no driver process in between
+
+    remote_url is the browser's debugging endpoint (e.g. http://127.0.0.1:9222 of a browser started with
+    --remote-debugging-port=9222). Otherwise the browser is started here; Chrome only allows remote debugging
+    with a non-default user data directory, so a temporary one is used when none is given.
+    """
+    name = "devtools"
+    stale_handle_messages = ("Could not find object with given id", "Cannot find context with specified id")
+
+    def __init__(self):
+        self.process = None
+        self.socket = None
+        self.lock = threading.Lock()
+        self.message_id = 0
+        self.handles = {}
+
+    def launch(self, browser_type="chrome", user_data_dir=None, profile=None, remote_url=None, headless=False):
+        websocket = load_websocket()
+        if websocket is None:
+            raise ImportError("websocket-client is not installed: pip install websocket-client")
+
+        endpoint = remote_url
+        if endpoint is None:
+            binary = find_browser_binary(browser_type)
+            if binary is None:
+                raise FileNotFoundError(f"Could not find the {browser_type.capitalize()} executable")
+            with socket.socket() as probe:
+                probe.bind(("127.0.0.1", 0))
+                port = probe.getsockname()[1]
+            arguments = [binary, f"--remote-debugging-port={port}", "--no-first-run", "--no-default-browser-check",
+                         f"--user-data-dir={user_data_dir or tempfile.mkdtemp(prefix='magic-hand-')}",
+                         "--start-maximized", "--autoplay-policy=no-user-gesture-required"]
+            if profile:
+                arguments.append(f"--profile-directory={profile}")
+            if headless:
+                arguments.append("--headless=new")
+            self.process = subprocess.Popen(arguments + ["about:blank"], stdout=subprocess.DEVNULL,
+                                            stderr=subprocess.DEVNULL)
+            endpoint = f"http://127.0.0.1:{port}"
+
+        # Wait for the debugging endpoint, then attach to the first tab
+        deadline = time.perf_counter() + 15.0
+        while True:
+            try:
+                with urllib.request.urlopen(f"{endpoint}/json/list", timeout=1.0) as response:
+                    targets = [target for target in json.load(response) if target.get('type') == "page"]
+                if targets:
+                    break
+            except OSError:
+                pass
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"No DevTools endpoint with an open tab at {endpoint}")
+            time.sleep(0.1)
+        self.socket = websocket.create_connection(targets[0]['webSocketDebuggerUrl'], suppress_origin=True,
+                                                  enable_multithread=True)
+        self.command_errors = (RuntimeError, OSError, websocket.WebSocketException)
+        self.socket.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def command(self, method, params=None, timeout=15.0):
+        """Send one DevTools command and wait for its reply (events in between are skipped)"""
+        with self.lock:
+            self.message_id += 1
+            message_id = self.message_id
+            self.socket.settimeout(timeout)
+            self.socket.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+            while True:
+                message = json.loads(self.socket.recv())
+                if message.get('id') == message_id:
+                    break
+        if 'error' in message:
+            raise RuntimeError(f"{method}: {message['error'].get('message')}")
+        return message.get('result', {})
+
+    def open(self, url):
+        self.command("Page.navigate", {'url': url})
+
+    @staticmethod
+    def _value(result):
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise RuntimeError(details.get('exception', {}).get('description') or details.get('text'))
+        return result.get('result', {}).get('value')
+
+    def run(self, script, *args):
+        expression = f"(function() {{ {script} }}).apply(null, {json.dumps(list(args))})"
+        return self._value(self.command("Runtime.evaluate", {'expression': expression, 'returnByValue': True}))
+
+    def add_init_script(self, script):
+        self.command("Page.addScriptToEvaluateOnNewDocument", {'source': script})
+        return True
+
+    def _call_function(self, object_id, args):
+        return self._value(self.command("Runtime.callFunctionOn", {
+            'objectId': object_id, 'functionDeclaration': "function() { return this.apply(null, arguments); }",
+            'arguments': [{'value': arg} for arg in args], 'returnByValue': True}))
+
+    def call(self, function_name, *args):
+        # Remote object id of the function, resolved once per document
+        object_id = self.handles.get(function_name)
+        if object_id is not None:
+            try:
+                return self._call_function(object_id, args)
+            except RuntimeError as e:
+                if not self.stale_handle(e):
+                    raise  # The call itself failed, running it again could apply it twice
+                self.handles.pop(function_name, None)  # The object dies with its document, resolve it again
+        result = self.command("Runtime.evaluate", {'expression': f"window.{function_name}"})['result']
+        if result.get('type') != "function":
+            raise RuntimeError(f"window.{function_name} is not a function")
+        object_id = self.handles[function_name] = result['objectId']
+        return self._call_function(object_id, args)
+
+    def close(self):
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+        # Like the other backends, leave a visible browser open for the user
+        if self.process is not None and self.process.poll() is None and "--headless=new" in self.process.args:
+            self.process.terminate()
+
+BROWSER_BACKENDS = {backend.name: backend for backend in (SeleniumBackend, PlaywrightBackend, DevToolsBackend)}
+
+def create_browser(settings):
+    """Launch the selected browser backend with launch() keyword arguments"""
+    backend = BROWSER_BACKENDS[browser_backend]()
+    backend.launch(**settings)
+    return backend
+
+def wait_for_video(timeout=15.0):
+    """Wait until the page has a <video> element"""
+    try:
+        return browser.wait_until("!!document.querySelector('video')", timeout)
+    except TimeoutError:
+        raise TimeoutError("No <video> element on the page") from None
+
+DEFAULT_VIDEO_URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+def choose_browser_settings(browser_choice=None, user_data_dir=None, profile=None, url=None, prompt=True):
+    """Browser type, user data directory, profile and video URL: given values are used as they are, the others
+    are asked for (prompt=True) or take their defaults; user_data_dir="" means no profile"""
+    global browser_type, browser_settings, video_url
+    
+    if prompt and None in (browser_choice, user_data_dir, url):
+        print("\nInitializing browser to control YouTube...")
+        print("\n*** IMPORTANT: Please ensure that your browser is closed before making a selection. ***\n")
+    
+    # Choose browser type
+    if browser_choice is None and prompt:
+        browser_choice = "brave" if input("Select browser (1 for Chrome, 2 for Brave, Enter for Chrome): ") == "2" else "chrome"
+    browser_type = browser_choice or "chrome"
+    
+    if user_data_dir is None:
+        # Get path to browser's user data
+        default_user_data_dir = get_browser_user_data_dir(browser_type)
+        if default_user_data_dir and os.path.exists(default_user_data_dir):
+            print(f"Found default User Data directory: {default_user_data_dir}")
+        else:
+            print(f"Default User Data directory for {browser_type.capitalize()} not found")
+            default_user_data_dir = None
         
-        # Open YouTube page
-        video_url = input("\nEnter YouTube video URL (press Enter to use default video): ")
-        if not video_url:
-            video_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"  # Default video
+        # Allow user to input custom path
+        custom_user_data_dir = input(f"Enter path to {browser_type.capitalize()} User Data directory (Press Enter to use {'default' if default_user_data_dir else 'no profile'}): ") if prompt else ""
         
-        driver.get(video_url)
-        print(f"Opened YouTube video: {video_url}")
+        # Use custom or default path
+        user_data_dir = custom_user_data_dir if custom_user_data_dir else default_user_data_dir
         
-        # Wait for video to load
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "video"))
-        )
+        # Allow user to choose Profile
+        if user_data_dir and profile is None and prompt:
+            profile = input("Enter Profile name (usually 'Default' or 'Profile 1', press Enter to use default): ")
+    
+    if url is None and prompt:
+        url = input("\nEnter YouTube video URL (press Enter to use default video): ")
+    video_url = url or DEFAULT_VIDEO_URL
+    
+    browser_settings = {'browser_type': browser_type, 'user_data_dir': user_data_dir or None,
+                        'profile': profile or None, 'remote_url': browser_remote_url}
+    return browser_settings
+
+def setup_selenium():
+    """Initialize Chrome or Brave browser (through the selected backend) with browser_settings and open video_url"""
+    global browser, selenium_active
+    
+    if browser_backend == "selenium" and load_selenium() is None:
+        print("Selenium is not available - skipping browser initialization")
+        return False
+    
+    try:
+        # Initialize browser connection
+        with startup_profile.phase("browser launch"):
+            browser = create_browser(browser_settings)
+        
+        # Open YouTube page and wait for video to load
+        with startup_profile.phase("video page"):
+            browser.open(video_url)
+            print(f"Opened YouTube video: {video_url}")
+            wait_for_video()
         
         # Automatically click play and skip ads if present
         try:
-            time.sleep(3)  # Wait for ads if present
+            # Page loaded and either an ad offers its skip button or the video has data to play
+            browser.wait_until("document.readyState === 'complete' && "
+                               "(!!document.querySelector('.ytp-ad-skip-button') || "
+                               "document.querySelector('video').readyState >= 2)")
             
             # Try to find and click skip ad buttons
             try:
-                skip_buttons = driver.find_elements(By.CSS_SELECTOR, ".ytp-ad-skip-button")
-                if skip_buttons:
-                    for button in skip_buttons:
-                        driver.execute_script("arguments[0].click();", button)
+                skipped = browser.run("const buttons = document.querySelectorAll('.ytp-ad-skip-button');"
+                                      "buttons.forEach(button => button.click()); return buttons.length;")
+                if skipped:
                     print("Skipped ad")
-            except:
+            except browser.command_errors:
                 pass
             
             # Click on video to ensure it has focus
-            video = driver.find_element(By.TAG_NAME, "video")
-            driver.execute_script("arguments[0].click();", video)
-            
-            # Pause to ensure video has loaded
-            time.sleep(0.5)
+            browser.run("document.querySelector('video').click();")
             
-            # Click again to ensure video plays
-            driver.execute_script("arguments[0].click();", video)
-        except Exception as e:
+            # Click again if that click paused a video that was already playing
+            try:
+                browser.wait_until("!document.querySelector('video').paused", timeout=1.0)
+            except TimeoutError:
+                browser.run("document.querySelector('video').click();")
+        except (TimeoutError, *browser.command_errors) as e:
             print(f"Warning when automatically playing video: {e}")
             print("Please click on the video in the browser to play")
         
@@ -420,23 +1330,18 @@ def setup_selenium():
         # Add JavaScript to directly control
         inject_controller_script()
         selenium_active = True
+        startup_profile.mark("browser attached")
+        if browser_health_interval > 0:
+            threading.Thread(target=browser_health_monitor, args=(browser_health_interval,), daemon=True).start()
         
         return True
     except Exception as e:
-        print(f"Error initializing Selenium: {e}")
+        print(f"Error initializing {browser_backend} browser backend: {e}")
         traceback.print_exc()
         return False
 
-def inject_controller_script():
-    """Add JavaScript to YouTube page for ultra-fast playback speed control"""
-    global driver
-    
-    if not driver:
-        return False
-    
-    try:
-        # Script optimized for high performance and ultra-low latency
-        controller_script = """
+# Script optimized for high performance and ultra-low latency
+CONTROLLER_SCRIPT = """
         // Check if controller already exists
         if (!document.getElementById('ai-speed-controller')) {
             // Global variables
@@ -627,13 +1532,40 @@ def inject_controller_script():
             console.log('AI Hand Controller added to YouTube!');
         }
         """
-        
-        # Execute script
-        driver.execute_script(controller_script)
+
+# Runs CONTROLLER_SCRIPT as soon as the player exists; registered for every new document, so it can run
+# before <body> is there, and runs again after YouTube's in-app navigation replaced the page content
+CONTROLLER_INSTALLER = """
+        (function installAiHandController() {
+            if (window.top !== window) return;  // Not in ad and embed frames
+            if (!window.aiHandInstallerHooked) {
+                window.aiHandInstallerHooked = true;
+                document.addEventListener('yt-navigate-finish', installAiHandController);
+            }
+            if (!document.body || !document.querySelector('video')) {
+                setTimeout(installAiHandController, 250);
+                return;
+            }
+""" + CONTROLLER_SCRIPT + """
+        })();
+        """
+
+def inject_controller_script():
+    """Add JavaScript to YouTube page for ultra-fast playback speed control"""
+    if not browser:
+        return False
+    
+    try:
+        # Register for every future document (reload, navigation), then run it in the current one
+        if not browser.controller_registered:
+            browser.controller_registered = browser.add_init_script(CONTROLLER_INSTALLER)
+        browser.run(CONTROLLER_INSTALLER)
+        if browser.evaluate("typeof window.setYouTubeSpeed") != "function":
+            return False  # No player yet, the installer keeps waiting for it in the page
         print("Added speed control panel to YouTube!")
         
         # Check default speed
-        current_speed = driver.execute_script("return document.querySelector('video').playbackRate;")
+        current_speed = browser.evaluate("document.querySelector('video').playbackRate")
         print(f"Current playback speed: {current_speed}x")
         
         return True
@@ -642,20 +1574,91 @@ def inject_controller_script():
         return False
 
 def change_youtube_speed(new_speed):
-    """Change YouTube playback speed with ultra-low latency"""
-    global driver, selenium_active
-    
-    if not driver or not selenium_active:
+    """Change YouTube playback speed with ultra-low latency (one command over the browser connection)"""
+    if not browser:
         return False
     
+    start = time.perf_counter()
     try:
-        # Call the optimized JavaScript function
-        driver.execute_script(f"return window.setYouTubeSpeed({new_speed});")
+        # Call the optimized JavaScript function (fixed script, the speed is passed as an argument)
+        result = browser.call("setYouTubeSpeed", float(new_speed))
+        BROWSER_RTT.observe(time.perf_counter() - start)
+        return result is True
+    except Exception as e:
+        return False
+
+def reconnect_browser():
+    """Bring the browser connection back: re-inject the controller, or relaunch the browser if the session is gone"""
+    global browser
+    
+    BROWSER_RECONNECTS.inc()
+    try:
+        # Session still alive, the page was probably reloaded or navigated
+        if browser.evaluate("typeof window.setYouTubeSpeed") != "function":
+            inject_controller_script()
         return True
+    except Exception:
+        pass
+    
+    if browser_settings is None:
+        return False
+    try:
+        try:
+            browser.close()
+        except Exception:
+            pass
+        browser = create_browser(browser_settings)
+        browser.open(video_url)
+        wait_for_video()
+        return inject_controller_script()
     except Exception as e:
-        selenium_active = False  # Mark as no longer active
+        print(f"Could not reconnect to the browser: {e}")
         return False
 
+def send_youtube_speed(new_speed):
+    """Browser worker handler: send the speed, reconnecting first if the last command failed"""
+    global selenium_active
+    
+    if not selenium_active and not reconnect_browser():
+        raise ConnectionError("browser not reachable")
+    selenium_active = True
+    BROWSER_CONNECTED.set(1)
+    
+    if not change_youtube_speed(new_speed):
+        selenium_active = False
+        BROWSER_CONNECTED.set(0)
+        raise ConnectionError(f"could not set playback speed {new_speed}x")
+
+def check_browser_health(tick):
+    """Browser worker handler: cheap liveness check, puts the controller back or reconnects when it's gone"""
+    global selenium_active
+    
+    if browser is None:
+        return
+    try:
+        alive = browser.evaluate("typeof window.setYouTubeSpeed") == "function"
+    except Exception:
+        alive = None  # Session or connection is gone
+    
+    if alive is None:
+        if not reconnect_browser():
+            selenium_active = False
+            BROWSER_CONNECTED.set(0)
+            raise ConnectionError("browser not reachable")
+    elif not alive:
+        # Reloaded or navigated page the init script couldn't reach (or the player isn't there yet)
+        if inject_controller_script():
+            CONTROLLER_REINJECTIONS.inc()
+    selenium_active = True
+    BROWSER_CONNECTED.set(1)
+
+def browser_health_monitor(interval):
+    """Periodically queue a health check on the browser worker, so it never overlaps a speed command"""
+    while processing_active:
+        time.sleep(interval)
+        if browser is not None:
+            browser_scheduler.post('health', time.perf_counter())
+
 def predict_next_value(history, current_value, change_rate):
     """Predict next value based on history and change rate"""
     if len(history) < 2:
@@ -698,12 +1701,13 @@ def adjust_system_volume(target_volume_percent):
 def adjust_volume_with_keys(target, current):
     """Fallback method: adjust volume with shortcut keys"""
     diff = target - current
-    if abs(diff) < 3:
+    keys = load_pyautogui() if abs(diff) >= 3 else None
+    if keys is None:
         return current
     
     step_size = max(1, min(5, abs(diff) // 5))  # Dynamic step
     key = 'volumeup' if diff > 0 else 'volumedown'
-    pyautogui.press(key, presses=step_size, interval=0.01)
+    keys.press(key, presses=step_size, interval=0.01)
     
     # Estimate new volume
     new_volume = current + (step_size * 2 if diff > 0 else -step_size * 2)
@@ -727,65 +1731,568 @@ def get_system_volume():
     # If can't read, return estimated value
     return system_volume
 
-def adjust_playback_speed(direction, distance_change=None):
-    """Adjust playback speed with ultra-low latency and prediction"""
-    global speed_index, current_speed, speed_direction_bias, speed_values
+class SpeedController:
+    """Deterministic playback speed steps from the (smoothed) left hand thumb-index distance
     
-    # Enhanced direct mapping approach
-    if distance_change is not None:
-        # Map distance change magnitude directly to speed change probability
-        # This creates a much more continuous and natural control
-        change_magnitude = abs(distance_change) * 100  # Scale up for better precision
+    dead_band: distance wobble that is ignored (backlash around the tracked distance)
+    step_distance: distance travel per speed step
+    hysteresis: width of the band around each step boundary, stepping back needs this much extra travel
+    max_step_rate: at most this many speed steps per second
+    """
+    def __init__(self, speeds, initial_index=3, step_distance=0.04, dead_band=0.006, hysteresis=0.015,
+                 max_step_rate=8.0):
+        self.speeds = list(speeds)
+        self.initial_index = initial_index
+        self.step_distance = step_distance
+        self.dead_band = dead_band
+        self.hysteresis = hysteresis
+        self.max_step_rate = max_step_rate
+        self.reset()
+    
+    def reset(self):
+        self.index = self.initial_index
+        self.tracked = None      # Distance after removing the dead band
+        self.anchor = None       # Distance at the center of the current speed step
+        self.last_step_time = None
+    
+    @property
+    def speed(self):
+        return self.speeds[self.index]
+    
+    def update(self, distance, now):
+        """Feed one distance sample taken at `now` (seconds), return the new speed index or None if unchanged"""
+        if self.tracked is None:
+            self.tracked = self.anchor = distance
+            return None
         
-        # Exponential mapping to make small movements more sensitive
-        # but slightly reduced sensitivity
-        change_probability = min(1.0, change_magnitude ** 1.4 / 35)  # Reduced sensitivity
+        # Backlash: the tracked distance only follows movements beyond the dead band
+        self.tracked = min(max(self.tracked, distance - self.dead_band), distance + self.dead_band)
+        offset = self.tracked - self.anchor
+        direction = 1 if offset > 0 else -1
         
-        # Determine change direction and apply probability
-        if distance_change > 0 and np.random.random() < change_probability and speed_index < len(speed_values) - 1:
-            speed_index += 1
-            current_speed = speed_values[speed_index]
-            if selenium_active:
-                change_youtube_speed(current_speed)
-            return current_speed
-        elif distance_change < 0 and np.random.random() < change_probability and speed_index > 0:
-            speed_index -= 1
-            current_speed = speed_values[speed_index]
-            if selenium_active:
-                change_youtube_speed(current_speed)
-            return current_speed
-    
-    # Fallback to bias-based approach with slightly reduced sensitivity
-    # Update current trend with high sensitivity
-    if direction == "faster":
-        speed_direction_bias += 1.8  # Slightly reduced responsiveness
-    else:
-        speed_direction_bias -= 1.8  # Slightly reduced responsiveness
-    
-    # Allow bias to build up faster but still have limits
-    speed_direction_bias = max(-4.0, min(4.0, speed_direction_bias))
-    
-    # Use immediate response for deliberate hand movements
-    should_change = False
-    if direction == "faster" and speed_index < len(speed_values) - 1:
-        if speed_direction_bias >= 1.2:  # Slightly higher threshold for better stability
-            speed_index += 1
-            speed_direction_bias = 0  # Reset after change
-            should_change = True
-    elif direction == "slower" and speed_index > 0:
-        if speed_direction_bias <= -1.2:  # Slightly higher threshold for better stability
-            speed_index -= 1
-            speed_direction_bias = 0  # Reset after change
-            should_change = True
-    
-    # If there's a change, update speed
-    if should_change:
-        current_speed = speed_values[speed_index]
-        if selenium_active:
-            change_youtube_speed(current_speed)
+        # Boundaries halfway to the next step, pushed out by half the hysteresis band on either side
+        if abs(offset) < (self.step_distance + self.hysteresis) / 2:
+            return None
+        
+        # Step rate limit, the step happens as soon as it's allowed again
+        if self.last_step_time is not None and now - self.last_step_time < 1.0 / self.max_step_rate:
+            return None
+        
+        new_index = min(max(self.index + direction, 0), len(self.speeds) - 1)
+        if new_index == self.index:
+            # Already at the slowest/fastest speed: follow the hand so turning back reacts immediately
+            self.anchor = self.tracked
+            return None
+        
+        self.index = new_index
+        self.anchor += direction * self.step_distance
+        self.last_step_time = now
+        return new_index
+
+speed_controller = SpeedController(speed_values, initial_index=speed_index)
+
+def adjust_playback_speed(new_index, capture_time=None, context=None):
+    """Switch to speed_values[new_index] and queue it for the browser worker of the control context (default:
+    live_control), return the new speed"""
+    global speed_index, current_speed
+    
+    context = context or live_control
+    speed_index = new_index
+    current_speed = speed_values[speed_index]
+    if context.browser_wanted():
+        context.browser_scheduler.post('speed', current_speed, capture_time)
+    
+    return current_speed
+
+# Actuator worker: the render loop only posts target values, OS/input-injection calls run on their own thread
+class ActuatorAction:
+    """One actuator with its latest pending value (latest value wins), rate limit and debounce
+
+    min_interval: seconds between two calls of the handler
+    debounce: a new value must stay unchanged this long before it is applied
+    retry_delay: when the handler raises, retry the value after this delay, doubling up to max_retry_delay
+    (None: drop the value)
+    registry: MetricsRegistry for the action's queue age, coalesced, applied and failure metrics
+    """
+    def __init__(self, name, handler, min_interval=0.0, debounce=0.0, duration_histogram=None,
+                 retry_delay=None, max_retry_delay=10.0, registry=metrics):
+        self.name = name
+        self.handler = handler
+        self.min_interval = min_interval
+        self.debounce = debounce
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.failures = 0            # Consecutive handler failures
+        self.retry_at = float('-inf')
+        self.pending = None          # (value, first_post_time, last_post_time, tag)
+        self.last_value = None       # Value reached by the last handler call
+        self.in_flight = None        # Value the handler is working on right now
+        self.last_run = float('-inf')
+        self.duration = duration_histogram
+        self.queue_age = registry.histogram("actuator_queue_age_seconds",
+                                            "Time from posting a value to applying it", {'actuator': name})
+        self.coalesced = registry.counter("actuator_coalesced_total",
+                                          "Posted values replaced by a newer one before being applied", {'actuator': name})
+        self.applied = registry.counter("actuator_applied_total", "Values applied by the actuator worker", {'actuator': name})
+        self.failed = registry.counter("actuator_failures_total", "Handler calls that raised an error", {'actuator': name})
+
+    def due_time(self):
+        """When the pending value may be applied (scheduler clock time)"""
+        value, first_post, last_post, _ = self.pending
+        return max(self.last_run + self.min_interval, last_post + self.debounce, self.retry_at)
+
+class ActuatorScheduler:
+    """Apply posted actuator values on a worker thread, the poster never waits for the OS
+
+    Handlers return the value they actually reached (None: the posted value), so an actuator that only
+    gets part of the way (e.g. volume keys) is called again when the same target is posted again.
+    The actions' metrics go to `registry` (default: the app's metrics).
+    """
+    def __init__(self, registry=metrics):
+        self.registry = registry
+        self.actions = {}
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+        self.busy = False
+        self.record = False
+        self.completed = deque(maxlen=10000)  # (name, value, tag, post_time, start, end) when recording
+        self.clock = time.perf_counter        # All scheduling times (the replay engine runs it on virtual time)
+
+    def register(self, name, handler, min_interval=0.0, debounce=0.0, duration_histogram=None,
+                 retry_delay=None, max_retry_delay=10.0):
+        self.actions[name] = ActuatorAction(name, handler, min_interval, debounce, duration_histogram,
+                                            retry_delay, max_retry_delay, self.registry)
+        return self.actions[name]
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def post(self, name, value, tag=None):
+        """Set the latest target value of an action, replacing any value that hasn't been applied yet"""
+        action = self.actions[name]
+        now = self.clock()
+        with self.condition:
+            applied = action.in_flight if action.in_flight is not None else action.last_value
+            if action.pending is not None:
+                pending_value, first_post, last_post, _ = action.pending
+                if value == pending_value:
+                    return  # Re-posting the same value keeps the debounce timer and the queue age running
+                action.coalesced.inc()
+                if value == applied:
+                    action.pending = None  # Back to what is already (being) applied, nothing to do
+                else:
+                    action.pending = (value, first_post, now, tag)
+            elif value != applied:
+                action.pending = (value, now, now, tag)
+            else:
+                return
+            self.condition.notify_all()
+
+    def flush(self, timeout=2.0):
+        """Wait until every pending value has been applied"""
+        deadline = self.clock() + timeout
+        with self.condition:
+            while self.busy or any(action.pending is not None for action in self.actions.values()):
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(min(remaining, 0.01))
+        return True
+
+    def reset(self):
+        """Drop pending values and forget what was applied"""
+        with self.condition:
+            for action in self.actions.values():
+                action.pending = None
+                action.last_value = None
+                action.in_flight = None
+                action.last_run = float('-inf')
+                action.failures = 0
+                action.retry_at = float('-inf')
+            self.completed.clear()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                action = None
+                while self.running:
+                    ready = [a for a in self.actions.values() if a.pending is not None]
+                    if ready:
+                        action = min(ready, key=ActuatorAction.due_time)
+                        wait = action.due_time() - self.clock()
+                        if wait <= 0:
+                            break
+                        self.condition.wait(wait)  # Woken early when a newer value is posted
+                    else:
+                        self.condition.wait()
+                    action = None
+                if not self.running:
+                    return
+                value, first_post, _, tag = action.pending
+                action.pending = None
+                action.in_flight = value
+                self.busy = True
+
+            start = self.clock()
+            reached = value
+            try:
+                result = action.handler(value)
+                if result is not None:
+                    reached = result
+            except Exception as e:
+                end = self.clock()
+                action.failed.inc()
+                action.failures += 1
+                if action.failures == 1:
+                    print(f"Error in {action.name} actuator: {e}")
+                with self.condition:
+                    action.in_flight = None
+                    if action.retry_delay is not None:
+                        delay = min(action.max_retry_delay, action.retry_delay * 2 ** (action.failures - 1))
+                        action.retry_at = end + delay
+                        if action.pending is None:
+                            action.pending = (value, first_post, first_post, tag)  # Try again unless replaced
+                    self.busy = False
+                    self.condition.notify_all()
+                continue
+            end = self.clock()
+            if action.failures:
+                print(f"{action.name.capitalize()} actuator recovered after {action.failures} failed attempts")
+                action.failures = 0
+                action.retry_at = float('-inf')
+
+            action.queue_age.observe(start - first_post)
+            action.applied.inc()
+            if action.duration is not None:
+                action.duration.observe(end - start)
+            if self.record:
+                self.completed.append((action.name, value, tag, first_post, start, end))
+            with self.condition:
+                action.last_value = reached
+                action.in_flight = None
+                action.last_run = start
+                self.busy = False
+                self.condition.notify_all()
+
+class ControlContext:
+    """What the gesture actions drive: the schedulers they post volume and speed targets to, and the system volume
+    they compare the volume target with
+
+    set_volume(target) -> volume reached, called by the volume action (apply_volume). The app drives live_control;
+    replay and the benchmarks build their own (stub_control_context), so they never take over the live actuators.
+    """
+    def __init__(self, actuator_scheduler, browser_scheduler, set_volume, system_volume=50):
+        self.actuator_scheduler = actuator_scheduler
+        self.browser_scheduler = browser_scheduler
+        self.set_volume = set_volume
+        self.system_volume = system_volume
+
+    def apply_volume(self, target_volume):
+        """Actuator handler: set the volume and remember what the system reports back"""
+        self.system_volume = self.set_volume(target_volume)
+        return self.system_volume
+
+    def read_volume(self):
+        """The system volume now (control_loop re-reads it once a second)"""
+        return self.system_volume
+
+    def browser_wanted(self):
+        """Whether speed changes are posted to the browser scheduler"""
+        return True
+
+class LiveControlContext(ControlContext):
+    """The real system volume and browser; the volume is the module's system_volume, which the HUD shows"""
+    @property
+    def system_volume(self):
+        return system_volume
+
+    @system_volume.setter
+    def system_volume(self, value):
+        global system_volume
+        system_volume = value
+
+    def read_volume(self):
+        return get_system_volume()
+
+    def browser_wanted(self):
+        # Also while disconnected: the worker reconnects and then sends the newest speed
+        return selenium_active or browser is not None
+
+VOLUME_MIN_INTERVAL = 0.1  # Seconds between volume changes, like the old inline cooldown
+
+actuator_scheduler = ActuatorScheduler()
+# Browser commands get their own worker, so a slow WebDriver round trip never delays volume changes
+browser_scheduler = ActuatorScheduler()
+live_control = LiveControlContext(actuator_scheduler, browser_scheduler, adjust_system_volume, system_volume)
+
+actuator_scheduler.register('volume', live_control.apply_volume, min_interval=VOLUME_MIN_INTERVAL,
+                            duration_histogram=ACTUATOR_VOLUME)
+browser_scheduler.register('speed', send_youtube_speed, duration_histogram=ACTUATOR_SPEED,
+                           retry_delay=0.5, max_retry_delay=8.0)
+browser_scheduler.register('health', check_browser_health, duration_histogram=BROWSER_HEALTH_CHECK,
+                           retry_delay=0.5, max_retry_delay=8.0)
+
+# Landmark indices used by the gestures
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+HAND_SIDES = ('left', 'right')
+
+# Finger landmarks for the "extended" gesture feature: (tip, middle joint, reference point). A finger counts as
+# extended when its tip is farther from the reference point than its middle joint
+FINGERS = {'thumb': (4, 3, 17), 'index': (8, 6, 0), 'middle': (12, 10, 0), 'ring': (16, 14, 0), 'pinky': (20, 18, 0)}
+
+def vector_length(vectors):
+    """Lengths of (..., 2) vectors"""
+    return np.hypot(vectors[..., 0], vectors[..., 1])
+
+class GestureRegistry:
+    """Gestures declared as the landmark features they need plus trigger rules, evaluated in one pass
+
+    Features are tuples:
+        ("distance", a, b)        landmarks a and b of a hand, relative to the frame width
+        ("angle", a, b, c)        angle a-b-c of a hand in degrees (180: straight)
+        ("extended", finger)      1.0 if the finger (FINGERS) is stretched out, else 0.0
+        ("between_hands", a, b)   landmark a of the first hand to b of the second, relative to the frame width
+        ("left",), ("right",)     1.0 for a left / right hand
+        ("hands",)                number of hands in the frame
+    
+    Every frame computes the union of the registered features, one NumPy operation per feature kind, and checks
+    all gestures' rules (inclusive ranges) with a single comparison over (hands, gestures, features). A gesture
+    fires when one hand satisfies all of its rules and has its value feature; the last such hand gives the value.
+    """
+    KINDS = ("distance", "angle", "extended", "between_hands", "left", "right", "hands")
+
+    def __init__(self):
+        self.features = []   # Feature tuples in column order
+        self.columns = {}    # Feature tuple -> column
+        self.gestures = []   # (name, value column, {column: (low, high)})
+        self.actions = {}    # Gesture name -> action(value, capture_time, context)
+        self._plan = None
+
+    def feature(self, spec):
+        """Column of a feature, added to the per-frame computation on first use"""
+        spec = tuple(spec)
+        if spec[0] not in self.KINDS:
+            raise ValueError(f"unknown gesture feature {spec[0]!r}, expected one of: {', '.join(self.KINDS)}")
+        if spec[0] == "extended" and spec[1] not in FINGERS:
+            raise ValueError(f"unknown finger {spec[1]!r}, expected one of: {', '.join(FINGERS)}")
+        if spec not in self.columns:
+            self.columns[spec] = len(self.features)
+            self.features.append(spec)
+            self._plan = None
+        return self.columns[spec]
+
+    def register(self, name, value, action, rules=None):
+        """Add (or replace) a gesture: when it fires, action(value feature, capture time, control context) is called
+
+        rules: {feature: (low, high)}, all must hold for the same hand
+        """
+        rule_columns = {self.feature(spec): bounds for spec, bounds in (rules or {}).items()}
+        gesture = (name, self.feature(value), rule_columns)
+        self.gestures = [g for g in self.gestures if g[0] != name] + [gesture]
+        self.actions[name] = action
+        self._plan = None
+
+    def _compile(self):
+        """Rule bounds as (gestures, features) arrays and the landmark indices of each feature kind"""
+        shape = (len(self.gestures), len(self.features))
+        low = np.full(shape, -np.inf, dtype=np.float32)
+        high = np.full(shape, np.inf, dtype=np.float32)
+        used = np.zeros(shape, dtype=bool)
+        for g, (name, value_column, rules) in enumerate(self.gestures):
+            used[g, value_column] = True  # A missing value (NaN) never passes, e.g. between_hands with one hand
+            for column, (rule_low, rule_high) in rules.items():
+                low[g, column], high[g, column] = rule_low, rule_high
+                used[g, column] = True
+        
+        kinds = {}
+        for column, spec in enumerate(self.features):
+            params = FINGERS[spec[1]] if spec[0] == "extended" else spec[1:]
+            kinds.setdefault(spec[0], ([], []))
+            kinds[spec[0]][0].append(column)
+            kinds[spec[0]][1].append(params)
+        kinds = {kind: (np.array(columns), np.array(params, dtype=np.intp).reshape(len(columns), -1).T)
+                 for kind, (columns, params) in kinds.items()}
+        value_columns = np.array([value_column for _, value_column, _ in self.gestures], dtype=np.intp)
+        self._plan = (low, high, ~used, value_columns, kinds)
+        return self._plan
+
+    def compute(self, hand_landmarks, handedness, num_hands, w, h):
+        """(hands, features) matrix of the first num_hands hands, NaN where a feature doesn't apply"""
+        kinds = (self._plan or self._compile())[-1]
+        points = hand_landmarks[:num_hands, :, :2] * np.array([1.0, h / w], dtype=np.float32)  # Frame width units
+        values = np.full((num_hands, len(self.features)), np.nan, dtype=np.float32)
+        for kind, (columns, params) in kinds.items():
+            if kind == "distance":
+                a, b = params
+                values[:, columns] = vector_length(points[:, a] - points[:, b])
+            elif kind == "angle":
+                a, b, c = params
+                u, v = points[:, a] - points[:, b], points[:, c] - points[:, b]
+                cross = u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+                values[:, columns] = np.degrees(np.abs(np.arctan2(cross, (u * v).sum(axis=-1))))
+            elif kind == "extended":
+                tip, middle, reference = params
+                values[:, columns] = (vector_length(points[:, tip] - points[:, reference])
+                                      > vector_length(points[:, middle] - points[:, reference]))
+            elif kind == "between_hands":
+                if num_hands >= 2:
+                    a, b = params
+                    values[:, columns] = vector_length(points[0, a] - points[1, b])
+            elif kind == "hands":
+                values[:, columns] = num_hands
+            else:
+                values[:, columns] = (handedness[:num_hands] == HAND_SIDES.index(kind))[:, None]
+        return values
+
+    def evaluate(self, hand_landmarks, handedness, num_hands, w, h):
+        """Features of every hand and the gestures that fire -> (features, {name: (hand, value)})"""
+        if not num_hands or not self.gestures:
+            return np.empty((0, len(self.features)), dtype=np.float32), {}
+        low, high, unused, value_columns, _ = self._plan or self._compile()
+        values = self.compute(hand_landmarks, handedness, num_hands, w, h)
+        candidate = values[:, None, :]
+        active = (((candidate >= low) & (candidate <= high)) | unused).all(axis=2)  # (hands, gestures)
+        fired_gestures = np.flatnonzero(active.any(axis=0))
+        if not len(fired_gestures):
+            return values, {}
+        # Last matching hand of each fired gesture and its value
+        hands = num_hands - 1 - active[::-1, fired_gestures].argmax(axis=0)
+        fired_values = values[hands, value_columns[fired_gestures]]
+        return values, {self.gestures[g][0]: (hand, value) for g, hand, value
+                        in zip(fired_gestures.tolist(), hands.tolist(), fired_values.tolist())}
+
+    def dispatch(self, fired, capture_time=None, context=None):
+        """Run the actions of the fired gestures against a ControlContext (default: live_control) -> {name: what
+        the action returned}"""
+        context = context or live_control
+        return {name: self.actions[name](value, capture_time, context) for name, (hand, value) in fired.items()}
+
+gesture_registry = GestureRegistry()  # Gestures are registered below, after their actions
+
+def hand_geometry(hand_landmarks, handedness, num_hands, w, h):
+    """Pixel landmarks of all detected hands, their gesture features and the gestures they trigger"""
+    features, fired = gesture_registry.evaluate(hand_landmarks, handedness, num_hands, w, h)
+    scale = np.array([w, h], dtype=np.float32)
+    return {
+        'pixels': (hand_landmarks[:num_hands, :, :2] * scale).astype(np.int32),
+        'sides': [HAND_SIDES[side] for side in handedness[:num_hands]],
+        'features': features,
+        'gestures': fired  # name -> (hand, value)
+    }
+
+def smooth_hand_landmarks(slot):
+    """Run the landmark filter bank over a processed slot in place, timed by the frame's capture time"""
+    if landmark_filter is None:
+        return
+    # Gather the (last) hand of each side so the filter state follows hands, not detection order
+    by_side = np.full(2, -1)
+    for hand in range(slot.num_hands):
+        by_side[slot.handedness[hand]] = hand
+    present = by_side >= 0
+
+    # Hands that left the view start from scratch when they come back
+    landmark_filter.reset(~present[:, None, None])
+    measured = landmark_filter.value.copy()
+    measured[present] = slot.hand_landmarks[by_side[present]]
+    smoothed = landmark_filter.update(measured, slot.capture_time, mask=present[:, None, None])
+    slot.hand_landmarks[by_side[present]] = smoothed[present]
+
+def update_volume_control(distance, capture_time=None, context=None):
+    """Map the distance between both index fingers (relative to frame width) to system volume, return the target volume"""
+    global last_volume_change_time, last_volume_status
+    
+    context = context or live_control
+    smoothed_distance = distance_filter.update(distance)
+    
+    max_distance = 0.5
+    target_volume = int(np.interp(smoothed_distance, [0, max_distance], [0, 100]))
+    
+    # Hand the target to the actuator worker (rate limited to one change per 100ms there)
+    if abs(target_volume - context.system_volume) > 2:
+        context.actuator_scheduler.post('volume', target_volume, capture_time)
+        last_volume_change_time = time.perf_counter() if capture_time is None else capture_time
+        last_volume_status = "Increase" if target_volume > context.system_volume else "Decrease"
+    
+    return target_volume
+
+def update_speed_control(distance, now=None, context=None):
+    """Turn the left hand thumb-index distance (relative to frame width) into playback speed changes"""
+    global prev_left_hand_distance, current_speed, last_speed_change_time
+    global last_speed_status, speed_trend
+    
+    # Save value to history (for prediction)
+    distance_history.append(distance)
+    
+    # Apply advanced smooth filter
+    smoothed_distance = left_hand_filter.update(distance)
+    filtered_distance_history.append(smoothed_distance)
+    
+    if prev_left_hand_distance is not None:
+        distance_change = smoothed_distance - prev_left_hand_distance
+        
+        # Update general speed trend (for display)
+        if abs(distance_change) > 0.005:  # More sensitive to small changes
+            speed_trend = 1 if distance_change > 0 else -1
+        else:
+            speed_trend = 0
+    
+    # Same input, same speed steps: one browser update per actual speed change
+    now = time.perf_counter() if now is None else now
+    new_index = speed_controller.update(smoothed_distance, now)
+    if new_index is not None:
+        old_speed = current_speed
+        current_speed = adjust_playback_speed(new_index, now, context)
+        last_speed_status = "Speed up" if current_speed > old_speed else "Slow down"
+        last_speed_change_time = now
+    
+    # Update previous distance
+    prev_left_hand_distance = smoothed_distance
     
     return current_speed
 
+# Volume: distance between both index fingers. Speed: thumb-index distance of the (last) left hand
+gesture_registry.register('volume', ("between_hands", INDEX_TIP, INDEX_TIP), update_volume_control,
+                          rules={("hands",): (2, 2)})
+gesture_registry.register('speed', ("distance", THUMB_TIP, INDEX_TIP), update_speed_control,
+                          rules={("left",): (1, 1)})
+
+def reset_control_state():
+    """Reset filters and gesture state so a new input starts from scratch"""
+    global distance_filter, left_hand_filter, prev_left_hand_distance, speed_index, current_speed
+    global last_volume_change_time, last_speed_change_time
+    global last_volume_status, last_speed_status, speed_trend
+    
+    distance_filter = AdvancedSmoothFilter(**volume_filter_options)
+    left_hand_filter = AdvancedSmoothFilter(**speed_filter_options)
+    prev_left_hand_distance = None
+    speed_controller.reset()
+    speed_index = speed_controller.index
+    current_speed = speed_controller.speed
+    last_volume_change_time = 0
+    last_speed_change_time = 0
+    last_volume_status = ""
+    last_speed_status = ""
+    speed_trend = 0
+    distance_history.clear()
+    filtered_distance_history.clear()
+    fps_values.clear()
+    if landmark_filter is not None:
+        landmark_filter.reset()
+
 def draw_centered_label(frame, text, position, size=0.5, thickness=1):
     """Draw centered label with white background and black text"""
     text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, size, thickness)[0]
@@ -804,123 +2311,2449 @@ def draw_centered_label(frame, text, position, size=0.5, thickness=1):
     text_offset_y = bg_y + (bg_height + text_size[1]) // 2
     cv2.putText(frame, text, (text_offset_x, text_offset_y), cv2.FONT_HERSHEY_SIMPLEX, size, (0, 0, 0), thickness)
 
-def camera_reader():
-    """Read camera from webcam (performance optimized)"""
-    global processing_active
+class HudRenderer:
+    """HUD drawing primitives of the main loop, drawn straight onto the frame every time"""
+    def label(self, frame, text, position, size=0.5, thickness=1):
+        """Text in a white box centered on position"""
+        draw_centered_label(frame, text, position, size, thickness)
+
+    def text(self, frame, text, origin, size, color, thickness=1):
+        """Text without background, origin is the bottom-left corner (like cv2.putText)"""
+        cv2.putText(frame, text, origin, cv2.FONT_HERSHEY_SIMPLEX, size, color, thickness)
+
+    def bar(self, frame, x, y, width, height, fill_height, fill_color, background=(200, 200, 200)):
+        """Vertical bar filled from the bottom"""
+        cv2.rectangle(frame, (x, y), (x + width, y + height), background, -1)
+        cv2.rectangle(frame, (x, y + height - fill_height), (x + width, y + height), fill_color, -1)
+
+class CachedHudRenderer(HudRenderer):
+    """HudRenderer that renders every label, text and bar background once into a sprite (LRU cache keyed by
+    text, size, thickness and color) and composites it onto the frame
+
+    A sprite is drawn twice, over black and over white: the black one is the premultiplied color, the difference
+    is how much of the frame shows through (antialiased text edges). Opaque sprites are a plain copy,
+    the others one multiply and one add on the touched rectangle. Blended edge pixels can differ from
+    cv2.putText's own blending by one intensity level.
+    """
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.sprites = OrderedDict()  # key -> (premultiplied BGR, inverse alpha BGR or None if opaque, dx, dy)
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key):
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+        return sprite
+
+    def _add(self, key, draw, width, height, anchor):
+        self.misses += 1
+        sprite = self.sprites[key] = self._render(draw, width, height, anchor)
+        if len(self.sprites) > self.capacity:
+            self.sprites.popitem(last=False)  # Least recently used
+        return sprite
+
+    @staticmethod
+    def _render(draw, width, height, anchor):
+        """Render draw(canvas, anchor) into a sprite cropped to the pixels it touches, offsets relative to anchor"""
+        over_black = np.zeros((height, width, 3), dtype=np.uint8)
+        over_white = np.full((height, width, 3), 255, dtype=np.uint8)
+        draw(over_black, anchor)
+        draw(over_white, anchor)
+        inverse_alpha = cv2.subtract(over_white, over_black)
+        x, y, w, h = cv2.boundingRect((inverse_alpha != 255).any(axis=2).astype(np.uint8))
+        premultiplied = over_black[y:y + h, x:x + w].copy()
+        inverse_alpha = inverse_alpha[y:y + h, x:x + w].copy()
+        return premultiplied, (inverse_alpha if inverse_alpha.any() else None), x - anchor[0], y - anchor[1]
+
+    @staticmethod
+    def _blit(frame, sprite, x, y):
+        """Composite a sprite at (x, y) + its offset, clipped to the frame"""
+        premultiplied, inverse_alpha, dx, dy = sprite
+        sprite_h, sprite_w = premultiplied.shape[:2]
+        x0, y0 = x + dx, y + dy
+        frame_h, frame_w = frame.shape[:2]
+        if x0 >= 0 and y0 >= 0 and x0 + sprite_w <= frame_w and y0 + sprite_h <= frame_h:
+            target = frame[y0:y0 + sprite_h, x0:x0 + sprite_w]
+        else:
+            left, top = max(x0, 0), max(y0, 0)
+            right, bottom = min(x0 + sprite_w, frame_w), min(y0 + sprite_h, frame_h)
+            if left >= right or top >= bottom:
+                return
+            target = frame[top:bottom, left:right]
+            premultiplied = premultiplied[top - y0:bottom - y0, left - x0:right - x0]
+            if inverse_alpha is not None:
+                inverse_alpha = inverse_alpha[top - y0:bottom - y0, left - x0:right - x0]
+        if inverse_alpha is None:
+            target[...] = premultiplied
+        else:
+            cv2.multiply(target, inverse_alpha, dst=target, scale=1 / 255)
+            cv2.add(target, premultiplied, dst=target)
+
+    def label(self, frame, text, position, size=0.5, thickness=1):
+        key = ("label", text, size, thickness)
+        sprite = self._cached(key)
+        if sprite is None:
+            (text_w, text_h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, size, thickness)
+            margin = text_h + baseline + 2 * thickness + 10
+            width, height = text_w + 2 * margin, text_h + 2 * margin
+            sprite = self._add(key, lambda canvas, center: draw_centered_label(canvas, text, center, size, thickness),
+                               width, height, (width // 2, height // 2))
+        self._blit(frame, sprite, *position)
+
+    def text(self, frame, text, origin, size, color, thickness=1):
+        key = ("text", text, size, color, thickness)
+        sprite = self._cached(key)
+        if sprite is None:
+            (text_w, text_h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, size, thickness)
+            margin = text_h + baseline + 2 * thickness
+            sprite = self._add(key, lambda canvas, anchor: cv2.putText(canvas, text, anchor, cv2.FONT_HERSHEY_SIMPLEX,
+                                                                       size, color, thickness),
+                               text_w + 2 * margin, text_h + 2 * margin, (margin, margin + text_h))
+        self._blit(frame, sprite, *origin)
+
+    def bar(self, frame, x, y, width, height, fill_height, fill_color, background=(200, 200, 200)):
+        key = ("bar", width, height, background)
+        sprite = self._cached(key)
+        if sprite is None:
+            sprite = self._add(key, lambda canvas, anchor: cv2.rectangle(canvas, anchor, (width, height), background, -1),
+                               width + 1, height + 1, (0, 0))
+        self._blit(frame, sprite, x, y)
+        cv2.rectangle(frame, (x, y + height - fill_height), (x + width, y + height), fill_color, -1)
+
+hud = CachedHudRenderer()
+
+# Hand skeleton in mediapipe's default hand style: (landmark pairs, BGR color, line thickness) per connection
+# style and (landmarks, BGR color) per joint style
+SKELETON_CONNECTIONS = (
+    (((0, 1), (0, 5), (9, 13), (13, 17), (5, 9), (0, 17)), (128, 128, 128), 3),  # Palm
+    (((1, 2), (2, 3), (3, 4)), (180, 229, 255), 2),                               # Thumb
+    (((5, 6), (6, 7), (7, 8)), (128, 64, 128), 2),                                # Index
+    (((9, 10), (10, 11), (11, 12)), (0, 204, 255), 2),                            # Middle
+    (((13, 14), (14, 15), (15, 16)), (48, 255, 48), 2),                           # Ring
+    (((17, 18), (18, 19), (19, 20)), (192, 101, 21), 2),                          # Pinky
+)
+SKELETON_JOINTS = (
+    ((0, 1, 5, 9, 13, 17), (48, 48, 255)),
+    ((2, 3, 4), (180, 229, 255)),
+    ((6, 7, 8), (128, 64, 128)),
+    ((10, 11, 12), (0, 204, 255)),
+    ((14, 15, 16), (48, 255, 48)),
+    ((18, 19, 20), (192, 101, 21)),
+)
+SKELETON_FINGERTIPS = (4, 8, 12, 16, 20)
+SKELETON_BORDER_COLOR = (224, 224, 224)
+
+class SkeletonRenderer:
+    """Draws all hands' skeletons from the (hands, 21, 3) landmark array with one cv2.polylines call per style
+
+    Connections of a style are 2-point polylines of every hand. Joints are zero-length polylines: a thick line
+    with round caps of thickness 2r - 1 covers exactly the pixels of a filled cv2.circle of radius r.
+    detail "full" looks like mp_drawing.draw_landmarks (white-bordered joints of radius 5), except that all
+    borders are drawn before all fills, where mediapipe alternates them per landmark. "reduced" draws the
+    connections 2 px wide and only the fingertips, without borders.
+    """
+    DETAILS = ("full", "reduced")
+
+    def __init__(self, detail="full"):
+        self.detail = detail
+        self.connections = [(np.array(pairs), color, thickness) for pairs, color, thickness in SKELETON_CONNECTIONS]
+        self.joints = [(np.array(joints), color) for joints, color in SKELETON_JOINTS]
+        tips = set(SKELETON_FINGERTIPS)
+        self.fingertips = [(np.array([joint for joint in joints if joint in tips]), color)
+                           for joints, color in SKELETON_JOINTS if tips.intersection(joints)]
+
+    @staticmethod
+    def _visible(items, shown, indices):
+        """items[:, indices] of the shown hands' landmarks (or pairs) as one flat array for cv2.polylines"""
+        selected = items[:, indices]
+        if shown is None:
+            return selected.reshape(-1, *selected.shape[2:])
+        mask = shown[:, indices]
+        return selected[mask.all(axis=-1) if mask.ndim == 3 else mask]
+
+    def draw(self, frame, hand_landmarks):
+        """Draw the skeleton of every hand in hand_landmarks ((hands, 21, 3) normalized coordinates)"""
+        if not len(hand_landmarks):
+            return
+        h, w = frame.shape[:2]
+        coordinates = hand_landmarks[..., :2]
+        # Same pixel mapping as mediapipe: landmarks outside the frame are not drawn, nor their connections
+        shown = ((coordinates >= 0) & (coordinates <= 1)).all(axis=-1)
+        shown = None if shown.all() else shown
+        pixels = np.minimum(np.floor(coordinates * (w, h)), (w - 1, h - 1)).astype(np.int32)
+        full = self.detail == "full"
+        
+        for pairs, color, thickness in self.connections:
+            lines = self._visible(pixels, shown, pairs)
+            if len(lines):
+                cv2.polylines(frame, lines, False, color, thickness if full else 2)
+        
+        # Every landmark as a zero-length segment: (hands, 21, 2, 2)
+        points = np.repeat(pixels[:, :, None, :], 2, axis=2)
+        if full:
+            joints = self.joints
+            border = points.reshape(-1, 2, 2) if shown is None else points[shown]
+            if len(border):
+                cv2.polylines(frame, border, False, SKELETON_BORDER_COLOR, 2 * 6 - 1)
+        else:
+            joints = self.fingertips
+        radius = 5 if full else 4
+        for indices, color in joints:
+            dots = self._visible(points, shown, indices)
+            if len(dots):
+                cv2.polylines(frame, dots, False, color, 2 * radius - 1)
+
+skeleton = SkeletonRenderer()
+
+def draw_overlay(frame, result, geometry, target_volume=None):
+    """Skeletons, labels, bars and status texts of the main window for one processed frame"""
+    h, w = frame.shape[:2]
+    pixels = geometry['pixels']
     
-    try:
-        cap = cv2.VideoCapture(0)
-        if not cap.isOpened():
+    # Draw landmarks of all hands at once
+    skeleton.draw(frame, result.hand_landmarks[:result.num_hands])
+    for hand, hand_side in enumerate(geometry['sides']):
+        # Show hand label
+        wrist_x, wrist_y = pixels[hand, WRIST].tolist()
+        
+        # Use custom label function with white background
+        hud.label(frame, f"{hand_side.capitalize()} hand", 
+                  (wrist_x, wrist_y - 15), size=0.5, thickness=1)
+    
+    # Volume control (when 2 hands present)
+    if target_volume is not None:
+        (x1, y1), (x2, y2) = pixels[:2, INDEX_TIP].tolist()
+        
+        # Draw line between hands with more prominent visualization
+        cv2.line(frame, (x1, y1), (x2, y2), (255, 0, 0), 3)
+        
+        # Add mid-point volume display
+        mid_x = (x1 + x2) // 2
+        mid_y = (y1 + y2) // 2
+        
+        # Draw centered volume display
+        hud.label(frame, f"{system_volume}%", (mid_x, mid_y), size=0.6, thickness=2)
+        
+        # Volume bar directly on frame - centered vertically
+        bar_x = w - 50
+        bar_y = (h - 200) // 2  # Center vertically
+        bar_h = 200
+        bar_w = 30
+        
+        # Background and current volume
+        fill_h = int(bar_h * (system_volume / 100))
+        hud.bar(frame, bar_x, bar_y, bar_w, bar_h, fill_h, (0, 255, 0))
+        
+        # Target volume indicator
+        target_y = bar_y + bar_h - int(bar_h * (target_volume / 100))
+        cv2.rectangle(frame, (bar_x - 5, target_y - 2), (bar_x + bar_w + 5, target_y + 2),
+                     (0, 0, 255), -1)
+        
+        # Volume percentage text
+        hud.label(frame, f"{system_volume}%", (bar_x + bar_w // 2, bar_y + bar_h + 15), 0.5, 1)
+        
+        # Show status
+        if last_volume_status:
+            color = (0, 255, 0) if last_volume_status == "Increase" else (0, 0, 255)
+            hud.label(frame, last_volume_status, (bar_x + bar_w // 2, bar_y - 15), 0.5, 1)
+    
+    # Playback speed control using left hand
+    if 'speed' in geometry['gestures']:
+        speed_hand = geometry['gestures']['speed'][0]
+        index_point = tuple(pixels[speed_hand, INDEX_TIP].tolist())
+        thumb_point = tuple(pixels[speed_hand, THUMB_TIP].tolist())
+        
+        # Draw connection between index and thumb and highlight more
+        cv2.line(frame, index_point, thumb_point, (0, 255, 255), 3)
+        cv2.circle(frame, index_point, 10, (0, 255, 255), -1)
+        cv2.circle(frame, thumb_point, 10, (0, 255, 255), -1)
+        
+        # Display playback speed at midpoint
+        mid_x = (index_point[0] + thumb_point[0]) // 2
+        mid_y = (index_point[1] + thumb_point[1]) // 2
+        hud.label(frame, f"{current_speed}x", (mid_x, mid_y), size=0.6, thickness=2)
+        
+        # Speed bar on left side - centered vertically
+        speed_bar_x = 50
+        speed_bar_y = (h - 200) // 2  # Center vertically
+        speed_bar_h = 200
+        speed_bar_w = 30
+        
+        # Background and current speed
+        normalized_speed = (speed_index / (len(speed_values) - 1))
+        fill_h = int(speed_bar_h * normalized_speed)
+        hud.bar(frame, speed_bar_x, speed_bar_y, speed_bar_w, speed_bar_h, fill_h, (255, 165, 0))
+        
+        # Speed text
+        hud.label(frame, f"{current_speed}x", 
+                  (speed_bar_x + speed_bar_w // 2, speed_bar_y + speed_bar_h + 15), 0.5, 1)
+        
+        # Show trend indicator near speed bar
+        trend_text = ""
+        if speed_trend > 0:
+            trend_text = "▲"
+            hud.label(frame, trend_text, 
+                      (speed_bar_x + speed_bar_w // 2, speed_bar_y - 15), 0.7, 2)
+        elif speed_trend < 0:
+            trend_text = "▼"
+            hud.label(frame, trend_text, 
+                      (speed_bar_x + speed_bar_w // 2, speed_bar_y - 15), 0.7, 2)
+        
+        # Show speed status
+        if last_speed_status:
+            color = (255, 165, 0) if last_speed_status == "Speed up" else (0, 165, 255)
+            hud.label(frame, last_speed_status, 
+                      (speed_bar_x + speed_bar_w // 2, speed_bar_y - 35), 0.5, 1)
+    
+    # Display FPS
+    hud.text(frame, f"FPS: {result.fps}", (w - 80, 20), 0.6, (255, 255, 255), 1)
+    
+    # Display browser type
+    browser_info = f"Using {browser_type.capitalize()}"
+    hud.text(frame, browser_info, (10, 20), 0.5, (255, 255, 255), 1)
+    
+    # Show Selenium status
+    status_text = "Connected" if selenium_active else ("Reconnecting" if browser is not None else "Disconnected")
+    status_color = (0, 255, 0) if selenium_active else (0, 0, 255)
+    hud.text(frame, f"YouTube: {status_text}", (10, h - 10), 0.5, status_color, 1)
+    
+    if remote_control.paused:
+        hud.text(frame, "PAUSED", (w // 2 - 40, 30), 0.8, (0, 0, 255), 2)
+
+# Frame sources for camera_reader
+# realtime=True paces frames at the source frame rate (like a live webcam),
+# realtime=False delivers frames as fast as the pipeline can consume them
+class FrameSource(abc.ABC):
+    """Base class for everything camera_reader can read frames from"""
+    name = "source"
+    live = False  # Live sources can simply be read less often while idle
+
+    def __init__(self, realtime=True, fps=30.0, loop=False):
+        self.realtime = realtime
+        self.fps = fps
+        self.loop = loop
+        self.exhausted = False  # True when a recorded source has no more frames
+        self.capture_time = None  # time.perf_counter() when the last frame was grabbed, if the source knows
+        self.frames_skipped = 0   # Frames the last read() skipped to get to the newest one
+        self._next_frame_time = None
+
+    def open(self):
+        return True
+
+    @abc.abstractmethod
+    def read(self, out=None):
+        """Return (ret, frame) like cv2.VideoCapture.read(), reusing out when the size matches"""
+
+    def release(self):
+        pass
+
+    def _pace(self):
+        """Sleep until the next frame is due when running in real-time mode"""
+        if not self.realtime or not self.fps:
+            return
+        now = time.perf_counter()
+        if self._next_frame_time is None:
+            self._next_frame_time = now
+        delay = self._next_frame_time - now
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            # Running behind, don't try to catch up with a burst of frames
+            self._next_frame_time = now
+        self._next_frame_time += 1.0 / self.fps
+
+def fourcc_string(code):
+    """cv2.CAP_PROP_FOURCC value -> 'MJPG'"""
+    code = int(code)
+    return "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)).strip("\x00") or "-"
+
+class CameraFrameSource(FrameSource):
+    """Live webcam (always paced by the device itself)
+
+    Frames are grabbed and decoded separately: after a pause (idle mode, a slow consumer) the driver may hold
+    old frames, those are grabbed until a grab has to wait for the camera, and only that newest one is decoded.
+    """
+    name = "camera"
+    live = True
+    max_flush = 4  # At most this many buffered frames skipped per read
+
+    def __init__(self, index=0, width=640, height=360, fps=60, fourcc="MJPG", buffer_size=1, **kwargs):
+        super().__init__(fps=fps, **kwargs)
+        self.index = index
+        self.width = width
+        self.height = height
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+        self.cap = None
+        self.negotiated = None  # What the driver actually delivers, see negotiate()
+        self.last_grab_time = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.index)
+        if not self.cap.isOpened():
             print("ERROR: Could not open webcam. Please check your camera connection.")
+            return False
+        self.negotiate()
+        return True
+
+    def negotiate(self):
+        """Ask for resolution, frame rate, FOURCC and buffer size, then report what the driver accepted"""
+        requested = {'width': self.width, 'height': self.height, 'fps': self.fps, 'fourcc': self.fourcc,
+                     'buffer_size': self.buffer_size}
+        accepted = {
+            'width': self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width),
+            'height': self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height),
+            'fps': self.cap.set(cv2.CAP_PROP_FPS, self.fps),
+            'fourcc': self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc)),
+            'buffer_size': self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size),
+        }
+        actual = {
+            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': round(self.cap.get(cv2.CAP_PROP_FPS), 2),
+            'fourcc': fourcc_string(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            'buffer_size': int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+        }
+        self.negotiated = {'backend': self.cap.getBackendName(),
+                           'settings': {name: {'requested': requested[name], 'accepted': bool(accepted[name]),
+                                               'actual': actual[name]} for name in requested}}
+        
+        print(f"\nCamera {self.index} ({self.negotiated['backend']}):")
+        print(f"  {'setting':<12}{'requested':>10}{'actual':>10}")
+        for name, setting in self.negotiated['settings'].items():
+            note = "" if setting['accepted'] else "  (not supported by the driver)"
+            if setting['accepted'] and setting['actual'] != setting['requested']:
+                note = "  (differs)"
+            print(f"  {name:<12}{str(setting['requested']):>10}{str(setting['actual']):>10}{note}")
+        if actual['fps'] > 0:
+            self.fps = actual['fps']
+        return self.negotiated
+
+    def read(self, out=None):
+        frame_interval = 1.0 / self.fps if self.fps else 0.0
+        start = time.perf_counter()
+        if not self.cap.grab():
+            return False, None
+        now = time.perf_counter()
+        self.frames_skipped = 0
+        # Away for more than a frame: while grabs return at once, the frames came from the driver's buffer
+        if self.last_grab_time is not None and start - self.last_grab_time > 1.5 * frame_interval:
+            while now - start < 0.25 * frame_interval and self.frames_skipped < self.max_flush:
+                start = now
+                if not self.cap.grab():
+                    return False, None
+                now = time.perf_counter()
+                self.frames_skipped += 1
+            FRAMES_FLUSHED.inc(self.frames_skipped)
+        self.last_grab_time = self.capture_time = now
+        return self.cap.retrieve(out)
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+class VideoFileFrameSource(FrameSource):
+    """Recorded video clip"""
+    name = "video"
+
+    def __init__(self, path, fps=None, **kwargs):
+        super().__init__(fps=fps, **kwargs)
+        self.path = path
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            print(f"ERROR: Could not open video file: {self.path}")
+            return False
+        if not self.fps:
+            # Use the clip's own frame rate unless one was given
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        return True
+
+    def read(self, out=None):
+        self._pace()
+        ret, frame = self.cap.read(out)
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(out)
+        if not ret:
+            self.exhausted = True
+        return ret, frame
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+class ImageDirectoryFrameSource(FrameSource):
+    """Directory of numbered images, read in sorted file name order"""
+    name = "images"
+    image_extensions = ('.png', '.jpg', '.jpeg', '.bmp')
+
+    def __init__(self, directory, fps=30.0, **kwargs):
+        super().__init__(fps=fps, **kwargs)
+        self.directory = directory
+        self.files = []
+        self.position = 0
+
+    def open(self):
+        if not os.path.isdir(self.directory):
+            print(f"ERROR: Image directory not found: {self.directory}")
+            return False
+        self.files = sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.lower().endswith(self.image_extensions)
+        )
+        if not self.files:
+            print(f"ERROR: No images found in {self.directory}")
+            return False
+        return True
+
+    def read(self, out=None):
+        self._pace()
+        if self.position >= len(self.files):
+            if not self.loop:
+                self.exhausted = True
+                return False, None
+            self.position = 0
+        frame = cv2.imread(self.files[self.position])
+        self.position += 1
+        return frame is not None, frame
+
+class ArrayFrameSource(FrameSource):
+    """Frames already in memory (a list of images or an N x H x W x 3 array)"""
+    name = "array"
+
+    def __init__(self, frames, fps=30.0, **kwargs):
+        super().__init__(fps=fps, **kwargs)
+        self.frames = frames
+        self.position = 0
+
+    def read(self, out=None):
+        self._pace()
+        if self.position >= len(self.frames):
+            if not self.loop or len(self.frames) == 0:
+                self.exhausted = True
+                return False, None
+            self.position = 0
+        frame = self.frames[self.position]
+        self.position += 1
+        # Hand out a copy so the pipeline can flip/draw without touching the source
+        if out is not None and out.shape == frame.shape and out.dtype == frame.dtype:
+            np.copyto(out, frame)
+            return True, out
+        return True, frame.copy()
+
+def create_frame_source(spec=None, realtime=True, fps=None, loop=False, camera_options=None):
+    """Build a frame source from a camera index, video file or image directory
+
+    camera_options: width, height, fps, fourcc and buffer_size to ask a webcam for (fps overrides its fps)
+    """
+    if spec is None or str(spec).isdigit():
+        options = dict(camera_options or {}, **({'fps': fps} if fps else {}))
+        return CameraFrameSource(int(spec or 0), realtime=realtime, loop=loop, **options)
+    if os.path.isdir(spec):
+        return ImageDirectoryFrameSource(spec, fps=fps or 30.0, realtime=realtime, loop=loop)
+    return VideoFileFrameSource(spec, fps=fps, realtime=realtime, loop=loop)
+
+# Preallocated frame ring shared by camera_reader, hand_processor and the main loop
+# Slots are reused forever: capture writes into a free slot, processing fills in the results,
+# the main loop draws on the same buffer and gives the slot back. Only the newest slot waits
+# at each stage (latest wins), an older unconsumed slot goes straight back to the free list.
+class FrameSlot:
+    """One reusable frame buffer plus everything computed for it"""
+    def __init__(self, index):
+        self.index = index
+        self.frame = None             # Mirrored BGR frame, allocated on first use
+        self.sequence = -1            # Capture sequence number
+        self.capture_time = 0.0       # time.perf_counter() right after the frame was read
+        self.processed_time = 0.0
+        self.end_of_input = False     # Marks the end of recorded input instead of carrying a frame
+        self.used_roi = False         # Landmarks came from a tracked crop instead of the whole frame
+        # Detected hands: normalized (x, y, z) landmarks, handedness (0 left, 1 right, -1 none) and scores
+        self.hand_landmarks = np.zeros((MAX_HANDS, 21, 3), dtype=np.float32)
+        self.handedness = np.full(MAX_HANDS, -1, dtype=np.int8)
+        self.hand_scores = np.zeros(MAX_HANDS, dtype=np.float32)
+        self.num_hands = 0
+        self.fps = 0
+        self.timings = {'capture': 0.0, 'preprocess': 0.0, 'inference': 0.0, 'extract': 0.0}
+        # Set by the control loop for the display: hand_geometry() of the frame and the volume target, if any
+        self.geometry = None
+        self.target_volume = None
+
+    def frame_buffer(self, shape):
+        """Return the slot's frame buffer, (re)allocating only if the frame size changed"""
+        if self.frame is None or self.frame.shape != shape:
+            self.frame = np.empty(shape, dtype=np.uint8)
+        return self.frame
+
+    def clear_results(self):
+        self.handedness[:] = -1
+        self.num_hands = 0
+
+class FrameRing:
+    """Fixed pool of frame slots passed capture -> processing -> control -> display with latest-wins semantics"""
+    stages = ('captured', 'processed', 'controlled')
+
+    def __init__(self, size=7):
+        # 7 slots = one being written + one waiting + one processing + one waiting + one in the control loop
+        # + one waiting + one displayed
+        self.slots = [FrameSlot(i) for i in range(size)]
+        self.free = deque(self.slots)
+        self.pending = {stage: None for stage in self.stages}
+        self.condition = threading.Condition()
+        self.max_age = None  # Seconds since capture after which take() drops a frame instead of returning it
+
+    def reset(self):
+        """Return every slot to the free list"""
+        with self.condition:
+            self.free = deque(self.slots)
+            self.pending = {stage: None for stage in self.stages}
+            self.condition.notify_all()
+
+    def acquire(self, timeout=0.1):
+        """Take a free slot to write into (None if none became free in time)"""
+        with self.condition:
+            if not self.free and not self.condition.wait_for(lambda: self.free, timeout):
+                return None
+            slot = self.free.popleft()
+            slot.end_of_input = False
+            return slot
+
+    def publish(self, slot, stage, wait=False, drop_counter=None):
+        """Hand a slot to the next stage, replacing (or with wait=True, waiting for) the pending one"""
+        with self.condition:
+            if wait:
+                while self.pending[stage] is not None and processing_active:
+                    self.condition.wait(0.1)
+            previous = self.pending[stage]
+            if previous is not None:
+                self.free.append(previous)
+                if drop_counter is not None:
+                    drop_counter.inc()
+            self.pending[stage] = slot
+            self.condition.notify_all()
+
+    def take(self, stage, timeout=0.03):
+        """Take the newest slot waiting at a stage (None on timeout), dropping slots older than max_age"""
+        deadline = time.perf_counter() + timeout
+        with self.condition:
+            while True:
+                if self.pending[stage] is None and not self.condition.wait_for(
+                        lambda: self.pending[stage] is not None, max(0.0, deadline - time.perf_counter())):
+                    return None
+                slot = self.pending[stage]
+                self.pending[stage] = None
+                self.condition.notify_all()
+                if (self.max_age and not slot.end_of_input
+                        and time.perf_counter() - slot.capture_time > self.max_age):
+                    # Too old to act on: straight back to the free list, keep waiting for a fresh one
+                    self.free.append(slot)
+                    FRAMES_STALE[stage].inc()
+                    continue
+                return slot
+
+    def release(self, slot):
+        """Give a slot back once nobody uses its buffer any more"""
+        with self.condition:
+            self.free.append(slot)
+            self.condition.notify_all()
+
+frame_ring = FrameRing()  # Resized in main() when inference worker processes keep more frames in flight
+
+def camera_reader():
+    """Read frames from the configured frame source (performance optimized)"""
+    global processing_active, frame_source
+
+    if frame_source is None:
+        frame_source = CameraFrameSource(0)
+    source = frame_source
+    raw_frame = None  # Reused capture buffer, frames are mirrored from here into the ring
+    sequence = 0
+
+    try:
+        with startup_profile.phase("camera open"):
+            opened = source.open()
+        if not opened:
             processing_active = False
             return
-            
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 360)
-        cap.set(cv2.CAP_PROP_FPS, 60)  # Increase from 30fps to 60fps for better sensitivity
-        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
         while processing_active:
-            ret, frame = cap.read()
+            if source.live and idle_scheduler.idle:
+                # Nobody in view: don't read (and decode) frames the processor would skip anyway
+                time.sleep(idle_scheduler.time_until_next_detection(time.perf_counter()))
+            read_start = time.perf_counter()
+            ret, frame = source.read(raw_frame)
             if not ret:
+                if source.exhausted:
+                    # Tell the processor (and the main loop after it) that the input is over
+                    slot = None
+                    while slot is None and processing_active:
+                        slot = frame_ring.acquire()
+                    if slot is not None:
+                        slot.end_of_input = True
+                        frame_ring.publish(slot, 'captured', wait=True)
+                    break
                 print("WARNING: Failed to capture frame from camera. Trying again...")
                 time.sleep(0.1)
                 continue
-            
-            frame = cv2.flip(frame, 1)
-            try:
-                if frame_queue.full():
-                    frame_queue.get_nowait()
-                frame_queue.put(frame, block=False)
-            except queue.Full:
-                pass
-                
+            # Grab time if the source knows it (before decoding), otherwise when read() returned
+            capture_time = source.capture_time or time.perf_counter()
+            raw_frame = frame
+            startup_profile.mark("first frame captured")
+            STAGE_CAPTURE.observe(capture_time - read_start)
+            FRAMES_CAPTURED.inc()
+
+            # Skipped frames still count, gaps in the sequence numbers show where frames were dropped
+            sequence += source.frames_skipped
+            slot = frame_ring.acquire()
+            if slot is None:
+                sequence += 1
+                continue
+            cv2.flip(frame, 1, dst=slot.frame_buffer(frame.shape))
+            slot.sequence = sequence
+            slot.capture_time = capture_time
+            slot.timings['capture'] = time.perf_counter() - read_start
+            sequence += 1
+
+            # Live input keeps only the newest frame, as-fast-as-possible input waits for the processor
+            frame_ring.publish(slot, 'captured', wait=not source.realtime, drop_counter=FRAMES_DROPPED_CAPTURE)
+
     except Exception as e:
         print(f"ERROR in camera thread: {e}")
         processing_active = False
     finally:
-        if 'cap' in locals() and cap is not None:
-            cap.release()
+        source.release()
         print("Camera thread terminated.")
 
+# Hand detection front end for hand_processor
+# "full": downscale the whole frame by 0.5 (fast, default)
+# "roi":  run on a full-resolution crop around where the hands were in the previous frame,
+#         falling back to a full-frame detection when tracking is lost (and every few frames to find new hands)
+class HandDetector:
+    """MediaPipe Hands on the downscaled frame ("full"), or ("roi") on a full-resolution crop around each hand
+
+    In roi mode every hand found by a full-frame detection gets its own padded box and single-hand model. The box
+    stays put while the hand moves inside it, so the model tracks in a fixed coordinate frame; when the hand gets
+    close to the edge the box is centered on it again, and its model reset if that moved the box by more than the
+    hand could move between two frames. A lost hand, two crops finding the same
+    hand, or every redetect_interval frames: full-frame detection again (which also catches new hands), hands that
+    still fit their box keep it and their model's tracking.
+    """
+    def __init__(self, mode="full", scale=0.5, roi_padding=1.0, roi_min_size=128, redetect_interval=30):
+        self.mode = mode
+        self.scale = scale
+        self.roi_padding = roi_padding              # Padding around each hand, relative to its box size
+        self.roi_min_size = roi_min_size            # Smallest crop side in pixels
+        self.redetect_interval = redetect_interval  # Full-frame detections in between to catch new hands
+        self.roi_boxes = []                         # (x0, y0, x1, y1) in frame pixels, one per tracked hand
+        self.frames_since_full = 0
+        self.last_used_roi = False
+        self.hands = None                           # Full-frame model, created by load()
+        self.roi_hands = []                         # Single-hand model per box, so each crop is tracked on its own
+        # Reused destination buffers
+        self.small_frame = None
+        self.rgb_frame = None
+        self.roi_buffer = None
+
+    def reset(self):
+        self.roi_boxes = []
+        self.frames_since_full = 0
+
+    def load(self):
+        """Create the MediaPipe model(s) now instead of on the first frame"""
+        if self.hands is None:
+            # In roi mode full-frame detections are far apart, there is nothing recent to track
+            self.hands = create_hands_model(static_image_mode=self.mode == "roi")
+        if self.mode == "roi":
+            while len(self.roi_hands) < MAX_HANDS:
+                self.roi_hands.append(create_hands_model(max_hands=1))
+
+    def warm_up(self, frame_shape=(360, 640, 3)):
+        """Load the model(s) and run a dummy inference, so the first real frame doesn't pay for initialization"""
+        self.load()
+        blank = np.zeros(frame_shape, dtype=np.uint8)
+        self._detect_full(blank, frame_shape[1], frame_shape[0])  # Also allocates the resize buffers
+        for model in self.roi_hands:
+            model.process(self.rgb_frame)
+            model.reset()
+        self.reset()
+
+    def close(self):
+        if self.hands is not None:
+            self.hands.close()
+            self.hands = None
+        for model in self.roi_hands:
+            model.close()
+        self.roi_hands = []
+
+    def detect(self, frame, landmarks_out, handedness_out, scores_out):
+        """Run MediaPipe Hands on the frame and fill the landmark arrays
+
+        Returns (hand count, preprocess seconds, inference seconds, extract seconds).
+        """
+        h, w, _ = frame.shape
+        preprocess_time = inference_time = 0.0
+        if self.mode == "roi" and self.roi_boxes and self.frames_since_full < self.redetect_interval:
+            count, preprocess_time, inference_time, extract_time = self._detect_rois(
+                frame, landmarks_out, handedness_out, scores_out)
+            if count == len(self.roi_boxes):
+                self.last_used_roi = True
+                self.frames_since_full += 1
+                return count, preprocess_time, inference_time, extract_time
+            # A hand was lost: re-detect on the whole frame
+        
+        results, full_preprocess, full_inference = self._detect_full(frame, w, h)
+        extract_start = time.perf_counter()
+        count = extract_hand_arrays(results, landmarks_out, handedness_out, scores_out)
+        self.last_used_roi = False
+        # Fewer hands than were tracked: one more full-frame detection before trusting that count
+        self.frames_since_full = self.redetect_interval if count < len(self.roi_boxes) else 0
+        if self.mode == "roi":
+            self._assign_boxes(landmarks_out, count, w, h)
+        return (count, preprocess_time + full_preprocess, inference_time + full_inference,
+                time.perf_counter() - extract_start)
+
+    def _detect_full(self, frame, w, h):
+        start = time.perf_counter()
+        # Reduce processing size to increase performance
+        small_size = (int(round(w * self.scale)), int(round(h * self.scale)))
+        if self.small_frame is None or self.small_frame.shape[:2] != (small_size[1], small_size[0]):
+            self.small_frame = np.empty((small_size[1], small_size[0], 3), dtype=np.uint8)
+            self.rgb_frame = np.empty_like(self.small_frame)
+        cv2.resize(frame, small_size, dst=self.small_frame)
+        cv2.cvtColor(self.small_frame, cv2.COLOR_BGR2RGB, dst=self.rgb_frame)
+        preprocess_end = time.perf_counter()
+        
+        # Process hands
+        if self.hands is None:
+            self.load()
+        results = self.hands.process(self.rgb_frame)
+        return results, preprocess_end - start, time.perf_counter() - preprocess_end
+
+    def _detect_rois(self, frame, landmarks_out, handedness_out, scores_out):
+        """Track each hand in its own crop -> (hands found, preprocess, inference, extract seconds), stops at the
+        first crop that lost its hand or found a hand another crop already has"""
+        h, w, _ = frame.shape
+        if len(self.roi_hands) < len(self.roi_boxes):
+            self.load()
+        if self.roi_buffer is None or self.roi_buffer.size < frame.size:
+            self.roi_buffer = np.empty(frame.size, dtype=np.uint8)
+        preprocess_time = inference_time = extract_time = 0.0
+        count = 0
+        for number, box in enumerate(self.roi_boxes):
+            start = time.perf_counter()
+            x0, y0, x1, y1 = box
+            crop_w, crop_h = x1 - x0, y1 - y0
+            # Contiguous view into the reused buffer, sized for this crop
+            roi_rgb = self.roi_buffer[:crop_w * crop_h * 3].reshape(crop_h, crop_w, 3)
+            cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2RGB, dst=roi_rgb)
+            preprocess_end = time.perf_counter()
+            results = self.roi_hands[number].process(roi_rgb)
+            inference_end = time.perf_counter()
+            found = extract_hand_arrays(results, landmarks_out[count:count + 1], handedness_out[count:count + 1],
+                                        scores_out[count:count + 1])
+            if found:
+                hand = landmarks_out[count]
+                self._map_roi_to_frame(hand, box, w, h)
+                if any(np.abs(hand[:, :2] - landmarks_out[other, :, :2]).mean() < 0.01 for other in range(count)):
+                    found = 0  # Same hand as an earlier crop
+                else:
+                    self._follow_hand(number, hand, w, h)
+            preprocess_time += preprocess_end - start
+            inference_time += inference_end - preprocess_end
+            extract_time += time.perf_counter() - inference_end
+            if not found:
+                break
+            count += 1
+        return count, preprocess_time, inference_time, extract_time
+
+    @staticmethod
+    def _map_roi_to_frame(landmarks, box, w, h):
+        """Map crop-normalized landmarks back to frame-normalized coordinates (in place)"""
+        x0, y0, x1, y1 = box
+        crop_w, crop_h = x1 - x0, y1 - y0
+        landmarks[..., 0] *= crop_w / w
+        landmarks[..., 0] += x0 / w
+        landmarks[..., 1] *= crop_h / h
+        landmarks[..., 1] += y0 / h
+        landmarks[..., 2] *= crop_w / w
+
+    def _hand_box(self, landmarks, w, h):
+        """Padded box around one hand, in frame pixels"""
+        box_x0, box_y0 = landmarks[:, :2].min(axis=0) * (w, h)
+        box_x1, box_y1 = landmarks[:, :2].max(axis=0) * (w, h)
+        
+        # Pad by the larger side so fast movements stay inside the crop
+        pad = self.roi_padding * max(box_x1 - box_x0, box_y1 - box_y0)
+        half_w = max((box_x1 - box_x0) / 2 + pad, self.roi_min_size / 2)
+        half_h = max((box_y1 - box_y0) / 2 + pad, self.roi_min_size / 2)
+        center_x = (box_x0 + box_x1) / 2
+        center_y = (box_y0 + box_y1) / 2
+        
+        x0 = int(min(max(0, center_x - half_w), max(0, w - 16)))
+        y0 = int(min(max(0, center_y - half_h), max(0, h - 16)))
+        x1 = int(min(w, max(center_x + half_w, x0 + 16)))
+        y1 = int(min(h, max(center_y + half_h, y0 + 16)))
+        return x0, y0, x1, y1
+
+    def _box_fits(self, box, landmarks, w, h):
+        """Is the hand well inside the box (frame edges allowed) and the box not far too big for it"""
+        x0, y0, x1, y1 = box
+        hand_x0, hand_y0 = landmarks[:, :2].min(axis=0) * (w, h)
+        hand_x1, hand_y1 = landmarks[:, :2].max(axis=0) * (w, h)
+        margin = self.roi_padding / 2 * max(hand_x1 - hand_x0, hand_y1 - hand_y0)
+        inside = (hand_x0 - margin >= x0 or x0 == 0) and (hand_y0 - margin >= y0 or y0 == 0) and \
+                 (hand_x1 + margin <= x1 or x1 == w) and (hand_y1 + margin <= y1 or y1 == h)
+        # A box far too big for the hand (it moved away from the camera) doesn't fit either
+        new_x0, new_y0, new_x1, new_y1 = self._hand_box(landmarks, w, h)
+        return inside and (x1 - x0) * (y1 - y0) <= 2 * (new_x1 - new_x0) * (new_y1 - new_y0)
+
+    def _follow_hand(self, number, landmarks, w, h):
+        """Keep the box while the hand fits it, otherwise center a new one. Its model keeps tracking when the box only
+        moved by less than half the hand (like the hand moving between two frames), and is reset when it moved
+        further or changed size"""
+        old_x0, old_y0, old_x1, old_y1 = self.roi_boxes[number]
+        if self._box_fits((old_x0, old_y0, old_x1, old_y1), landmarks, w, h):
+            return
+        x0, y0, x1, y1 = self.roi_boxes[number] = self._hand_box(landmarks, w, h)
+        hand_size = (landmarks[:, :2].max(axis=0) - landmarks[:, :2].min(axis=0)) * (w, h)
+        shift = max(abs(x0 + x1 - old_x0 - old_x1), abs(y0 + y1 - old_y0 - old_y1)) / 2
+        scale = (x1 - x0) * (y1 - y0) / ((old_x1 - old_x0) * (old_y1 - old_y0))
+        if shift > hand_size.max() / 2 or not 0.8 <= scale <= 1.25:
+            self.roi_hands[number].reset()
+
+    def _assign_boxes(self, landmarks, count, w, h):
+        """Boxes for the hands of a full-frame detection: a hand that still fits a box keeps it with its model (and
+        whatever that model is tracking), any other hand gets a new box and a reset model"""
+        if len(self.roi_hands) < count:
+            self.load()
+        free = list(range(len(self.roi_hands)))
+        boxes, models = [None] * count, [None] * count
+        for hand in range(count):
+            for number in free:
+                if number < len(self.roi_boxes) and self._box_fits(self.roi_boxes[number], landmarks[hand], w, h):
+                    boxes[hand], models[hand] = self.roi_boxes[number], self.roi_hands[number]
+                    free.remove(number)
+                    break
+        for hand in range(count):
+            if boxes[hand] is None:
+                boxes[hand], models[hand] = self._hand_box(landmarks[hand], w, h), self.roi_hands[free.pop(0)]
+                models[hand].reset()  # New crop, nothing to track yet
+        self.roi_boxes = boxes
+        self.roi_hands = models + [self.roi_hands[number] for number in free]
+
+hand_detector = HandDetector()
+
+# Adaptive detection cadence: after a run of frames without hands, detect only a few times per second
+class IdleScheduler:
+    """Switch between full-rate and low-rate (idle) hand detection"""
+    def __init__(self, idle_after_frames=30, idle_rate=5.0):
+        self.idle_after_frames = idle_after_frames  # 0 disables idle mode
+        self.idle_rate = idle_rate                  # Detections per second while idle
+        self.empty_frames = 0
+        self.idle = False
+        self.next_detection_time = 0.0
+
+    def reset(self):
+        self.empty_frames = 0
+        self.idle = False
+        self.next_detection_time = 0.0
+        DETECTOR_IDLE.set(0)
+
+    def should_detect(self, now):
+        return not self.idle or now >= self.next_detection_time
+
+    def time_until_next_detection(self, now):
+        return max(0.0, self.next_detection_time - now) if self.idle else 0.0
+
+    def update(self, hands_found, now):
+        """Record the outcome of a detection"""
+        if hands_found:
+            self.empty_frames = 0
+            if self.idle:
+                # First hand seen: straight back to full rate
+                self.idle = False
+                DETECTOR_IDLE.set(0)
+                IDLE_TRANSITIONS.inc()
+            return
+        
+        self.empty_frames += 1
+        if not self.idle and self.idle_after_frames and self.empty_frames >= self.idle_after_frames:
+            self.idle = True
+            DETECTOR_IDLE.set(1)
+            IDLE_TRANSITIONS.inc()
+        if self.idle:
+            self.next_detection_time = now + 1.0 / self.idle_rate
+
+idle_scheduler = IdleScheduler()
+
+# Landmark recordings: a header, then fixed-width records (one per processed frame) with an index block after
+# every block_records records and after the last one. All little-endian.
+#   header: b"MHLREC01", uint32 JSON length, JSON metadata (record dtype, block size, clock offset...), padded
+#           with spaces to a multiple of 64 bytes
+#   index:  64 bytes (RECORDING_INDEX_DTYPE): count, first/last sequence and capture time, CRC32 of the records
+# A recording cut short (crash) ends in records without an index block, those are still readable.
+RECORDING_MAGIC = b"MHLREC01"
+RECORDING_INDEX_MAGIC = b"MHLIDX01"
+RECORDING_DTYPE = np.dtype([
+    ('sequence', '<i8'),
+    ('capture_time', '<f8'),       # time.perf_counter(), + header clock_offset for Unix time
+    ('num_hands', 'u1'),
+    ('flags', 'u1'),               # Bit 0: landmarks came from a tracked crop
+    ('handedness', 'i1', (MAX_HANDS,)),
+    ('scores', '<f4', (MAX_HANDS,)),
+    ('landmarks', '<f4', (MAX_HANDS, 21, 3)),
+])
+RECORDING_INDEX_DTYPE = np.dtype([
+    ('magic', 'S8'), ('count', '<u4'), ('crc32', '<u4'),
+    ('first_sequence', '<i8'), ('last_sequence', '<i8'),
+    ('first_time', '<f8'), ('last_time', '<f8'), ('reserved', 'V16'),
+])
+
+class LandmarkRecorder:
+    """Append every processed frame's hand tracking output to a recording file from a background thread
+
+    record() only copies the slot's arrays into a record and queues it, a full queue drops the record
+    (landmark_records_dropped_total) instead of waiting.
+    """
+    def __init__(self, path, block_records=1024, queue_size=1024, metadata=None):
+        self.path = path
+        self.block_records = block_records
+        self.metadata = metadata or {}
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.file = None
+        self.thread = None
+        self.block = []     # Index entries of the records in the current block: (sequence, capture time)
+        self.crc = 0
+
+    def start(self):
+        self.file = open(self.path, 'wb')
+        header = dict(self.metadata, version=1, record_dtype=RECORDING_DTYPE.descr, record_size=RECORDING_DTYPE.itemsize,
+                      block_records=self.block_records, max_hands=MAX_HANDS,
+                      clock_offset=time.time() - time.perf_counter(), created=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        payload = json.dumps(header).encode()
+        padding = -(len(RECORDING_MAGIC) + 4 + len(payload)) % 64
+        self.file.write(RECORDING_MAGIC + np.uint32(len(payload) + padding).tobytes() + payload + b" " * padding)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"Recording hand landmarks to {self.path}")
+        return self
+
+    def record(self, slot):
+        """Queue the slot's results (called from the processing thread, never blocks)"""
+        record = np.zeros(1, dtype=RECORDING_DTYPE)[0]
+        record['sequence'] = slot.sequence
+        record['capture_time'] = slot.capture_time
+        record['num_hands'] = slot.num_hands
+        record['flags'] = slot.used_roi
+        record['handedness'] = slot.handedness
+        record['scores'] = slot.hand_scores
+        record['landmarks'][:slot.num_hands] = slot.hand_landmarks[:slot.num_hands]
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            RECORDS_DROPPED.inc()
+
+    def _run(self):
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while len(batch) < self.block_records:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is None:  # close()
+                batch.pop()
+                running = False
+            try:
+                self._write(batch)
+            except Exception as e:
+                print(f"Error writing landmark recording: {e}")
+        try:
+            self._write_index()
+            self.file.close()
+        except Exception as e:
+            print(f"Error closing landmark recording: {e}")
+
+    def _write(self, records):
+        while records:
+            count = min(len(records), self.block_records - len(self.block))
+            data = np.array(records[:count], dtype=RECORDING_DTYPE).tobytes()
+            self.file.write(data)
+            self.crc = zlib.crc32(data, self.crc)
+            self.block.extend((record['sequence'], record['capture_time']) for record in records[:count])
+            RECORDS_WRITTEN.inc(count)
+            records = records[count:]
+            if len(self.block) == self.block_records:
+                self._write_index()
+        self.file.flush()
+
+    def _write_index(self):
+        """Close the current block with its index entry"""
+        if not self.block:
+            return
+        index = np.zeros(1, dtype=RECORDING_INDEX_DTYPE)
+        index['magic'] = RECORDING_INDEX_MAGIC
+        index['count'] = len(self.block)
+        index['crc32'] = self.crc
+        (index['first_sequence'], index['first_time']), (index['last_sequence'], index['last_time']) = \
+            self.block[0], self.block[-1]
+        self.file.write(index.tobytes())
+        self.block = []
+        self.crc = 0
+
+    def close(self):
+        """Write what is still queued, the last index block, and close the file"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join(timeout=5.0)
+            self.thread = None
+
+class LandmarkRecording:
+    """Memory-mapped reader of a LandmarkRecorder file
+
+    recording[i] is a record (sequence, capture_time, num_hands, flags, handedness, scores, landmarks) and
+    recording[a:b] a record array, both views of the file without copying, except for slices that span
+    several blocks (the index blocks sit in between), which are copied. recording.blocks are the per-block
+    views, recording.between(t0, t1) finds records by capture time through the index blocks.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        if bytes(self.data[:len(RECORDING_MAGIC)]) != RECORDING_MAGIC:
+            raise ValueError(f"{path} is not a landmark recording")
+        header_length = int(self.data[8:12].view('<u4')[0])
+        self.metadata = json.loads(bytes(self.data[12:12 + header_length]))
+        self.dtype = np.dtype([tuple(field[:2]) + ((tuple(field[2]),) if len(field) > 2 else ())
+                               for field in self.metadata['record_dtype']])
+        self.blocks = []    # Record array views, one per block
+        self.index = []     # Index entry of each block (None for records after the last index block)
+        self._read_blocks(12 + header_length)
+        self.starts = np.cumsum([0] + [len(block) for block in self.blocks])
+
+    def _index_at(self, position):
+        end = position + RECORDING_INDEX_DTYPE.itemsize
+        if end > len(self.data) or bytes(self.data[position:position + 8]) != RECORDING_INDEX_MAGIC:
+            return None
+        return self.data[position:end].view(RECORDING_INDEX_DTYPE)[0]
+
+    def _read_blocks(self, position):
+        record_size = self.dtype.itemsize
+        block_records = self.metadata['block_records']
+        size = len(self.data)
+        while position < size:
+            # A full block, the last (shorter) block, or records cut off without an index
+            count = min(block_records, (size - position) // record_size)
+            index = None
+            for candidate in (count, (size - position - RECORDING_INDEX_DTYPE.itemsize) // record_size):
+                if 0 < candidate <= block_records:
+                    index = self._index_at(position + candidate * record_size)
+                    if index is not None and index['count'] == candidate:
+                        count = candidate
+                        break
+                    index = None
+            if count <= 0:
+                break
+            end = position + count * record_size
+            self.blocks.append(self.data[position:end].view(self.dtype))
+            self.index.append(index)
+            position = end + (RECORDING_INDEX_DTYPE.itemsize if index is not None else 0)
+            if index is None:
+                break
+
+    def __len__(self):
+        return int(self.starts[-1])
+
+    def _locate(self, position):
+        block = int(np.searchsorted(self.starts, position, side='right')) - 1
+        return block, position - int(self.starts[block])
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self[:][key]
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step < 0:
+                return self[:][key]
+            if start >= stop:
+                return self.blocks[0][:0] if self.blocks else np.empty(0, dtype=self.dtype)
+            first, offset = self._locate(start)
+            last, _ = self._locate(stop - 1)
+            if first == last:
+                return self.blocks[first][offset:offset + stop - start:step]
+            return np.concatenate([block for block in self.blocks[first:last + 1]])[
+                start - int(self.starts[first]):stop - int(self.starts[first]):step]
+        position = int(key) + len(self) if int(key) < 0 else int(key)
+        if not 0 <= position < len(self):
+            raise IndexError(f"record {key} out of range ({len(self)} records)")
+        block, offset = self._locate(position)
+        return self.blocks[block][offset]
+
+    def between(self, start_time, end_time):
+        """Records with start_time <= capture_time < end_time (perf_counter seconds of the recording)"""
+        first, last = len(self), 0
+        for number, block in enumerate(self.blocks):
+            index = self.index[number]
+            if index is not None and (index['last_time'] < start_time or index['first_time'] >= end_time):
+                continue  # The index block says nothing in here, the records aren't touched
+            times = block['capture_time']
+            low, high = np.searchsorted(times, [start_time, end_time])
+            if low < high:
+                first = min(first, int(self.starts[number]) + int(low))
+                last = max(last, int(self.starts[number]) + int(high))
+        return self[first:last] if first < last else self[0:0]
+
+    def verify(self):
+        """Blocks whose records don't match the CRC32 in their index block"""
+        return [number for number, (block, index) in enumerate(zip(self.blocks, self.index))
+                if index is not None and zlib.crc32(block.tobytes()) != index['crc32']]
+
+    def summary(self):
+        if not len(self):
+            return {'path': self.path, 'records': 0}
+        first, last = self[0], self[len(self) - 1]
+        num_hands = np.concatenate([block['num_hands'] for block in self.blocks])
+        return {
+            'path': self.path,
+            'records': len(self),
+            'blocks': len(self.blocks),
+            'unindexed_records': len(self.blocks[-1]) if self.index[-1] is None else 0,
+            'corrupt_blocks': self.verify(),
+            'first_sequence': int(first['sequence']),
+            'last_sequence': int(last['sequence']),
+            'duration_s': round(float(last['capture_time'] - first['capture_time']), 3),
+            'started': time.strftime("%Y-%m-%dT%H:%M:%S",
+                                     time.localtime(float(first['capture_time']) + self.metadata['clock_offset'])),
+            'frames_with_hands': round(float(np.mean(num_hands > 0)), 3),
+            'metadata': self.metadata,
+        }
+
+    def close(self):
+        self.blocks = []
+        mmap = getattr(self.data, '_mmap', None)
+        self.data = None
+        if mmap is not None:
+            mmap.close()
+
+def publish_processed_slot(slot, fps, preprocess_time, inference_time, extract_time):
+    """Record timings/metrics for a processed slot and hand it to the main loop"""
+    slot.fps = fps
+    
+    # Per-stage timings (seconds) for benchmarking and metrics
+    slot.processed_time = time.perf_counter()
+    slot.timings['preprocess'] = preprocess_time
+    slot.timings['inference'] = inference_time
+    slot.timings['extract'] = extract_time
+    STAGE_PREPROCESS.observe(slot.timings['preprocess'])
+    STAGE_INFERENCE.observe(slot.timings['inference'])
+    STAGE_EXTRACT.observe(slot.timings['extract'])
+    FRAMES_PROCESSED.inc()
+    HANDS_VISIBLE.set(slot.num_hands)
+    idle_scheduler.update(slot.num_hands > 0, slot.processed_time)
+    if landmark_recorder is not None:
+        landmark_recorder.record(slot)
+    
+    frame_ring.publish(slot, 'processed', wait=not (frame_source is None or frame_source.realtime),
+                       drop_counter=FRAMES_DROPPED_RESULT)
+
 def hand_processor():
     """Process hand detection (optimized for performance and accuracy)"""
     global processing_active
+    
+    if inference_workers > 0:
+        if pooled_hand_processor():
+            return
+        print("Inference workers failed, running hand detection in this process instead")
+    
+    with startup_profile.phase("model load"):
+        hand_detector.load()
+    with startup_profile.phase("model warm-up"):
+        hand_detector.warm_up()
+    
     while processing_active:
+        slot = frame_ring.take('captured', timeout=0.03)  # Reduce wait time for faster response
+        if slot is None:
+            continue
+        if slot.end_of_input:
+            frame_ring.publish(slot, 'processed', wait=True)
+            break
+        if not idle_scheduler.should_detect(time.perf_counter()):
+            # Idle: skip this frame entirely (no inference, nothing to display)
+            FRAMES_SKIPPED_IDLE.inc()
+            frame_ring.release(slot)
+            continue
         try:
-            frame = frame_queue.get(timeout=0.03)  # Reduce wait time for faster response
             start_time = time.time()
-            h, w, _ = frame.shape
             
-            # Reduce processing size to increase performance
-            scale = 0.5
-            small_frame = cv2.resize(frame, (0, 0), fx=scale, fy=scale)
-            rgb_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-            
-            # Process hands
-            results = hands.process(rgb_frame)
-            
-            processed_data = {
-                'landmarks': [],
-                'hand_sides': [],
-                'hand_points': [],
-                'left_hand_data': None,
-                'frame': frame,
-                'fps': 0
-            }
-            
-            if results.multi_hand_landmarks and results.multi_handedness:
-                # Loop through each detected hand
-                for idx, (hand_landmarks, handedness) in enumerate(zip(results.multi_hand_landmarks, results.multi_handedness)):
-                    # Extract hand information from recognition results
-                    hand_side = 'left' if handedness.classification[0].label == "Left" else 'right'
-                    processed_data['hand_sides'].append(hand_side)
-                    processed_data['landmarks'].append(hand_landmarks)
-                    
-                    # Save coordinates of index finger and thumb
-                    index_tip = hand_landmarks.landmark[8]  # Index finger
-                    thumb_tip = hand_landmarks.landmark[4]  # Thumb
-                    index_x, index_y = int(index_tip.x * w), int(index_tip.y * h)
-                    thumb_x, thumb_y = int(thumb_tip.x * w), int(thumb_tip.y * h)
-                    processed_data['hand_points'].append((index_x, index_y))
-                    
-                    # Save special information for left hand
-                    if hand_side == 'left':
-                        # Calculate distance between thumb and index finger on left hand
-                        distance = np.hypot(thumb_x - index_x, thumb_y - index_y) / w
-                        
-                        # Save value to history (for prediction)
-                        distance_history.append(distance)
-                        
-                        processed_data['left_hand_data'] = {
-                            'index_point': (index_x, index_y),
-                            'thumb_point': (thumb_x, thumb_y),
-                            'distance': distance
-                        }
+            # Process hands (downscaled full frame or tracked full-resolution crop) straight into the slot's arrays
+            slot.clear_results()
+            slot.num_hands, preprocess_time, inference_time, extract_time = hand_detector.detect(
+                slot.frame, slot.hand_landmarks, slot.handedness, slot.hand_scores)
+            slot.used_roi = hand_detector.last_used_roi
             
             # Calculate FPS
             elapsed = max(time.time() - start_time, 0.001)
             fps_values.append(1.0 / elapsed)
-            processed_data['fps'] = int(np.mean(fps_values))
             
-            if result_queue.full():
-                result_queue.get_nowait()
-            result_queue.put(processed_data, block=False)
+            publish_processed_slot(slot, int(np.mean(fps_values)), preprocess_time, inference_time, extract_time)
             
-        except queue.Empty:
-            time.sleep(0.001)  # Reduce wait time to increase response
         except Exception as e:
+            frame_ring.release(slot)
             print(f"Hand processor error: {e}")
 
-def main():
+# Multi-process inference: each worker process owns a MediaPipe Hands instance and reads
+# frames from shared memory, results come back as small numpy arrays tagged with the sequence number
+inference_workers = 0   # 0 = run inference in the hand_processor thread
+inference_pool = None
+
+def extract_hand_arrays(results, landmarks_out, handedness_out, scores_out):
+    """Copy MediaPipe results into (max_hands, 21, 3) landmarks, handedness (0 left, 1 right) and scores arrays"""
+    count = 0
+    if results.multi_hand_landmarks and results.multi_handedness:
+        for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+            if count >= len(landmarks_out):
+                break
+            landmarks_out[count] = [(landmark.x, landmark.y, landmark.z) for landmark in hand_landmarks.landmark]
+            classification = handedness.classification[0]
+            handedness_out[count] = 0 if classification.label == "Left" else 1
+            scores_out[count] = classification.score
+            count += 1
+    return count
+
+def inference_worker(shm_names, frame_shape, scale, max_hands, task_queue, done_queue, state):
+    """Worker process: run hand detection on frames placed in shared memory slots
+
+    state: shared [sequence being processed (-1: none, -2: still loading the model), time.monotonic() it was
+    taken], so the parent can tell which frame a dead or hung worker had
+    """
+    # Workers share the parent's resource tracker, the parent alone unlinks the blocks
+    shms = [shared_memory.SharedMemory(name=name) for name in shm_names]
+    frames = [np.ndarray(frame_shape, dtype=np.uint8, buffer=shm.buf) for shm in shms]
+    worker_hands = create_hands_model(max_hands)
+    
+    h, w = frame_shape[:2]
+    small_size = (int(round(w * scale)), int(round(h * scale)))
+    small_frame = np.empty((small_size[1], small_size[0], 3), dtype=np.uint8)
+    rgb_frame = np.zeros_like(small_frame)
+    worker_hands.process(rgb_frame)  # Warm up before the first real frame
+    state[0] = -1
+    landmarks = np.zeros((max_hands, 21, 3), dtype=np.float32)  # Same layout as FrameSlot.hand_landmarks
+    handedness = np.full(max_hands, -1, dtype=np.int8)
+    scores = np.zeros(max_hands, dtype=np.float32)
+    
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            slot_index, sequence = task
+            state[1] = time.monotonic()
+            state[0] = sequence
+            
+            start = time.perf_counter()
+            cpu_start = time.process_time()
+            cv2.resize(frames[slot_index], small_size, dst=small_frame)
+            cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+            preprocess_end = time.perf_counter()
+            results = worker_hands.process(rgb_frame)
+            inference_end = time.perf_counter()
+            count = extract_hand_arrays(results, landmarks, handedness, scores)
+            
+            # Copies: the queue pickles in a background thread, after the buffers are reused
+            done_queue.put((sequence, slot_index, count, landmarks[:count].copy(), handedness[:count].copy(),
+                            scores[:count].copy(), preprocess_end - start, inference_end - preprocess_end,
+                            time.process_time() - cpu_start))
+            state[0] = -1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker_hands.close()
+        for shm in shms:
+            shm.close()
+
+class InferenceWorkerPool:
+    """Pool of inference worker processes fed through shared memory frame slots
+
+    check() restarts workers that died or spent more than result_timeout seconds on one frame and gives up on
+    their frames. After max_restarts restarts the pool has failed and the caller should stop using it.
+    """
+    def __init__(self, workers, scale=0.5, max_hands=MAX_HANDS, result_timeout=5.0, max_restarts=3):
+        self.workers = workers
+        self.scale = scale
+        self.max_hands = max_hands
+        self.result_timeout = result_timeout
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self.context = multiprocessing.get_context("spawn")  # Don't fork a process that already runs threads
+        self.states = []            # Per worker: shared [sequence, start time], see inference_worker
+        self.submitted = {}         # sequence -> shared memory slot, until its result arrives or it is lost
+        self.frame_shape = None
+        self.shms = []
+        self.frames = []
+        self.free_slots = deque()
+        self.processes = []
+        self.task_queue = None
+        self.done_queue = None
+        self.worker_cpu_time = 0.0  # CPU seconds reported by the workers (not visible to process_time here)
+
+    def start(self, frame_shape):
+        """Create one shared memory slot per worker and start the worker processes"""
+        self.close()
+        context = self.context
+        self.frame_shape = frame_shape
+        frame_size = int(np.prod(frame_shape))
+        self.shms = [shared_memory.SharedMemory(create=True, size=frame_size) for _ in range(self.workers)]
+        self.frames = [np.ndarray(frame_shape, dtype=np.uint8, buffer=shm.buf) for shm in self.shms]
+        self.free_slots = deque(range(self.workers))
+        self.task_queue = context.Queue()
+        self.done_queue = context.Queue()
+        self.states = [context.Array('d', [-1.0, 0.0], lock=False) for _ in range(self.workers)]
+        self.processes = [self._start_worker(number) for number in range(self.workers)]
+        print(f"Started {self.workers} inference worker processes")
+
+    def _start_worker(self, number):
+        self.states[number][0] = -2
+        process = self.context.Process(target=inference_worker, daemon=True,
+                                       args=([shm.name for shm in self.shms], self.frame_shape, self.scale,
+                                             self.max_hands, self.task_queue, self.done_queue, self.states[number]))
+        process.start()
+        return process
+
+    def wait_ready(self, timeout=30.0):
+        """Wait until every worker has loaded and warmed up its model"""
+        deadline = time.perf_counter() + timeout
+        while any(state[0] == -2 for state in self.states):
+            if time.perf_counter() > deadline or not all(process.is_alive() for process in self.processes):
+                return False
+            time.sleep(0.01)
+        return True
+
+    @property
+    def failed(self):
+        return self.restarts > self.max_restarts
+
+    def check(self):
+        """Restart dead or hung workers -> sequences of the frames they took with them (their slots are free again)"""
+        lost = []
+        now = time.monotonic()
+        for number, process in enumerate(self.processes):
+            sequence, started = int(self.states[number][0]), self.states[number][1]
+            if process.is_alive():
+                if sequence < 0 or now - started < self.result_timeout:
+                    continue
+                print(f"Inference worker {process.pid} spent {now - started:.1f}s on frame {sequence}, restarting it")
+                process.terminate()
+                process.join(timeout=1.0)
+            else:
+                print(f"Inference worker {process.pid} exited with code {process.exitcode}, restarting it")
+            if sequence in self.submitted:
+                self.free_slots.append(self.submitted.pop(sequence))
+                lost.append(sequence)
+            INFERENCE_WORKER_RESTARTS.inc()
+            self.restarts += 1
+            if not self.failed:
+                self.processes[number] = self._start_worker(number)
+        INFERENCE_TASKS_LOST.inc(len(lost))
+        return lost
+
+    def has_free_slot(self):
+        return bool(self.free_slots)
+
+    def submit(self, frame, sequence):
+        """Copy a frame into a free slot and queue it for the workers"""
+        if self.frame_shape != frame.shape:
+            self.start(frame.shape)
+        slot_index = self.free_slots.popleft()
+        np.copyto(self.frames[slot_index], frame)
+        self.submitted[sequence] = slot_index
+        self.task_queue.put((slot_index, sequence))
+
+    def poll(self, timeout=0.0):
+        """Return the next finished result tuple (or None)"""
+        while True:
+            try:
+                if timeout > 0:
+                    result = self.done_queue.get(timeout=timeout)
+                else:
+                    result = self.done_queue.get_nowait()
+            except queue.Empty:
+                return None
+            self.worker_cpu_time += result[-1]
+            if self.submitted.pop(result[0], None) is not None:
+                break
+            # Late result of a frame check() already gave up on (its slot is in use again)
+        self.free_slots.append(result[1])
+        return result
+
+    def close(self):
+        if self.task_queue is not None:
+            for _ in self.processes:
+                self.task_queue.put(None)
+        for process in self.processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        for shm in self.shms:
+            shm.close()
+            shm.unlink()
+        self.processes = []
+        self.states = []
+        self.submitted = {}
+        self.shms = []
+        self.frames = []
+        self.task_queue = None
+        self.done_queue = None
+        self.frame_shape = None
+
+def ensure_inference_pool():
+    """Create (or resize) the inference worker pool to match inference_workers"""
+    global inference_pool
+    
+    if inference_pool is None or inference_pool.workers != inference_workers:
+        if inference_pool is not None:
+            inference_pool.close()
+        inference_pool = InferenceWorkerPool(inference_workers, scale=hand_detector.scale)
+    return inference_pool
+
+def pooled_hand_processor():
+    """hand_processor variant that spreads inference over worker processes, False when the pool failed or handing
+    frames to it raised (the frames it had are dropped, the caller carries on without it)"""
+    pool = ensure_inference_pool()
+    # Recorded input processed as fast as possible keeps every frame (results are put back in order),
+    # live input drops a late result instead of waiting for it
+    reorder = not (frame_source is None or frame_source.realtime)
+    in_flight = {}             # sequence -> (slot, copy seconds), waiting for a worker
+    completed = {}             # sequence -> (slot, copy seconds, worker result), waiting for older frames
+    last_published = -1
+    last_result_time = None
+    next_check = 0.0
+    end_slot = None
+    
+    try:
+        while processing_active:
+            # Frames of dead or hung workers never come back, don't wait for them
+            if time.perf_counter() >= next_check:
+                next_check = time.perf_counter() + 0.25
+                for sequence in pool.check():
+                    slot, _ = in_flight.pop(sequence)
+                    frame_ring.release(slot)
+                if pool.failed:
+                    pool.close()
+                    if end_slot is None:
+                        return False
+                    frame_ring.publish(end_slot, 'processed', wait=True)  # Nothing left to detect anyway
+                    break
+            
+            # Hand a new frame to the workers while one of them is free
+            if end_slot is None and (pool.frame_shape is None or pool.has_free_slot()):
+                slot = frame_ring.take('captured', timeout=0.005 if in_flight else 0.03)
+                if slot is not None:
+                    if slot.end_of_input:
+                        end_slot = slot
+                    elif not idle_scheduler.should_detect(time.perf_counter()):
+                        FRAMES_SKIPPED_IDLE.inc()
+                        frame_ring.release(slot)
+                    else:
+                        in_flight[slot.sequence] = (slot, 0.0)  # Released by the finally below if submit fails
+                        copy_start = time.perf_counter()
+                        pool.submit(slot.frame, slot.sequence)
+                        in_flight[slot.sequence] = (slot, time.perf_counter() - copy_start)
+            
+            # Collect results, waiting only when nothing else can be done
+            must_wait = in_flight and (end_slot is not None or not pool.has_free_slot())
+            result = pool.poll(timeout=0.03 if must_wait else 0.0)
+            while result is not None:
+                slot, copy_time = in_flight.pop(result[0])
+                completed[result[0]] = (slot, copy_time, result)
+                result = pool.poll()
+            
+            for sequence in sorted(completed):
+                if reorder and in_flight and min(in_flight) < sequence:
+                    break  # An older frame is still being processed
+                slot, copy_time, result = completed.pop(sequence)
+                if sequence < last_published:
+                    # A newer frame was already shown: never let time go backwards
+                    INFERENCE_RESULTS_DROPPED.inc()
+                    frame_ring.release(slot)
+                    continue
+                
+                _, _, count, landmarks, handedness, scores, preprocess_time, inference_time, _ = result
+                extract_start = time.perf_counter()
+                slot.clear_results()
+                slot.hand_landmarks[:count] = landmarks
+                slot.handedness[:count] = handedness
+                slot.hand_scores[:count] = scores
+                slot.num_hands = count
+                slot.used_roi = False
+                
+                # FPS is the rate results come back at (workers run in parallel)
+                if last_result_time is not None:
+                    fps_values.append(1.0 / max(extract_start - last_result_time, 0.001))
+                last_result_time = extract_start
+                last_published = sequence
+                publish_processed_slot(slot, int(np.mean(fps_values)) if fps_values else 0,
+                                       copy_time + preprocess_time, inference_time,
+                                       time.perf_counter() - extract_start)
+            
+            if end_slot is not None and not in_flight and not completed:
+                frame_ring.publish(end_slot, 'processed', wait=True)
+                break
+    except Exception as e:
+        # Give up on the pool like after max_restarts, the caller carries on with in-process inference
+        print(f"Hand processor error: {e}")
+        traceback.print_exc()
+        pool.close()
+        if end_slot is None:
+            return False
+        frame_ring.publish(end_slot, 'processed', wait=True)
+    finally:
+        for slot, _ in in_flight.values():
+            frame_ring.release(slot)
+        for slot, _, _ in completed.values():
+            frame_ring.release(slot)
+    return True
+
+# Replay and the benchmarks (benchmarks/) run the gesture logic against these instead of the real actuators
+class StubActuators:
+    """Record actuator calls instead of touching the system volume or the browser"""
+    def __init__(self):
+        self.events = []  # (kind, value, start_time, end_time)
+    
+    def adjust_system_volume(self, target_volume_percent):
+        start = time.perf_counter()
+        target_volume_percent = max(0, min(100, target_volume_percent))
+        self.events.append(('volume', target_volume_percent, start, time.perf_counter()))
+        return target_volume_percent
+    
+    def change_youtube_speed(self, new_speed):
+        start = time.perf_counter()
+        self.events.append(('speed', new_speed, start, time.perf_counter()))
+        return True
+    
+    def send_youtube_speed(self, new_speed):
+        """Browser scheduler handler, like send_youtube_speed with a browser that always answers"""
+        self.change_youtube_speed(new_speed)
+
+def stub_control_context(stubs, scheduler_class=ActuatorScheduler, system_volume=50):
+    """ControlContext whose actions only reach stubs (StubActuators), through schedulers with metrics of their own"""
+    context = ControlContext(scheduler_class(registry=MetricsRegistry()), scheduler_class(registry=MetricsRegistry()),
+                             stubs.adjust_system_volume, system_volume)
+    context.actuator_scheduler.register('volume', context.apply_volume, min_interval=VOLUME_MIN_INTERVAL)
+    context.browser_scheduler.register('speed', stubs.send_youtube_speed)
+    return context
+
+def speed_scenarios(fps=30, duration=4.0, noise=0.002, seed=0):
+    """Synthetic thumb-index distance traces -> {name: (times, distances, expected_step_change, movement_start)}"""
+    rng = np.random.default_rng(seed)
+    times = np.arange(0.0, duration, 1.0 / fps)
+    ramp = lambda start, end, t0, t1: np.interp(times, [t0, t1], [start, end])
+
+    shapes = {
+        # name: (clean distance trace, expected net speed steps, movement start)
+        'hold': (np.full_like(times, 0.15), 0, None),
+        'wobble': (0.15 + 0.008 * np.sin(2 * np.pi * 2.0 * times), 0, None),
+        'open_slow': (ramp(0.10, 0.22, 1.0, 3.0), 3, 1.0),
+        'open_fast': (ramp(0.10, 0.22, 1.0, 1.3), 3, 1.0),
+        'pinch_fast': (ramp(0.22, 0.10, 1.0, 1.3), -3, 1.0),
+        'open_close': (np.where(times < 2.0, ramp(0.10, 0.22, 0.5, 1.5), ramp(0.22, 0.10, 2.0, 3.0)), 0, 0.5)
+    }
+    return {name: (times, clean + rng.normal(0.0, noise, len(times)), expected, movement_start)
+            for name, (clean, expected, movement_start) in shapes.items()}
+
+def load_distance_trace(path):
+    """Read a recorded distance trace: CSV rows of `time_seconds,distance`"""
+    data = np.loadtxt(path, delimiter=",", ndmin=2)
+    return data[:, 0], data[:, 1]
+
+def simulate_speed_trace(times, distances, filter_options=None, **controller_options):
+    """Replay a distance trace through the speed filter and controller in virtual time, return (time, speed) updates"""
+    trace_filter = AdvancedSmoothFilter(**(filter_options or speed_filter_options))
+    controller = SpeedController(speed_values, initial_index=3, **controller_options)
+    updates = []
+    for now, distance in zip(times.tolist(), distances.tolist()):
+        new_index = controller.update(trace_filter.update(distance), now)
+        if new_index is not None:
+            updates.append((now, speed_values[new_index]))
+    return updates, controller.index - 3
+
+def run_speed_simulation(traces, output_path, controller_options=None):
+    """Replay recorded or synthetic distance traces through the speed controller and report update count and delay"""
+    controller_options = controller_options or {}
+    if traces:
+        cases = {path: (*load_distance_trace(path), None, None) for path in traces}
+    else:
+        cases = speed_scenarios()
+
+    results = {'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'controller': controller_options, 'traces': {}}
+    print(f"\n{'trace':<16}{'updates':>8}{'net':>6}{'expected':>10}{'first step ms':>15}{'x real-time':>13}")
+    for name, (times, distances, expected, movement_start) in cases.items():
+        start = time.perf_counter()
+        updates, net_steps = simulate_speed_trace(times, distances, **controller_options)
+        elapsed = time.perf_counter() - start
+
+        first_step = None
+        if movement_start is not None:
+            later = [t for t, _ in updates if t >= movement_start]
+            first_step = round((later[0] - movement_start) * 1000, 1) if later else None
+        duration = float(times[-1] - times[0]) if len(times) > 1 else 0.0
+        results['traces'][name] = {
+            'samples': len(times),
+            'updates': len(updates),
+            'net_steps': net_steps,
+            'expected_net_steps': expected,
+            'first_step_delay_ms': first_step,
+            'speed_changes': [(round(t, 4), speed) for t, speed in updates],
+            'realtime_factor': round(duration / elapsed, 1) if elapsed > 0 else None
+        }
+        print(f"{name:<16}{len(updates):>8}{net_steps:>6}{str(expected):>10}{str(first_step):>15}"
+              f"{results['traces'][name]['realtime_factor']:>13}")
+
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSpeed simulation results written to {output_path}")
+    return results
+
+# Offline replay: recorded landmarks -> the control loop's gesture logic -> stubbed actuators, in virtual time
+class VirtualActuatorScheduler(ActuatorScheduler):
+    """ActuatorScheduler without a worker thread: advance() applies the pending values in virtual time, with the
+    same latest-wins, rate limit and debounce rules as the worker, and records every call. Its metrics go to a
+    registry of its own, so replays don't add to (or duplicate) the live actuator metrics"""
+    def __init__(self, registry=None):
+        super().__init__(registry=MetricsRegistry() if registry is None else registry)
+        self.now = 0.0
+        self.clock = lambda: self.now
+        self.record = True
+        self.completed = []
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def _next_due(self):
+        ready = [action for action in self.actions.values() if action.pending is not None]
+        if not ready:
+            return None, None
+        action = min(ready, key=ActuatorAction.due_time)
+        return action, max(action.due_time(), self.now)
+
+    def advance(self, until):
+        """Apply every pending value that becomes due up to virtual time `until`, each at its due time"""
+        action, due = self._next_due()
+        while action is not None and due <= until:
+            self.now = due
+            value, first_post, _, tag = action.pending
+            action.pending = None
+            reached = action.handler(value)
+            action.last_value = value if reached is None else reached
+            action.last_run = due
+            action.applied.inc()
+            self.completed.append((action.name, value, tag, first_post, due, due))
+            action, due = self._next_due()
+        self.now = max(self.now, until)
+
+    def flush(self, timeout=None):
+        """Apply what is still pending at the end of the input"""
+        action, due = self._next_due()
+        while action is not None:
+            self.advance(due)
+            action, due = self._next_due()
+        return True
+
+def replay_landmarks(records, frame_size=(640, 360), initial_volume=50):
+    """Drive the control loop's gesture logic (landmark filter, gesture registry, volume mapping, speed filter and
+    controller) with recorded landmarks in virtual time, actuators stubbed -> (events, stats)
+
+    records: record array in RECORDING_DTYPE layout, e.g. LandmarkRecording(path)[:]. Each actuator call is an event
+    {'time', 'actuator', 'value', 'frame_time'} with times in seconds since the first record.
+    """
+    reset_control_state()
+    context = stub_control_context(StubActuators(), VirtualActuatorScheduler, initial_volume)
+    schedulers = (context.actuator_scheduler, context.browser_scheduler)
+    
+    slot = FrameSlot(0)
+    w, h = frame_size
+    start_time = float(records['capture_time'][0]) if len(records) else 0.0
+    frames_with_gestures = 0
+    wall_start = time.perf_counter()
+    for record in records:
+        # Same steps as control_loop() for one processed frame, the record's capture time is the clock
+        now = float(record['capture_time']) - start_time
+        for scheduler in schedulers:
+            scheduler.advance(now)
+        slot.sequence = int(record['sequence'])
+        slot.capture_time = now
+        slot.num_hands = int(record['num_hands'])
+        slot.handedness[:] = record['handedness']
+        slot.hand_scores[:] = record['scores']
+        slot.hand_landmarks[:] = record['landmarks']
+        smooth_hand_landmarks(slot)
+        geometry = hand_geometry(slot.hand_landmarks, slot.handedness, slot.num_hands, w, h)
+        if geometry['gestures']:
+            frames_with_gestures += 1
+        gesture_registry.dispatch(geometry['gestures'], now, context)
+        for scheduler in schedulers:
+            scheduler.advance(now)  # Values due right away are applied before the next frame, like the worker
+    for scheduler in schedulers:
+        scheduler.flush()
+    wall_time = time.perf_counter() - wall_start
+    completed = sorted(context.actuator_scheduler.completed + context.browser_scheduler.completed,
+                       key=lambda call: call[4])
+    
+    events = [{'time': round(start, 6), 'actuator': name, 'value': value, 'frame_time': round(tag, 6)}
+              for name, value, tag, post_time, start, end in completed]
+    duration = float(records['capture_time'][-1]) - start_time if len(records) > 1 else 0.0
+    stats = {
+        'frames': len(records),
+        'frames_with_gestures': frames_with_gestures,
+        'duration_s': round(duration, 3),
+        'wall_time_s': round(wall_time, 4),
+        'realtime_factor': round(duration / wall_time, 1) if wall_time > 0 else None,
+        'events': {name: sum(event['actuator'] == name for event in events) for name in ('volume', 'speed')}
+    }
+    return events, stats
+
+def compare_actuation_events(events, reference, time_tolerance=1e-6):
+    """Differences between two actuation event sequences, empty when they match"""
+    differences = []
+    for number, (event, expected) in enumerate(zip(events, reference)):
+        if (event['actuator'] != expected['actuator'] or event['value'] != expected['value']
+                or abs(event['time'] - expected['time']) > time_tolerance):
+            differences.append({'event': number, 'got': event, 'expected': expected})
+    if len(events) != len(reference):
+        differences.append({'event': min(len(events), len(reference)),
+                            'got_events': len(events), 'expected_events': len(reference)})
+    return differences
+
+def run_replay(paths, output_path, frame_size=(640, 360), reference_path=None):
+    """Replay landmark recordings through the control logic, write the actuation events and optionally compare them
+    with the output of an earlier run -> True when everything matches the reference (or there is none)"""
+    reference = None
+    if reference_path:
+        with open(reference_path) as f:
+            reference = json.load(f)['recordings']
+
+    results = {'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+               'landmark_filter': type(landmark_filter).__name__ if landmark_filter is not None else "none",
+               'speed_controller': {name: getattr(speed_controller, name)
+                                    for name in ('step_distance', 'dead_band', 'hysteresis', 'max_step_rate')},
+               'speed_filter': dict(speed_filter_options), 'volume_filter': dict(volume_filter_options),
+               'frame_size': list(frame_size), 'recordings': {}}
+    matches = True
+    print(f"\n{'recording':<28}{'frames':>8}{'volume':>8}{'speed':>7}{'seconds':>9}{'x real-time':>13}{'diffs':>7}")
+    for path in paths:
+        recording = LandmarkRecording(path)
+        events, stats = replay_landmarks(recording[:], frame_size=frame_size)
+        recording.close()
+        results['recordings'][path] = {**stats, 'actuations': events}
+
+        differences = None
+        if reference is not None:
+            expected = reference.get(path, {}).get('actuations', [])
+            differences = compare_actuation_events(events, expected)
+            results['recordings'][path]['differences'] = differences
+            matches = matches and not differences
+        print(f"{os.path.basename(path):<28}{stats['frames']:>8}{stats['events']['volume']:>8}"
+              f"{stats['events']['speed']:>7}{stats['duration_s']:>9}{str(stats['realtime_factor']):>13}"
+              f"{'-' if differences is None else len(differences):>7}")
+        for difference in (differences or [])[:5]:
+            print(f"  {difference}")
+
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nReplay results written to {output_path}")
+    return matches
+
+# Autotuner: speed/volume filter and speed controller settings searched on labelled distance traces and labelled
+# landmark recordings in a process pool
+SPEED_SCENARIO_LABELS = {  # speed_scenarios() name: (speed updates a clean run makes, furthest net steps reached)
+    'hold': (0, 0),
+    'wobble': (0, 0),
+    'open_slow': (3, 3),
+    'open_fast': (3, 3),
+    'pinch_fast': (3, 3),
+    'open_close': (6, 3)
+}
+
+AUTOTUNE_RANGES = {  # Option: (low, high), sampled uniformly. --speed-step stays, the labels count its steps
+    'speed_filter_alpha': (0.05, 0.6),
+    'speed_filter_responsiveness': (0.0, 1.0),
+    'speed_filter_min_alpha': (0.01, 0.2),
+    'speed_filter_max_alpha': (0.3, 0.95),
+    'speed_filter_prediction': (0.0, 0.8),
+    'speed_filter_max_deviation': (0.02, 0.2),
+    'speed_dead_band': (0.0, 0.02),
+    'speed_hysteresis': (0.0, 0.04),
+    'speed_max_rate': (2.0, 20.0)
+}
+AUTOTUNE_CHOICES = {  # Option: values, sampled with equal chance
+    'speed_filter_predict': (True, False)
+}
+AUTOTUNE_VOLUME_RANGES = {  # Only searched when a recording has volume labels, nothing else exercises them
+    'volume_filter_alpha': (0.1, 0.95),
+    'volume_filter_responsiveness': (0.0, 1.0),
+    'volume_filter_min_alpha': (0.05, 0.5),
+    'volume_filter_max_alpha': (0.5, 1.0)
+}
+# How close (volume percent, speed steps) an actuation has to get to a labelled target to count as reaching it
+ACTUATION_LABEL_TOLERANCE = {'volume': 3, 'speed': 0}
+
+autotune_recordings = []  # (path, records, labels) in each autotune worker, see load_autotune_recordings()
+autotune_frame_size = (640, 360)
+
+def speed_settings(options):
+    """Option values (parse_arguments names) -> (speed filter, speed controller) keyword arguments"""
+    filter_options = {'alpha': options['speed_filter_alpha'],
+                      'responsiveness': options['speed_filter_responsiveness'],
+                      'min_alpha': options['speed_filter_min_alpha'],
+                      'max_alpha': options['speed_filter_max_alpha'],
+                      'prediction_factor': options['speed_filter_prediction'],
+                      'max_deviation': options['speed_filter_max_deviation'],
+                      'predict': options['speed_filter_predict']}
+    controller_options = {'step_distance': options['speed_step'], 'dead_band': options['speed_dead_band'],
+                          'hysteresis': options['speed_hysteresis'], 'max_step_rate': options['speed_max_rate']}
+    return filter_options, controller_options
+
+def volume_filter_settings(options):
+    """Option values (parse_arguments names) -> volume filter keyword arguments"""
+    return {'alpha': options['volume_filter_alpha'], 'responsiveness': options['volume_filter_responsiveness'],
+            'min_alpha': options['volume_filter_min_alpha'], 'max_alpha': options['volume_filter_max_alpha']}
+
+def apply_control_settings(options):
+    """Use these speed filter, speed controller and volume filter options from now on (next reset_control_state()),
+    return the speed controller options"""
+    filter_options, speed_options = speed_settings(options)
+    speed_filter_options.update(filter_options)
+    for name, value in speed_options.items():
+        setattr(speed_controller, name, value)
+    volume_filter_options.update(volume_filter_settings(options))
+    return speed_options
+
+def load_recording_labels(path):
+    """Labels of a recording, from RECORDING.labels.json: {"volume": [[time, volume], ...], "speed": [[time, speed],
+    ...]}, times in seconds since the first record. From each time on the hand asks for that value"""
+    with open(path + ".labels.json") as f:
+        labels = json.load(f)
+    unknown = set(labels) - set(ACTUATION_LABEL_TOLERANCE)
+    if unknown:
+        raise ValueError(f"{path}.labels.json: unknown actuator(s) {', '.join(sorted(unknown))}")
+    return {actuator: sorted((float(t), value) for t, value in targets) for actuator, targets in labels.items()}
+
+def load_autotune_recordings(paths, options):
+    """Process pool initializer: load the labelled recordings and set up the landmark filter like the live app"""
+    global autotune_recordings, autotune_frame_size, landmark_filter
+
+    autotune_recordings = []
+    for path in paths:
+        recording = LandmarkRecording(path)
+        autotune_recordings.append((path, np.array(recording[:]), load_recording_labels(path)))
+        recording.close()
+    autotune_frame_size = tuple(options['camera_size'])
+    landmark_filter = create_landmark_filter(options['landmark_filter'], min_cutoff=options['filter_min_cutoff'],
+                                             beta=options['filter_beta'], process_noise=options['filter_process_noise'],
+                                             measurement_noise=options['filter_measurement_noise'])
+
+def score_actuation_labels(events, labels, duration, initial_values=None):
+    """Compare replayed actuations with the labelled targets -> (delays, overshoot, spurious)
+
+    delays: per label, seconds until the actuator gets within tolerance of the target (not reached: until the next
+    label or the end). overshoot: calls that land past the target in the direction of the movement. spurious: calls
+    that move away from the target, before or after reaching it.
+    """
+    values = {'volume': 50, 'speed': speed_values[3], **(initial_values or {})}  # Where replay_landmarks starts
+    delays, overshoot, spurious = [], 0, 0
+    for actuator, targets in labels.items():
+        tolerance = ACTUATION_LABEL_TOLERANCE[actuator]
+        position = speed_values.index if actuator == 'speed' else float  # Speeds are compared in steps
+        calls = [(event['time'], position(event['value'])) for event in events if event['actuator'] == actuator]
+        for number, (start, target) in enumerate(targets):
+            end = targets[number + 1][0] if number + 1 < len(targets) else duration
+            target = position(target)
+            previous = next((value for t, value in reversed(calls) if t < start), position(values[actuator]))
+            direction = np.sign(target - previous)
+            reached = start if abs(previous - target) <= tolerance else None
+            for t, value in calls:
+                if not start <= t < end:
+                    continue
+                if reached is None and abs(value - target) <= tolerance:
+                    reached = t
+                elif abs(value - target) > abs(previous - target):
+                    spurious += 1
+                if direction and (value - target) * direction > tolerance:
+                    overshoot += 1
+                previous = value
+            delays.append((end if reached is None else reached) - start)
+    return delays, overshoot, spurious
+
+def score_control_settings(options, seeds=(0, 1, 2)):
+    """Run one set of options over the labelled speed scenarios (several noise seeds) and the labelled recordings of
+    this worker (load_autotune_recordings), lower is better:
+    latency_ms: mean delay from the start of a movement to the first speed step (no step: the rest of the trace),
+    and from each recording label to reaching its target
+    overshoot: speed steps past the furthest expected step, plus the net steps off at the end, plus recording
+    actuations past their target
+    spurious: speed updates beyond the ones a clean run makes, plus recording actuations away from their target
+    """
+    filter_options, controller_options = speed_settings(options)
+    delays, overshoot, spurious = [], 0, 0
+    for seed in seeds:
+        for name, (times, distances, expected, movement_start) in speed_scenarios(seed=seed).items():
+            updates, net_steps = simulate_speed_trace(times, distances, filter_options, **controller_options)
+            needed, furthest = SPEED_SCENARIO_LABELS[name]
+            reached = max((abs(speed_values.index(speed) - 3) for _, speed in updates), default=0)
+            overshoot += max(0, reached - furthest) + abs(net_steps - expected)
+            spurious += max(0, len(updates) - needed)
+            if movement_start is not None:
+                later = [t for t, _ in updates if t >= movement_start]
+                delays.append((later[0] if later else float(times[-1])) - movement_start)
+
+    if autotune_recordings:
+        apply_control_settings(options)
+        for path, records, labels in autotune_recordings:
+            events, stats = replay_landmarks(records, frame_size=autotune_frame_size)
+            recording_delays, recording_overshoot, recording_spurious = score_actuation_labels(
+                events, labels, stats['duration_s'])
+            delays += recording_delays
+            overshoot += recording_overshoot
+            spurious += recording_spurious
+    return {'latency_ms': round(float(np.mean(delays)) * 1000, 1), 'overshoot': overshoot, 'spurious': spurious}
+
+def pareto_front(scores, keys=('latency_ms', 'overshoot', 'spurious')):
+    """Indices of the scores no other score beats in every key (lowest latency first, one per distinct score)"""
+    points = np.array([[score[key] for key in keys] for score in scores], dtype=np.float64)
+    front = {}
+    for number, point in enumerate(points):
+        dominated = np.any(np.all(points <= point, axis=1) & np.any(points < point, axis=1))
+        if not dominated:
+            front.setdefault(tuple(point), number)
+    return sorted(front.values(), key=lambda number: tuple(points[number]))
+
+def autotune_speed(output_path, config_path, baseline, candidates=500, workers=0, seed=0, base_config=None,
+                   recordings=None):
+    """Score random speed filter/controller (and, with volume labels, volume filter) settings around the baseline in
+    a process pool, write the Pareto front and a --config file with the front's best setting that is no worse than
+    the baseline in overshoot and spurious updates (if none is, the most balanced one)
+
+    recordings: landmark recordings with labels (load_recording_labels) replayed for every setting
+    """
+    recordings = recordings or []
+    ranges = dict(AUTOTUNE_RANGES)
+    if any('volume' in load_recording_labels(path) for path in recordings):
+        ranges.update(AUTOTUNE_VOLUME_RANGES)
+    # The workers replay the recordings with the landmark filter and frame size of these options
+    worker_options = {name: baseline[name] for name in ('camera_size', 'landmark_filter', 'filter_min_cutoff',
+                                                        'filter_beta', 'filter_process_noise',
+                                                        'filter_measurement_noise')}
+    rng = np.random.default_rng(seed)
+    baseline = {name: baseline[name] for name in ('speed_step', *ranges, *AUTOTUNE_CHOICES)}
+    settings = [baseline]
+    for _ in range(candidates):
+        candidate = dict(baseline, **{name: round(float(rng.uniform(low, high)), 4)
+                                      for name, (low, high) in ranges.items()})
+        candidate.update({name: choices[int(rng.integers(len(choices)))] for name, choices in AUTOTUNE_CHOICES.items()})
+        for prefix in ('speed_filter', 'volume_filter'):
+            if f"{prefix}_alpha" in ranges:
+                candidate[f"{prefix}_min_alpha"] = min(candidate[f"{prefix}_min_alpha"], candidate[f"{prefix}_alpha"])
+                candidate[f"{prefix}_max_alpha"] = max(candidate[f"{prefix}_max_alpha"], candidate[f"{prefix}_alpha"])
+        settings.append(candidate)
+
+    workers = workers or os.cpu_count() or 1
+    print(f"Scoring {len(settings)} settings on {len(speed_scenarios())} speed scenarios and {len(recordings)} "
+          f"recordings in {workers} worker processes...")
+    start = time.perf_counter()
+    context = multiprocessing.get_context("spawn")  # Same start method everywhere, workers import the script
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                                initializer=load_autotune_recordings,
+                                                initargs=(recordings, worker_options)) as pool:
+        scores = list(pool.map(score_control_settings, settings, chunksize=max(1, len(settings) // (workers * 4))))
+    elapsed = time.perf_counter() - start
+
+    front = pareto_front(scores)
+    base_score = scores[0]
+    safe = [number for number in front if scores[number]['overshoot'] <= base_score['overshoot']
+            and scores[number]['spurious'] <= base_score['spurious']]
+    if safe:
+        chosen = min(safe, key=lambda number: scores[number]['latency_ms'])
+    else:
+        # Most balanced: smallest sum of the scores scaled by their spread on the front
+        values = np.array([list(scores[number].values()) for number in front], dtype=np.float64)
+        spread = np.maximum(values.max(axis=0) - values.min(axis=0), 1e-9)
+        chosen = front[int((((values - values.min(axis=0)) / spread).sum(axis=1)).argmin())]
+
+    results = {
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'candidates': len(settings),
+        'workers': workers,
+        'recordings': recordings,
+        'seconds': round(elapsed, 2),
+        'baseline': {'options': baseline, 'score': base_score},
+        'chosen': {'options': settings[chosen], 'score': scores[chosen]},
+        'pareto_front': [{'options': settings[number], 'score': scores[number]} for number in front]
+    }
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    # Settings of an existing --config file are kept, the tuned options replace theirs
+    config = {key.replace("-", "_"): value for key, value in (base_config or {}).items()}
+    config.update(settings[chosen])
+    with open(config_path, 'w') as f:
+        json.dump(config, f, indent=2)
+
+    print(f"{len(settings)} settings scored in {elapsed:.1f}s, {len(front)} on the Pareto front\n")
+    print(f"{'':<10}{'latency ms':>12}{'overshoot':>11}{'spurious':>10}")
+    for label, number in [("baseline", 0)] + [("chosen" if number == chosen else "front", number) for number in front]:
+        score = scores[number]
+        print(f"{label:<10}{score['latency_ms']:>12}{score['overshoot']:>11}{score['spurious']:>10}")
+    print(f"\nAutotune results written to {output_path}, load the chosen settings with --config {config_path}")
+    return results
+
+def control_loop(publish=True, report_startup=False, browser_thread=None, context=None, on_frame=None):
+    """Gesture logic at camera rate: take processed frames, drive volume and speed through the control context
+    (default: live_control), and pass the frames (with their geometry) on to the display. publish=False (headless)
+    gives every frame straight back to the ring.
+
+    on_frame(frame, geometry, received_time) is called once the gestures of a frame have been handled (benchmarks).
+    """
+    context = context or live_control
+    startup_reported = False
+    last_system_update = time.time()
+    
+    while True:
+        result = None
+        try:
+            # Check if processing is still active
+            if not processing_active:
+                print("Processing has stopped. Exiting...")
+                break
+            if remote_control.stop_requested.is_set():
+                print("Stop requested. Exiting...")
+                break
+            
+            # Reduce timeout to increase response, wait longer while detection is idle
+            result = frame_ring.take('processed', timeout=0.05 if idle_scheduler.idle else 0.01)
+            if result is None:
+                continue
+            
+            if result.end_of_input:
+                print("End of recorded input reached.")
+                break
+            
+            received_time = time.perf_counter()
+            startup_profile.mark("first frame processed")
+            if report_startup and not startup_reported and not (browser_thread and browser_thread.is_alive()):
+                # Timeline once the vision path and the browser (if any) are both up
+                startup_profile.report()
+                startup_reported = True
+            
+            h, w, _ = result.frame.shape
+            FRAMES_CONTROLLED.inc()
+            FRAME_AGE.observe(received_time - result.capture_time)
+            
+            # Everything the gestures and overlay need, straight from the (smoothed) landmark array
+            smooth_hand_landmarks(result)
+            geometry = hand_geometry(result.hand_landmarks, result.handedness, result.num_hands, w, h)
+            
+            # Re-read system volume every 1 second
+            current_time = time.time()
+            if current_time - last_system_update > 1.0:
+                context.system_volume = context.read_volume()
+                last_system_update = current_time
+            
+            # Volume, playback speed and any other registered gesture
+            outcomes = {} if remote_control.paused else gesture_registry.dispatch(geometry['gestures'],
+                                                                                  result.capture_time, context)
+            target_volume = outcomes.get('volume')
+            remote_control.frame_handled(result)
+            if on_frame is not None:
+                on_frame(result, geometry, received_time)
+            
+            if publish:
+                # Latest wins: a frame the display hasn't picked up yet goes back to the ring
+                result.geometry = geometry
+                result.target_volume = target_volume
+                frame_ring.publish(result, 'controlled', drop_counter=FRAMES_DROPPED_DISPLAY)
+                result = None
+                
+        except Exception as e:
+            print(f"Error in control loop: {e}")
+            traceback.print_exc()
+        finally:
+            if result is not None:
+                frame_ring.release(result)
+
+def frame_size(value):
+    """argparse type for WxH sizes"""
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, e.g. 640x360, got '{value}'")
+    return width, height
+
+def fourcc(value):
+    """argparse type for four character codes"""
+    if len(value) != 4:
+        raise argparse.ArgumentTypeError(f"a FOURCC has four characters, got '{value}'")
+    return value
+
+def parse_arguments(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="AI Hand Controller by LePhiAnhDev")
+    choice_options = []  # Options with a fixed set of values, checked for --config values too
+    parser.add_argument("--config", default=None, metavar="FILE",
+                        help="JSON file with option values, e.g. {\"browser\": \"brave\", \"url\": \"...\"} "
+                             "(keys are the option names, the command line overrides them)")
+    choice_options.append(parser.add_argument("--browser", choices=("chrome", "brave"), default=None,
+                                              help="Browser to open the video in (asked at startup when not given)"))
+    parser.add_argument("--user-data-dir", default=None,
+                        help="Browser user data directory, \"\" for none (asked at startup when not given)")
+    parser.add_argument("--profile", default=None,
+                        help="Profile inside the user data directory, e.g. \"Profile 1\"")
+    parser.add_argument("--url", default=None,
+                        help="YouTube video to open (asked at startup when not given)")
+    parser.add_argument("--no-prompt", action="store_true",
+                        help="Never ask at startup, use the defaults for browser settings that aren't given")
+    parser.add_argument("--no-browser", action="store_true",
+                        help="Don't open a browser, only volume control")
+    parser.add_argument("--source", default=None,
+                        help="Camera index, video file or image directory to read frames from (default: webcam 0)")
+    parser.add_argument("--max-frame-age", type=float, default=500.0, metavar="MS",
+                        help="Drop frames older than this (since capture) at any pipeline stage, live/real-time input "
+                             "only (default: 500, 0 disables)")
+    parser.add_argument("--camera-size", type=frame_size, default="640x360", metavar="WxH",
+                        help="Resolution to ask the webcam for (default: 640x360)")
+    parser.add_argument("--camera-fps", type=float, default=60.0,
+                        help="Frame rate to ask the webcam for (default: 60)")
+    parser.add_argument("--camera-fourcc", type=fourcc, default="MJPG",
+                        help="Pixel format to ask the webcam for (default: MJPG)")
+    parser.add_argument("--fast", action="store_true",
+                        help="Read recorded input as fast as possible instead of at its real-time frame rate")
+    parser.add_argument("--source-fps", type=float, default=None,
+                        help="Frame rate for image directories, or to override a video's own frame rate")
+    parser.add_argument("--loop", action="store_true",
+                        help="Restart recorded input from the beginning when it ends")
+    parser.add_argument("--output", default="results.json",
+                        help="Where --autotune, --simulate-speed and --replay write their results (JSON)")
+    choice_options.append(parser.add_argument("--inference-mode", choices=["full", "roi"], default="full",
+                                              help="full: detect on the downscaled frame, "
+                                                   "roi: track hands on full-resolution crops"))
+    parser.add_argument("--inference-workers", type=int, default=0,
+                        help="Run hand detection in this many worker processes (0: in a thread of the main process)")
+    parser.add_argument("--idle-after-frames", type=int, default=30,
+                        help="Switch to idle detection after this many frames without hands (0 disables)")
+    parser.add_argument("--idle-rate", type=float, default=5.0,
+                        help="Hand detections per second while idle (default: 5)")
+    parser.add_argument("--headless", action="store_true",
+                        help="No window and no drawing: capture, detection, gestures and actuators only "
+                             "(stop with SIGTERM / Ctrl+C or the control socket)")
+    parser.add_argument("--display-fps", type=float, default=30.0,
+                        help="Show at most this many frames per second (0: every frame), the gestures still run at camera rate")
+    parser.add_argument("--control-port", type=int, default=None,
+                        help="Accept control commands (status, pause, resume, stop, metrics) on 127.0.0.1:PORT")
+    choice_options.append(parser.add_argument("--landmark-filter", choices=["none"] + list(FilterBank.MODELS),
+                                              default="none",
+                                              help="Smooth all landmark coordinates before the gestures use them "
+                                                   "(default: none)"))
+    parser.add_argument("--filter-min-cutoff", type=float, default=1.0,
+                        help="One-Euro minimum cutoff frequency in Hz (lower: smoother, more lag)")
+    parser.add_argument("--filter-beta", type=float, default=20.0,
+                        help="One-Euro speed coefficient (higher: less lag on fast movements)")
+    parser.add_argument("--filter-process-noise", type=float, default=1.0,
+                        help="Kalman process noise (higher: follows fast movements more closely)")
+    parser.add_argument("--filter-measurement-noise", type=float, default=1e-5,
+                        help="Kalman measurement noise variance of a landmark coordinate")
+    choice_options.append(parser.add_argument("--skeleton-detail", choices=SkeletonRenderer.DETAILS, default="full",
+                                              help="Hand skeleton overlay: full (mediapipe's look) "
+                                                   "or reduced (thin lines, fingertips only)"))
+    parser.add_argument("--record-landmarks", default=None, metavar="FILE",
+                        help="Record every processed frame's hand landmarks, handedness and scores to FILE")
+    parser.add_argument("--inspect-recording", default=None, metavar="FILE",
+                        help="Print a summary of a landmark recording and exit")
+    parser.add_argument("--speed-step", type=float, default=0.04,
+                        help="Thumb-index distance change (relative to frame width) per playback speed step")
+    parser.add_argument("--speed-dead-band", type=float, default=0.006,
+                        help="Thumb-index distance wobble that never changes the speed")
+    parser.add_argument("--speed-hysteresis", type=float, default=0.015,
+                        help="Extra distance needed to step the speed back the other way")
+    parser.add_argument("--speed-max-rate", type=float, default=8.0,
+                        help="At most this many speed steps per second")
+    parser.add_argument("--speed-filter-alpha", type=float, default=0.2,
+                        help="Base smoothing factor of the thumb-index distance filter (higher follows the hand faster)")
+    parser.add_argument("--speed-filter-responsiveness", type=float, default=0.85,
+                        help="How much fast movements change the speed filter's smoothing")
+    parser.add_argument("--speed-filter-min-alpha", type=float, default=0.05,
+                        help="Lowest smoothing factor of the speed filter")
+    parser.add_argument("--speed-filter-max-alpha", type=float, default=0.5,
+                        help="Highest smoothing factor of the speed filter")
+    parser.add_argument("--speed-filter-prediction", type=float, default=0.4,
+                        help="How far ahead the speed filter extrapolates the hand movement")
+    parser.add_argument("--speed-filter-max-deviation", type=float, default=0.12,
+                        help="Largest distance the speed filter's prediction may add")
+    parser.add_argument("--speed-filter-predict", action=argparse.BooleanOptionalAction, default=True,
+                        help="Step the speed on the speed filter's prediction of the distance instead of the "
+                             "filtered distance (default: on)")
+    parser.add_argument("--volume-filter-alpha", type=float, default=0.7,
+                        help="Base smoothing factor of the two-hand distance filter for the volume")
+    parser.add_argument("--volume-filter-responsiveness", type=float, default=0.3,
+                        help="How much fast movements change the volume filter's smoothing")
+    parser.add_argument("--volume-filter-min-alpha", type=float, default=0.3,
+                        help="Lowest smoothing factor of the volume filter")
+    parser.add_argument("--volume-filter-max-alpha", type=float, default=0.9,
+                        help="Highest smoothing factor of the volume filter")
+    parser.add_argument("--autotune", action="store_true",
+                        help="Search the speed filter, speed controller and volume filter options on labelled "
+                             "distance traces and recordings in worker processes, write the Pareto front of "
+                             "latency, overshoot and spurious updates")
+    parser.add_argument("--autotune-candidates", type=int, default=500,
+                        help="Number of random settings to score (default: 500)")
+    parser.add_argument("--autotune-workers", type=int, default=0,
+                        help="Worker processes for --autotune (default: one per CPU)")
+    parser.add_argument("--autotune-recordings", nargs="+", metavar="RECORDING", default=None,
+                        help="Also score --autotune settings by replaying these landmark recordings, labelled with "
+                             "the intended volume and speed in RECORDING.labels.json")
+    parser.add_argument("--autotune-config", default="autotuned_config.json", metavar="FILE",
+                        help="Where --autotune writes the chosen settings, for --config (default: autotuned_config.json)")
+    parser.add_argument("--simulate-speed", nargs="*", metavar="TRACE", default=None,
+                        help="Replay distance traces (CSV: time,distance; none: built-in scenarios) through the "
+                             "speed controller and report updates and delays")
+    parser.add_argument("--replay", nargs="+", metavar="RECORDING", default=None,
+                        help="Replay landmark recordings (--record-landmarks) through the gesture, volume and speed "
+                             "logic in virtual time with stubbed actuators and write the actuator calls; the frame "
+                             "size the landmarks belong to is --camera-size")
+    parser.add_argument("--replay-compare", default=None, metavar="RESULTS",
+                        help="Compare the replayed actuator calls with an earlier --replay output, exit status 1 "
+                             "when they differ")
+    parser.add_argument("--browser-remote", default=None, metavar="URL",
+                        help="Use the WebDriver server at URL (e.g. a running chromedriver) instead of starting a browser")
+    parser.add_argument("--browser-health-interval", type=float, default=2.0,
+                        help="Seconds between checks that the page still has the speed controller (0 disables)")
+    choice_options.append(parser.add_argument("--browser-backend", choices=sorted(BROWSER_BACKENDS), default="selenium",
+                                              help="How to talk to the browser: selenium (WebDriver), playwright, "
+                                                   "or devtools (raw DevTools websocket)"))
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Print the startup timeline once the first frame has been processed and the browser is up")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-json", default=None,
+                        help="Periodically write all metrics to this JSON file")
+    parser.add_argument("--metrics-interval", type=float, default=10.0,
+                        help="Seconds between JSON metrics dumps (default: 10)")
+    
+    # Config file values become the defaults, so anything on the command line still wins
+    known, _ = parser.parse_known_args(argv)
+    if known.config:
+        try:
+            with open(known.config) as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"could not read config file {known.config}: {e}")
+        config = {key.replace("-", "_"): value for key, value in config.items()}
+        unknown = sorted(set(config) - set(vars(parser.parse_args([]))))
+        if unknown:
+            parser.error(f"unknown option(s) in {known.config}: {', '.join(unknown)}")
+        for option in choice_options:
+            if option.dest in config and config[option.dest] not in option.choices:
+                parser.error(f"{option.dest} in {known.config} must be one of: {', '.join(map(str, option.choices))}")
+        parser.set_defaults(**config)
+    return parser.parse_args(argv)
+
+def configure(args):
+    """Apply the pipeline, filter, controller and browser options, return the speed controller options"""
+    global inference_workers, frame_ring, landmark_filter, browser_remote_url, browser_backend, browser_health_interval
+    
+    hand_detector.mode = args.inference_mode
+    inference_workers = max(0, args.inference_workers)
+    cpus = os.cpu_count() or 1
+    if inference_workers >= cpus:
+        print(f"{inference_workers} inference workers on {cpus} CPUs: they compete with capture and the control loop, "
+              f"expect higher latency than with fewer workers")
+    if inference_workers:
+        if args.inference_mode == "roi":
+            print("ROI tracking needs frames in order, using full-frame inference in the worker processes")
+        # One extra ring slot per additional frame in flight
+        frame_ring = FrameRing(size=6 + inference_workers)
+    idle_scheduler.idle_after_frames = args.idle_after_frames
+    idle_scheduler.idle_rate = args.idle_rate
+    landmark_filter = create_landmark_filter(args.landmark_filter, min_cutoff=args.filter_min_cutoff,
+                                             beta=args.filter_beta, process_noise=args.filter_process_noise,
+                                             measurement_noise=args.filter_measurement_noise)
+    
+    speed_options = apply_control_settings(vars(args))
+    skeleton.detail = args.skeleton_detail
+    browser_remote_url = args.browser_remote
+    browser_backend = args.browser_backend
+    browser_health_interval = args.browser_health_interval
+    reset_control_state()  # Filters with the configured options
+    return speed_options
+
+def main(args=None):
     """Main program function"""
-    global processing_active, current_volume, current_speed, prev_left_hand_distance
-    global last_volume_change_time, last_speed_change_time, selenium_active, system_volume
-    global filtered_distance_history
+    global processing_active, current_volume, current_speed, selenium_active, system_volume
+    global frame_source, landmark_recorder
+    
+    if args is None:
+        args = parse_arguments([])
+    speed_options = configure(args)
+    
+    if args.autotune:
+        base_config = None
+        if args.config:
+            with open(args.config) as f:
+                base_config = json.load(f)
+        autotune_speed(args.output, args.autotune_config, vars(args), candidates=args.autotune_candidates,
+                       workers=args.autotune_workers, base_config=base_config, recordings=args.autotune_recordings)
+        return
+    
+    if args.simulate_speed is not None:
+        run_speed_simulation(args.simulate_speed, args.output, speed_options)
+        return
+    
+    if args.replay:
+        if not run_replay(args.replay, args.output, frame_size=args.camera_size,
+                          reference_path=args.replay_compare):
+            print("Replayed actuator calls differ from the reference")
+            raise SystemExit(1)
+        return
+    
+    if args.inspect_recording:
+        recording = LandmarkRecording(args.inspect_recording)
+        print(json.dumps(recording.summary(), indent=2))
+        recording.close()
+        return
+    
+    # Select where frames come from (webcam, recorded video or image sequence)
+    camera_options = {'width': args.camera_size[0], 'height': args.camera_size[1], 'fps': args.camera_fps,
+                      'fourcc': args.camera_fourcc}
+    frame_source = create_frame_source(args.source, realtime=not args.fast, fps=args.source_fps, loop=args.loop,
+                                       camera_options=camera_options)
+    # Frames that wait on purpose (as-fast-as-possible input) are never too old
+    frame_ring.max_age = args.max_frame_age / 1000 if args.max_frame_age > 0 and frame_source.realtime else None
+    
+    if args.record_landmarks:
+        landmark_recorder = LandmarkRecorder(args.record_landmarks, metadata={
+            'source': str(args.source if args.source is not None else 0), 'inference_mode': args.inference_mode,
+            'landmark_filter': "none (raw detector output)"}).start()
+    
+    # Optional metrics outputs
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+    if args.metrics_json:
+        threading.Thread(target=metrics_json_writer, args=(args.metrics_json, args.metrics_interval),
+                         daemon=True).start()
     
     # Display fancy banner
-    used_font = display_fancy_banner()
+    with startup_profile.phase("banner"):
+        used_font = display_fancy_banner()
+    
+    with startup_profile.phase("volume control"):
+        init_volume_control()
     
     # Initialize variables to avoid errors
     current_speed = 1.0
@@ -930,19 +4763,23 @@ def main():
     print("This program will control YouTube playback speed directly")
     print("using hand gestures.")
     
-    # Start processing threads (camera first to avoid delay)
+    # Start processing threads: the camera opens while the model loads and warms up (camera first to avoid delay)
     camera_thread = threading.Thread(target=camera_reader, daemon=True)
     processor_thread = threading.Thread(target=hand_processor, daemon=True)
     camera_thread.start()
     processor_thread.start()
+    actuator_scheduler.start()
+    browser_scheduler.start()
     
-    # Setup Selenium in a separate thread
-    selenium_thread = threading.Thread(target=setup_selenium)
-    selenium_thread.daemon = True
-    selenium_thread.start()
-    
-    # Wait for Selenium to finish startup
-    selenium_thread.join()
+    # Browser settings come from the command line / config file, only missing ones are asked for (meanwhile
+    # the model keeps loading). The browser starts in the background and attaches when the video page is ready,
+    # the control loop doesn't wait for it
+    selenium_thread = None
+    if not args.no_browser:
+        with startup_profile.phase("browser settings"):
+            choose_browser_settings(args.browser, args.user_data_dir, args.profile, args.url, prompt=not args.no_prompt)
+        selenium_thread = threading.Thread(target=setup_selenium, daemon=True)
+        selenium_thread.start()
     
     print("\n===== USER GUIDE =====")
     print("1. Volume control: Use 2 hands (distance between two index fingers)")
@@ -950,253 +4787,78 @@ def main():
     print("   - Use left hand (distance between thumb-index finger)")
     print("   - Increase speed: Move thumb and index finger apart")
     print("   - Decrease speed: Pinch thumb and index finger together")
-    print("\nSystem ready! Press ESC to exit.")
     
-    # Create display window
-    cv2.namedWindow('AI Hand Controller', cv2.WINDOW_NORMAL)
+    # Headless: capture, detection, gestures and actuators only, no drawing and no window
+    headless = args.headless
+    if not headless and not display_available():
+        print("\nNo display available, running headless.")
+        headless = True
+    remote_control.install_signal_handlers()
+    if args.control_port:
+        remote_control.start_server(args.control_port)
+    if headless:
+        stop_hint = "Ctrl+C, SIGTERM or 'stop' on the control socket" if remote_control.server else "Ctrl+C or SIGTERM"
+        print(f"\nSystem ready! Stop with {stop_hint}.")
+    else:
+        print("\nSystem ready! Press ESC to exit.")
     
     # Update system volume
     system_volume = get_system_volume()
     current_volume = system_volume
     
-    # Status tracking variables
-    last_volume_status = ""
-    last_speed_status = ""
-    
-    # Last system update time
-    last_system_update = time.time()
-    
-    # Speed trend variable
-    speed_trend = 0  # 0: no change, 1: increase, -1: decrease
+    # Gestures and actuators run at camera rate on their own thread. This (main) thread shows the latest
+    # controlled frame at most display_fps times per second and skips the rest: HighGUI calls have to stay on
+    # the thread that created the window (macOS), so the control loop is the one that moves
+    control_thread = threading.Thread(target=control_loop, args=(not headless, args.startup_profile, selenium_thread),
+                                      daemon=True)
+    control_thread.start()
+    display_interval = 1.0 / args.display_fps if args.display_fps > 0 else 0.0
+    next_display_time = 0.0
     
     try:
-        while True:
+        while control_thread.is_alive():
+            if headless:
+                control_thread.join(timeout=0.2)
+                continue
+            
+            slot = None
             try:
-                # Check if processing is still active
-                if not processing_active:
-                    print("Processing has stopped. Exiting...")
-                    break
-                    
-                try:
-                    result = result_queue.get(timeout=0.01)  # Reduce timeout to increase response
-                except queue.Empty:
-                    # No frames available yet, check for exit key and continue
-                    if cv2.waitKey(1) & 0xFF == 27:
+                # Until the next display slot only window events (and ESC) are handled
+                wait = next_display_time - time.perf_counter()
+                if wait > 0.001:
+                    if cv2.waitKey(max(1, int(wait * 1000))) & 0xFF == 27:
                         break
                     continue
                 
-                frame = result['frame']
-                hand_points = result['hand_points']
-                landmarks = result['landmarks']
-                hand_sides = result['hand_sides']
-                left_hand_data = result['left_hand_data']
-                fps = result['fps']
-                
-                h, w, _ = frame.shape
-                
-                # Re-read system volume every 1 second
-                current_time = time.time()
-                if current_time - last_system_update > 1.0:
-                    system_volume = get_system_volume()
-                    last_system_update = current_time
-                
-                # Draw landmarks
-                for hand_landmark, hand_side in zip(landmarks, hand_sides):
-                    # Display hand type with different colors
-                    color = (0, 255, 0) if hand_side == 'left' else (0, 0, 255)
-                    mp_drawing.draw_landmarks(
-                        frame, 
-                        hand_landmark, 
-                        mp_hands.HAND_CONNECTIONS,
-                        mp_drawing_styles.get_default_hand_landmarks_style(),
-                        mp_drawing_styles.get_default_hand_connections_style()
-                    )
-                    
-                    # Show hand label
-                    wrist = hand_landmark.landmark[0]
-                    wrist_x, wrist_y = int(wrist.x * w), int(wrist.y * h)
-                    
-                    # Use custom label function with white background
-                    draw_centered_label(frame, f"{hand_side.capitalize()} hand", 
-                                       (wrist_x, wrist_y - 15), size=0.5, thickness=1)
-                
-                # Process volume control (when 2 hands present)
-                if len(hand_points) == 2:
-                    x1, y1 = hand_points[0]
-                    x2, y2 = hand_points[1]
-                    distance = np.hypot(x2 - x1, y2 - y1) / w
-                    smoothed_distance = distance_filter.update(distance)
-                    
-                    # Draw line between hands with more prominent visualization
-                    cv2.line(frame, (x1, y1), (x2, y2), (255, 0, 0), 3)
-                    
-                    # Add mid-point volume display
-                    mid_x = (x1 + x2) // 2
-                    mid_y = (y1 + y2) // 2
-                    
-                    max_distance = 0.5
-                    target_volume = int(np.interp(smoothed_distance, [0, max_distance], [0, 100]))
-                    
-                    # Draw centered volume display
-                    draw_centered_label(frame, f"{system_volume}%", (mid_x, mid_y), size=0.6, thickness=2)
-                    
-                    # Volume bar directly on frame - centered vertically
-                    bar_x = w - 50
-                    bar_y = (h - 200) // 2  # Center vertically
-                    bar_h = 200
-                    bar_w = 30
-                    
-                    # Background
-                    cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_w, bar_y + bar_h), (200, 200, 200), -1)
-                    
-                    # Current volume
-                    fill_h = int(bar_h * (system_volume / 100))
-                    cv2.rectangle(frame, (bar_x, bar_y + bar_h - fill_h), (bar_x + bar_w, bar_y + bar_h),
-                                 (0, 255, 0), -1)
-                    
-                    # Target volume indicator
-                    target_y = bar_y + bar_h - int(bar_h * (target_volume / 100))
-                    cv2.rectangle(frame, (bar_x - 5, target_y - 2), (bar_x + bar_w + 5, target_y + 2),
-                                 (0, 0, 255), -1)
-                    
-                    # Volume percentage text
-                    draw_centered_label(frame, f"{system_volume}%", (bar_x + bar_w // 2, bar_y + bar_h + 15), 0.5, 1)
-                    
-                    # Adjust system volume directly
-                    current_time = time.time()
-                    if current_time - last_volume_change_time > 0.1:  # 100ms
-                        if abs(target_volume - system_volume) > 2:
-                            old_volume = system_volume
-                            system_volume = adjust_system_volume(target_volume)
-                            last_volume_change_time = current_time
-                            last_volume_status = "Increase" if system_volume > old_volume else "Decrease"
-                    
-                    # Show status
-                    if last_volume_status:
-                        color = (0, 255, 0) if last_volume_status == "Increase" else (0, 0, 255)
-                        draw_centered_label(frame, last_volume_status, (bar_x + bar_w // 2, bar_y - 15), 0.5, 1)
-                
-                # Process playback speed control using left hand
-                if left_hand_data:
-                    index_point = left_hand_data['index_point']
-                    thumb_point = left_hand_data['thumb_point']
-                    distance = left_hand_data['distance']
-                    
-                    # Apply advanced smooth filter
-                    smoothed_distance = left_hand_filter.update(distance)
-                    filtered_distance_history.append(smoothed_distance)
-                    
-                    # Draw connection between index and thumb and highlight more
-                    cv2.line(frame, index_point, thumb_point, (0, 255, 255), 3)
-                    cv2.circle(frame, index_point, 10, (0, 255, 255), -1)
-                    cv2.circle(frame, thumb_point, 10, (0, 255, 255), -1)
-                    
-                    # Display playback speed at midpoint
-                    mid_x = (index_point[0] + thumb_point[0]) // 2
-                    mid_y = (index_point[1] + thumb_point[1]) // 2
-                    draw_centered_label(frame, f"{current_speed}x", (mid_x, mid_y), size=0.6, thickness=2)
-                    
-                    # Speed bar on left side - centered vertically
-                    speed_bar_x = 50
-                    speed_bar_y = (h - 200) // 2  # Center vertically
-                    speed_bar_h = 200
-                    speed_bar_w = 30
-                    
-                    # Background
-                    cv2.rectangle(frame, (speed_bar_x, speed_bar_y), 
-                                 (speed_bar_x + speed_bar_w, speed_bar_y + speed_bar_h), 
-                                 (200, 200, 200), -1)
-                    
-                    # Current speed
-                    normalized_speed = (speed_index / (len(speed_values) - 1))
-                    fill_h = int(speed_bar_h * normalized_speed)
-                    cv2.rectangle(frame, (speed_bar_x, speed_bar_y + speed_bar_h - fill_h), 
-                                 (speed_bar_x + speed_bar_w, speed_bar_y + speed_bar_h),
-                                 (255, 165, 0), -1)
-                    
-                    # Speed text
-                    draw_centered_label(frame, f"{current_speed}x", 
-                                      (speed_bar_x + speed_bar_w // 2, speed_bar_y + speed_bar_h + 15), 0.5, 1)
-                    
-                    if prev_left_hand_distance is not None:
-                        distance_change = smoothed_distance - prev_left_hand_distance
-                        
-                        # Update general speed trend (for display)
-                        if abs(distance_change) > 0.005:  # More sensitive to small changes
-                            speed_trend = 1 if distance_change > 0 else -1
-                        else:
-                            speed_trend = 0
-                        
-                        # Near-zero threshold but slightly increased for stability
-                        dynamic_threshold = 0.0025 + 0.002 * (1 - abs(distance_change) * 12)
-                        dynamic_threshold = max(0.002, min(0.005, dynamic_threshold))  # Slightly increased threshold
-                        
-                        # Process speed change with a small delay for stability
-                        current_time = time.time()
-                        # Slightly longer delay (15ms) for better stability
-                        if current_time - last_speed_change_time > 0.015:
-                            if abs(distance_change) > dynamic_threshold:
-                                direction = "faster" if distance_change > 0 else "slower"
-                                
-                                # Save previous state
-                                old_speed = current_speed
-                                
-                                # Apply speed control with direct distance change input for more precision
-                                current_speed = adjust_playback_speed(direction, distance_change)
-                                
-                                # If speed changes, update status
-                                if current_speed != old_speed:
-                                    last_speed_status = "Speed up" if current_speed > old_speed else "Slow down"
-                                
-                                # Update time to avoid continuous changes
-                                last_speed_change_time = current_time
-                        
-                        # Show trend indicator near speed bar
-                        trend_text = ""
-                        if speed_trend > 0:
-                            trend_text = "▲"
-                            draw_centered_label(frame, trend_text, 
-                                             (speed_bar_x + speed_bar_w // 2, speed_bar_y - 15), 0.7, 2)
-                        elif speed_trend < 0:
-                            trend_text = "▼"
-                            draw_centered_label(frame, trend_text, 
-                                             (speed_bar_x + speed_bar_w // 2, speed_bar_y - 15), 0.7, 2)
-                    
-                    # Update previous distance
-                    prev_left_hand_distance = smoothed_distance
-                    
-                    # Show speed status
-                    if last_speed_status:
-                        color = (255, 165, 0) if last_speed_status == "Speed up" else (0, 165, 255)
-                        draw_centered_label(frame, last_speed_status, 
-                                         (speed_bar_x + speed_bar_w // 2, speed_bar_y - 35), 0.5, 1)
-                
-                # Display FPS
-                cv2.putText(frame, f"FPS: {fps}", (w - 80, 20),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+                slot = frame_ring.take('controlled', timeout=0.01)
+                if slot is None:
+                    # No new frame yet, check for exit key and continue
+                    if cv2.waitKey(1) & 0xFF == 27:
+                        break
+                    continue
                 
-                # Display browser type
-                browser_info = f"Using {browser_type.capitalize()}"
-                cv2.putText(frame, browser_info, (10, 20),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                # Draw straight onto the ring buffer, the slot is only recycled after imshow
+                overlay_start = time.perf_counter()
+                next_display_time = overlay_start + display_interval
+                draw_overlay(slot.frame, slot, slot.geometry, slot.target_volume)
                 
-                # Show Selenium status
-                status_text = "Connected" if selenium_active else "Disconnected"
-                status_color = (0, 255, 0) if selenium_active else (0, 0, 255)
-                cv2.putText(frame, f"YouTube: {status_text}", (10, h - 10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, status_color, 1)
+                display_start = time.perf_counter()
+                STAGE_OVERLAY.observe(display_start - overlay_start)
                 
-                cv2.imshow('AI Hand Controller', frame)
+                cv2.imshow('AI Hand Controller', slot.frame)
+                key = cv2.waitKey(1) & 0xFF
+                STAGE_DISPLAY.observe(time.perf_counter() - display_start)
+                FRAMES_DISPLAYED.inc()
                 
-                if cv2.waitKey(1) & 0xFF == 27:  # Exit with ESC
+                if key == 27:  # Exit with ESC
                     break
                     
-            except queue.Empty:
-                if cv2.waitKey(1) & 0xFF == 27:
-                    break
             except Exception as e:
-                print(f"Error in main loop: {e}")
+                print(f"Error in display loop: {e}")
                 traceback.print_exc()
+            finally:
+                if slot is not None:
+                    frame_ring.release(slot)
     
     except KeyboardInterrupt:
         print("\nProgram interrupted by user.")
@@ -1210,18 +4872,32 @@ def main():
         
         try:
             # Ensure threads are properly terminated
+            if 'control_thread' in locals() and control_thread.is_alive():
+                control_thread.join(timeout=1.0)
+            
             if 'camera_thread' in locals() and camera_thread.is_alive():
                 camera_thread.join(timeout=1.0)
                 
             if 'processor_thread' in locals() and processor_thread.is_alive():
                 processor_thread.join(timeout=1.0)
+            
+            if landmark_recorder is not None:
+                landmark_recorder.close()
+            
+            # Let the last volume/speed change through, then stop the actuator workers
+            for scheduler in (actuator_scheduler, browser_scheduler):
+                scheduler.flush(timeout=0.5)
+                scheduler.stop()
                 
             # Properly close OpenCV windows
-            cv2.destroyAllWindows()
+            if not headless:
+                cv2.destroyAllWindows()
+            remote_control.stop_server()
             
             # Correctly release MediaPipe resources
-            if 'hands' in globals():
-                hands.close()
+            hand_detector.close()
+            if inference_pool is not None:
+                inference_pool.close()
                 
             # Clean up volume controller
             if volume_controller is not None:
@@ -1231,9 +4907,11 @@ def main():
         except Exception as cleanup_error:
             print(f"Error during cleanup: {cleanup_error}")
             
+startup_profile.add("import", MODULE_LOAD_START, time.perf_counter())
+
 if __name__ == "__main__":
     try:
-        main()
+        main(parse_arguments())
     except Exception as e:
         print(f"Fatal error: {e}")
         traceback.print_exc()
@@ -0,0 +1,6 @@
+"""Benchmarks for Magic_Hand_AI, run from the repository root with: python -m benchmarks COMMAND
+
+The pipeline runs recorded clips through camera_reader, hand_processor and the gesture logic with stubbed
+actuators; the others time one part (filters, HUD, skeleton, gestures, browser channel and backends) on
+synthetic input. Every command writes its results as JSON to --output.
+"""
@@ -0,0 +1,71 @@
+"""Command line for the benchmarks, options it doesn't know go to Magic_Hand_AI's own parser"""
+import argparse
+
+import Magic_Hand_AI as app
+
+def parse_arguments(argv=None):
+    """Split the command line into benchmark options and Magic_Hand_AI options"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Magic Hand AI benchmarks, any other option is passed to "
+                                                 "Magic_Hand_AI (e.g. --inference-mode, --landmark-filter)")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="Where to write the benchmark results (JSON)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pipeline = commands.add_parser("pipeline", help="Run recorded clips through the full pipeline with stubbed "
+                                                    "actuators and report latencies")
+    pipeline.add_argument("clips", nargs="+", metavar="CLIP")
+    pipeline.add_argument("--compare-roi", action="store_true",
+                          help="Run each clip with both inference modes and report the accuracy/latency trade-off")
+    pipeline.add_argument("--headless", action="store_true",
+                          help="Run each clip with the windowed and the headless main loop and compare CPU and latency")
+    commands.add_parser("filters", help="Landmark filter bank against AdvancedSmoothFilter on synthetic motion")
+    commands.add_parser("hud", help="Per-frame HUD overlay cost drawn directly vs from cached sprites")
+    commands.add_parser("skeleton", help="Per-frame cost of mp_drawing and the vectorised skeleton renderer")
+    commands.add_parser("gestures", help="Per-frame gesture evaluation cost as gestures are added, "
+                                         "registry vs inline checks")
+    channel = commands.add_parser("browser-channel", help="UI frame cost of inline vs background browser commands "
+                                                          "against a stand-in WebDriver")
+    channel.add_argument("--latency", type=float, default=0.02,
+                         help="Round-trip latency of the stand-in WebDriver server in seconds (default: 0.02)")
+    backends = commands.add_parser("browser-backends", help="Speed command latency of browser backends on a local "
+                                                            "headless page")
+    backends.add_argument("backends", nargs="*", metavar="BACKEND", help="Backends to compare (default: all)")
+
+    args, rest = parser.parse_known_args(argv)
+    return args, app.parse_arguments(rest)
+
+def main(argv=None):
+    """Configure the pipeline like Magic_Hand_AI would, then run one benchmark"""
+    args, app_args = parse_arguments(argv)
+    app.configure(app_args)
+
+    if args.command == "pipeline":
+        from .pipeline import run_benchmark, benchmark_headless
+        if args.headless:
+            benchmark_headless(args.clips, args.output, realtime=not app_args.fast,
+                               inference_mode=app_args.inference_mode)
+        else:
+            inference_modes = ("full", "roi") if args.compare_roi else (app_args.inference_mode,)
+            run_benchmark(args.clips, args.output, realtime=not app_args.fast, inference_modes=inference_modes)
+    elif args.command == "filters":
+        from .filters import benchmark_filters
+        benchmark_filters(args.output)
+    elif args.command == "hud":
+        from .rendering import benchmark_hud
+        benchmark_hud(args.output)
+    elif args.command == "skeleton":
+        from .rendering import benchmark_skeleton
+        benchmark_skeleton(args.output)
+    elif args.command == "gestures":
+        from .gestures import benchmark_gestures
+        benchmark_gestures(args.output)
+    elif args.command == "browser-channel":
+        from .browser import benchmark_browser_channel
+        benchmark_browser_channel(args.output, latency=args.latency)
+    elif args.command == "browser-backends":
+        from .browser import benchmark_browser_backends
+        benchmark_browser_backends(args.output, args.backends or None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Browser channel and browser backend latency"""
+import time
+import json
+import platform
+import threading
+import http.server
+
+import Magic_Hand_AI as app
+from .common import latency_summary
+from .webdriver_stand_in import start_stand_in_webdriver
+
+def benchmark_browser_channel(output_path, latency=0.02, duration=5.0, fps=60, drop_after=40):
+    """Drive a simulated 60 fps UI loop against a stand-in WebDriver server, inline vs through the browser worker"""
+    if app.load_selenium() is None:
+        print("Selenium is not available - cannot benchmark the browser channel")
+        return None
+    selected_backend, app.browser_backend = app.browser_backend, "selenium"  # The stand-in speaks WebDriver
+
+    # A new speed target every 3 frames, sweeping up and down through all speeds
+    sweep = app.speed_values + app.speed_values[-2:0:-1]
+    frames = int(duration * fps)
+    targets = [sweep[(frame // 3) % len(sweep)] for frame in range(frames)]
+
+    results = {'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'latency_ms': latency * 1000, 'fps': fps,
+               'drop_after': drop_after, 'modes': {}}
+    for mode in ("inline", "worker"):
+        server = start_stand_in_webdriver(latency=latency, drop_after=drop_after if mode == "worker" else 0)
+        app.browser_settings = {'browser_type': "chrome", 'remote_url': f"http://127.0.0.1:{server.server_address[1]}"}
+        app.video_url = "about:blank"
+        app.browser = app.create_browser(app.browser_settings)
+        app.browser.open(app.video_url)
+        app.inject_controller_script()
+        app.selenium_active = True
+        app.browser_scheduler.reset()
+        app.browser_scheduler.start()
+        reconnects_start = app.BROWSER_RECONNECTS.value
+        action = app.browser_scheduler.actions['speed']
+        coalesced_start = action.coalesced.value
+
+        frame_costs = []
+        last_target = None
+        next_frame = time.perf_counter()
+        for target in targets:
+            start = time.perf_counter()
+            if target != last_target:
+                if mode == "inline":
+                    app.change_youtube_speed(target)
+                else:
+                    app.browser_scheduler.post('speed', target)
+                last_target = target
+            frame_costs.append(time.perf_counter() - start)
+            next_frame += 1.0 / fps
+            time.sleep(max(0.0, next_frame - time.perf_counter()))
+        flushed = app.browser_scheduler.flush(timeout=15.0)
+
+        results['modes'][mode] = {
+            'frame_cost': latency_summary(frame_costs),
+            'targets': sum(1 for i, target in enumerate(targets) if i == 0 or target != targets[i - 1]),
+            'commands_sent': len(server.speeds),
+            'coalesced': action.coalesced.value - coalesced_start if mode == "worker" else 0,
+            'reconnects': app.BROWSER_RECONNECTS.value - reconnects_start,
+            'sessions': server.session_count,
+            'final_speed_delivered': flushed and bool(server.speeds) and server.speeds[-1] == last_target
+        }
+        summary = results['modes'][mode]
+        print(f"{mode:<8} frame cost p50 {summary['frame_cost']['p50_ms']} ms, p99 {summary['frame_cost']['p99_ms']} ms, "
+              f"max {summary['frame_cost']['max_ms']} ms | {summary['targets']} targets -> {summary['commands_sent']} "
+              f"commands, {summary['reconnects']} reconnects, final speed delivered: {summary['final_speed_delivered']}")
+        app.browser_scheduler.stop()
+        server.shutdown()
+
+    rtt = app.BROWSER_RTT.snapshot()
+    results['browser_rtt'] = {'count': rtt['count'], 'p50': rtt['p50'], 'p95': rtt['p95']}
+    app.browser = None
+    app.browser_backend = selected_backend
+    app.selenium_active = False
+
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nBrowser channel results written to {output_path}")
+    return results
+
+class VideoPageHandler(http.server.BaseHTTPRequestHandler):
+    """Local test page with a <video> element, for the browser backend benchmark"""
+    PAGE = b"<!DOCTYPE html><html><head><title>Magic Hand test</title></head><body><video muted></video></body></html>"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.PAGE)))
+        self.end_headers()
+        self.wfile.write(self.PAGE)
+
+    def log_message(self, format, *args):
+        pass  # Keep the console clean
+
+def benchmark_browser_backends(output_path, backends=None, commands=200, browser_type="chrome"):
+    """Per-command playback speed latency of each browser backend against a local headless <video> page"""
+    page_server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), VideoPageHandler)
+    page_server.daemon_threads = True
+    threading.Thread(target=page_server.serve_forever, daemon=True).start()
+    page_url = f"http://127.0.0.1:{page_server.server_address[1]}/"
+
+    results = {'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'platform': platform.platform(),
+               'commands': commands, 'backends': {}}
+    print(f"\n{'backend':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name in backends or app.BROWSER_BACKENDS:
+        backend = app.BROWSER_BACKENDS[name]()
+        try:
+            start = time.perf_counter()
+            backend.launch(browser_type=browser_type, headless=True)
+            backend.open(page_url)
+            launch_time = time.perf_counter() - start
+            backend.run(app.CONTROLLER_INSTALLER)
+
+            # Warm up the connection, then time every speed command
+            samples = []
+            for i in range(commands + 10):
+                speed = app.speed_values[i % len(app.speed_values)]
+                command_start = time.perf_counter()
+                backend.call("setYouTubeSpeed", speed)
+                if i >= 10:
+                    samples.append(time.perf_counter() - command_start)
+            applied = backend.evaluate("document.querySelector('video').playbackRate")
+
+            results['backends'][name] = {'launch_s': round(launch_time, 3),
+                                         'playback_rate_applied': applied == speed,
+                                         **latency_summary(samples)}
+            summary = results['backends'][name]
+            print(f"{name:<12}{summary['p50_ms']:>10}{summary['p95_ms']:>10}{summary['p99_ms']:>10}{summary['max_ms']:>10}")
+        except Exception as e:
+            results['backends'][name] = {'error': f"{type(e).__name__}: {e}"}
+            print(f"{name:<12}  not available: {type(e).__name__}: {e}")
+        finally:
+            try:
+                backend.close()
+            except Exception:
+                pass
+    page_server.shutdown()
+
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nBrowser backend results written to {output_path}")
+    return results
@@ -0,0 +1,17 @@
+"""Shared helpers of the benchmarks"""
+import numpy as np
+
+def latency_summary(samples):
+    """Summarize a list of durations (seconds) as milliseconds percentiles"""
+    if not samples:
+        return {'count': 0}
+    values = np.asarray(samples, dtype=np.float64) * 1000.0
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'count': len(samples),
+        'mean_ms': round(float(values.mean()), 3),
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'max_ms': round(float(values.max()), 3)
+    }
@@ -0,0 +1,61 @@
+"""Landmark filter bank vs one AdvancedSmoothFilter per coordinate"""
+import time
+import json
+import platform
+import numpy as np
+
+import Magic_Hand_AI as app
+from .synthetic import synthetic_landmark_track
+
+def benchmark_filters(output_path, rates=(30, 60), repeats=3):
+    """Compare the vectorised filter bank with one AdvancedSmoothFilter per landmark coordinate"""
+    candidates = {
+        'advanced_smooth': lambda: [app.AdvancedSmoothFilter(alpha=0.7, responsiveness=0.3, min_alpha=0.3, max_alpha=0.9)
+                                    for _ in range(2 * 21 * 3)],
+        'one_euro': lambda: app.FilterBank((2, 21, 3), model="one_euro"),
+        'kalman': lambda: app.FilterBank((2, 21, 3), model="kalman")
+    }
+    tracks = {f"{fps}fps": synthetic_landmark_track(fps) for fps in rates}
+    tracks[f"{rates[0]}fps_jitter"] = synthetic_landmark_track(rates[0], timestamp_jitter=0.4 / rates[0])
+    # Without noise the remaining error is pure lag, which should not depend on the frame rate
+    tracks.update({f"{fps}fps_clean": synthetic_landmark_track(fps, noise=0.0) for fps in rates})
+
+    results = {'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'platform': platform.platform(), 'filters': {}}
+    print(f"\n{'filter':<18}{'track':<16}{'us/frame':>10}{'rmse':>10}{'raw rmse':>10}")
+    for name, create in candidates.items():
+        results['filters'][name] = {}
+        for track_name, (times, truth, measured) in tracks.items():
+            best = None
+            for _ in range(repeats):
+                bank = create()
+                output = np.empty_like(measured)
+                start = time.perf_counter()
+                for i, timestamp in enumerate(times):
+                    if isinstance(bank, app.FilterBank):
+                        output[i] = bank.update(measured[i], timestamp)
+                    else:
+                        output[i] = np.reshape([f.update(v) for f, v in zip(bank, measured[i].ravel().tolist())],
+                                               truth.shape[1:])
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            # Skip the first half second while the filters settle
+            settled = times >= times[0] + 0.5
+            rmse = float(np.sqrt(np.mean((output[settled] - truth[settled]) ** 2)))
+            raw_rmse = float(np.sqrt(np.mean((measured[settled] - truth[settled]) ** 2)))
+            results['filters'][name][track_name] = {
+                'us_per_frame': round(best / len(times) * 1e6, 2),
+                'rmse': round(rmse, 6),
+                'raw_rmse': round(raw_rmse, 6)
+            }
+            print(f"{name:<18}{track_name:<16}{best / len(times) * 1e6:>10.1f}{rmse:>10.5f}{raw_rmse:>10.5f}")
+
+        # How much the lag error moves when only the frame rate changes (0: frame-rate independent)
+        errors = [results['filters'][name][f"{fps}fps_clean"]['rmse'] for fps in rates]
+        results['filters'][name]['rate_sensitivity'] = round((max(errors) - min(errors)) / min(errors), 3)
+        print(f"{name:<18}{'rate sensitivity':<16}{results['filters'][name]['rate_sensitivity']:>10}")
+
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nFilter benchmark results written to {output_path}")
+    return results
@@ -0,0 +1,82 @@
+"""Gesture registry vs hand-written per-gesture checks"""
+import time
+import json
+import platform
+import numpy as np
+
+import Magic_Hand_AI as app
+from .common import latency_summary
+from .synthetic import synthetic_hands
+
+def random_gestures(count, seed=0):
+    """count gesture declarations over random features: (value feature, rules)"""
+    rng = np.random.default_rng(seed)
+    declarations = []
+    for _ in range(count):
+        a, b = (int(i) for i in rng.choice(21, 2, replace=False))
+        joint = int(rng.integers(1, 20))
+        finger = str(rng.choice(list(app.FINGERS)))
+        rules = {("angle", joint - 1, joint, joint + 1): (90.0, 180.0), ("extended", finger): (1, 1),
+                 (str(rng.choice(app.HAND_SIDES)),): (1, 1)}
+        declarations.append((("distance", a, b), rules))
+    return declarations
+
+def inline_feature(spec, points, handedness, hand, num_hands):
+    """One feature of one hand computed on its own, like hand-written per-gesture code"""
+    kind = spec[0]
+    if kind == "distance":
+        return float(np.hypot(*(points[hand, spec[1]] - points[hand, spec[2]])))
+    if kind == "angle":
+        u, v = points[hand, spec[1]] - points[hand, spec[2]], points[hand, spec[3]] - points[hand, spec[2]]
+        return float(np.degrees(abs(np.arctan2(u[0] * v[1] - u[1] * v[0], u @ v))))
+    if kind == "extended":
+        tip, middle, reference = app.FINGERS[spec[1]]
+        return float(np.hypot(*(points[hand, tip] - points[hand, reference]))
+                     > np.hypot(*(points[hand, middle] - points[hand, reference])))
+    if kind == "hands":
+        return float(num_hands)
+    return float(handedness[hand] == app.HAND_SIDES.index(kind))
+
+def benchmark_gestures(output_path, counts=(2, 8, 32, 128), frames=500, size=(360, 640)):
+    """Per-frame cost of the gesture registry vs per-gesture inline checks as the number of gestures grows"""
+    h, w = size
+    handedness = np.array([1, 0], dtype=np.int8)
+    landmarks = [synthetic_hands(step) for step in range(frames)]
+    results = {'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'platform': platform.platform(),
+               'frames': frames, 'hands': 2, 'gestures': {}}
+    print(f"\n{'gestures':<10}{'registry p50 ms':>16}{'inline p50 ms':>16}{'features':>10}")
+    
+    for count in counts:
+        declarations = random_gestures(count)
+        registry = app.GestureRegistry()
+        for index, (value, rules) in enumerate(declarations):
+            registry.register(f"gesture_{index}", value, lambda value, capture_time, context: value, rules=rules)
+        samples = {'registry': [], 'inline': []}
+        mismatches = 0
+        for hands in landmarks:
+            start = time.perf_counter()
+            _, fired = registry.evaluate(hands, handedness, 2, w, h)
+            registry.dispatch(fired)
+            samples['registry'].append(time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            points = hands[:, :, :2] * np.array([1.0, h / w], dtype=np.float32)
+            inline_fired = {}
+            for index, (value, rules) in enumerate(declarations):
+                for hand in range(2):
+                    if all(low <= inline_feature(spec, points, handedness, hand, 2) <= high
+                           for spec, (low, high) in rules.items()):
+                        inline_fired[f"gesture_{index}"] = inline_feature(value, points, handedness, hand, 2)
+            samples['inline'].append(time.perf_counter() - start)
+            mismatches += set(fired) != set(inline_fired)
+        
+        entry = {name: latency_summary(values) for name, values in samples.items()}
+        entry['features'] = len(registry.features)
+        entry['frames_with_different_gestures'] = mismatches
+        results['gestures'][count] = entry
+        print(f"{count:<10}{entry['registry']['p50_ms']:>16}{entry['inline']['p50_ms']:>16}{entry['features']:>10}")
+    
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Gesture benchmark results written to {output_path}")
+    return results
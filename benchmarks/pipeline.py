@@ -0,0 +1,262 @@
+"""Recorded clips -> camera_reader -> hand_processor -> gesture logic -> stubbed actuators"""
+import time
+import json
+import platform
+import threading
+import cv2
+import numpy as np
+
+import Magic_Hand_AI as app
+from .common import latency_summary
+
+def benchmark_clip(clip, realtime=False, inference_mode="full", render=None):
+    """Run one recorded clip through the full pipeline and collect per-stage latencies
+
+    The app's own control_loop handles the frames, with stubbed actuators. render: None for the headless loop
+    (no drawing), "overlay" to also draw the overlay like the windowed main loop, "window" to draw it and show it
+    with imshow/waitKey. Like main(), drawing happens on this thread while control_loop runs on its own.
+    """
+    # Start from a clean pipeline
+    app.reset_control_state()
+    app.frame_ring.reset()
+    app.hand_detector.mode = inference_mode
+    app.hand_detector.reset()
+    app.idle_scheduler.reset()
+    
+    stubs = app.StubActuators()
+    context = app.stub_control_context(stubs)
+    schedulers = (context.actuator_scheduler, context.browser_scheduler)
+    
+    stages = {name: [] for name in ('capture', 'preprocess', 'inference', 'extract', 'queue_wait',
+                                    'control', 'overlay', 'display', 'actuator', 'actuator_queue_age',
+                                    'glass_to_decision', 'glass_to_display', 'glass_to_actuation')}
+    counts = {'frames': 0, 'frames_with_hands': 0, 'roi_frames': 0}
+    pinch_distances = {}  # sequence -> left hand thumb-index distance (accuracy comparison between modes)
+    
+    def frame_handled(result, geometry, received_time):
+        """control_loop hook, runs on the control thread right after the gestures of a frame were handled"""
+        control_end = time.perf_counter()
+        counts['frames'] += 1
+        for name, value in result.timings.items():
+            stages[name].append(value)
+        stages['queue_wait'].append(received_time - result.processed_time)
+        if result.num_hands:
+            counts['frames_with_hands'] += 1
+        if result.used_roi:
+            counts['roi_frames'] += 1
+        if 'speed' in geometry['gestures']:
+            pinch_distances[result.sequence] = geometry['gestures']['speed'][1]
+        # Actuators run on their worker threads and are collected from their records below
+        stages['control'].append(control_end - received_time)
+        stages['glass_to_decision'].append(control_end - result.capture_time)
+    
+    for scheduler in schedulers:
+        scheduler.record = True
+        scheduler.start()
+    
+    app.frame_source = app.create_frame_source(clip, realtime=realtime)
+    app.processing_active = True
+    camera_thread = threading.Thread(target=app.camera_reader, daemon=True)
+    processor_thread = threading.Thread(target=app.hand_processor, daemon=True)
+    control_thread = threading.Thread(target=app.control_loop, daemon=True,
+                                      kwargs={'publish': render is not None, 'context': context,
+                                              'on_frame': frame_handled})
+    
+    if app.inference_workers > 0:
+        # Workers start and load their models before the clock starts, like the in-process model
+        pool = app.ensure_inference_pool()
+        probe = app.create_frame_source(clip, realtime=False)
+        ok, frame = probe.read() if probe.open() else (False, None)
+        probe.release()
+        if ok and pool.frame_shape != frame.shape:
+            pool.start(frame.shape)
+            pool.wait_ready()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    worker_cpu_start = app.inference_pool.worker_cpu_time if app.inference_pool is not None else 0.0
+    camera_thread.start()
+    processor_thread.start()
+    control_thread.start()
+    
+    try:
+        while control_thread.is_alive():
+            if not render:
+                control_thread.join(timeout=0.2)
+                continue
+            
+            # The display side of main(), showing every controlled frame (--display-fps 0)
+            slot = app.frame_ring.take('controlled', timeout=0.01)
+            if slot is None:
+                continue
+            try:
+                overlay_start = time.perf_counter()
+                app.draw_overlay(slot.frame, slot, slot.geometry, slot.target_volume)
+                display_start = time.perf_counter()
+                stages['overlay'].append(display_start - overlay_start)
+                if render == "window":
+                    cv2.imshow('AI Hand Controller', slot.frame)
+                    cv2.waitKey(1)
+                    stages['display'].append(time.perf_counter() - display_start)
+                stages['glass_to_display'].append(time.perf_counter() - slot.capture_time)
+            finally:
+                app.frame_ring.release(slot)
+    finally:
+        app.processing_active = False
+        control_thread.join(timeout=2.0)
+        camera_thread.join(timeout=2.0)
+        processor_thread.join(timeout=2.0)
+        for scheduler in schedulers:
+            scheduler.flush()
+            scheduler.stop()
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+        if app.inference_pool is not None:
+            # Include the CPU time of the inference worker processes
+            cpu_time += app.inference_pool.worker_cpu_time - worker_cpu_start
+    
+    completed = context.actuator_scheduler.completed + context.browser_scheduler.completed
+    for name, value, capture_time, post_time, start, end in completed:
+        stages['actuator'].append(end - start)
+        stages['actuator_queue_age'].append(start - post_time)
+        stages['glass_to_actuation'].append(start - capture_time)
+    
+    # Frame-to-frame pinch jitter: lower means steadier fingertip positions
+    pinch_steps = [abs(pinch_distances[seq] - pinch_distances[seq - 1])
+                   for seq in pinch_distances if seq - 1 in pinch_distances]
+    
+    frames = counts['frames']
+    return {
+        'clip': clip,
+        'inference_mode': inference_mode,
+        'render': render or "headless",
+        'frames': frames,
+        'detection_rate': round(counts['frames_with_hands'] / frames, 3) if frames else 0.0,
+        'roi_frames': counts['roi_frames'],
+        'pinch_jitter': round(float(np.mean(pinch_steps)), 5) if pinch_steps else None,
+        'pinch_distances': pinch_distances,
+        'wall_time_s': round(wall_time, 3),
+        'throughput_fps': round(frames / wall_time, 2) if wall_time > 0 else 0.0,
+        'cpu_time_s': round(cpu_time, 3),
+        'cpu_utilization': round(cpu_time / wall_time, 3) if wall_time > 0 else 0.0,
+        'actuations': {
+            'volume': sum(1 for event in stubs.events if event[0] == 'volume'),
+            'speed': sum(1 for event in stubs.events if event[0] == 'speed')
+        },
+        'stages': {name: latency_summary(samples) for name, samples in stages.items()}
+    }
+
+def compare_inference_modes(full_result, roi_result):
+    """Accuracy/latency trade-off of ROI crops against the downscaled full frame"""
+    common = [seq for seq in full_result['pinch_distances'] if seq in roi_result['pinch_distances']]
+    differences = [abs(full_result['pinch_distances'][seq] - roi_result['pinch_distances'][seq]) for seq in common]
+    full_inference = full_result['stages']['inference'].get('p50_ms')
+    roi_inference = roi_result['stages']['inference'].get('p50_ms')
+    return {
+        'inference_p50_ms': {'full': full_inference, 'roi': roi_inference},
+        'inference_speedup': round(full_inference / roi_inference, 3) if full_inference and roi_inference else None,
+        'glass_to_decision_p95_ms': {'full': full_result['stages']['glass_to_decision'].get('p95_ms'),
+                                     'roi': roi_result['stages']['glass_to_decision'].get('p95_ms')},
+        'detection_rate': {'full': full_result['detection_rate'], 'roi': roi_result['detection_rate']},
+        'pinch_jitter': {'full': full_result['pinch_jitter'], 'roi': roi_result['pinch_jitter']},
+        'pinch_mean_abs_difference': round(float(np.mean(differences)), 5) if differences else None,
+        'compared_frames': len(common)
+    }
+
+def run_benchmark(clips, output_path, realtime=False, inference_modes=("full",)):
+    """Benchmark every clip and write the results as JSON"""
+    results = {
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'realtime': realtime,
+        'clips': []
+    }
+    
+    for clip in clips:
+        mode_results = {}
+        for inference_mode in inference_modes:
+            print(f"\nBenchmarking {clip} ({'real-time' if realtime else 'as fast as possible'}, "
+                  f"{inference_mode} inference)...")
+            clip_result = benchmark_clip(clip, realtime=realtime, inference_mode=inference_mode)
+            mode_results[inference_mode] = clip_result
+            results['clips'].append(clip_result)
+            
+            print(f"  {clip_result['frames']} frames in {clip_result['wall_time_s']}s "
+                  f"-> {clip_result['throughput_fps']} fps, CPU {clip_result['cpu_utilization'] * 100:.0f}%")
+            print(f"  {'stage':<20}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+            for name, summary in clip_result['stages'].items():
+                if summary['count']:
+                    print(f"  {name:<20}{summary['p50_ms']:>10}{summary['p95_ms']:>10}{summary['p99_ms']:>10}")
+        
+        if 'full' in mode_results and 'roi' in mode_results:
+            comparison = compare_inference_modes(mode_results['full'], mode_results['roi'])
+            results.setdefault('comparisons', []).append({'clip': clip, **comparison})
+            print(f"  ROI vs full: inference p50 {comparison['inference_p50_ms']['roi']} ms vs "
+                  f"{comparison['inference_p50_ms']['full']} ms, pinch jitter {comparison['pinch_jitter']['roi']} vs "
+                  f"{comparison['pinch_jitter']['full']}, mean pinch difference {comparison['pinch_mean_abs_difference']}")
+    
+    if app.inference_pool is not None:
+        app.inference_pool.close()
+    
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nBenchmark results written to {output_path}")
+    return results
+
+def benchmark_headless(clips, output_path, realtime=True, inference_mode="full"):
+    """CPU and latency of the headless main loop against the windowed one (overlay + imshow) on the same clips
+
+    Without a display the windowed run draws the overlay but can't show it, which leaves out imshow's cost.
+    """
+    windowed = "window" if app.display_available() else "overlay"
+    results = {
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'realtime': realtime,
+        'windowed_render': windowed,
+        'clips': []
+    }
+    
+    # Model loading would otherwise land in whichever run comes first
+    app.hand_detector.mode = inference_mode
+    app.hand_detector.warm_up()
+    
+    for clip in clips:
+        runs = {}
+        for mode, render in (("windowed", windowed), ("headless", None)):
+            print(f"\nBenchmarking {clip} ({mode}, {'real-time' if realtime else 'as fast as possible'})...")
+            runs[mode] = benchmark_clip(clip, realtime=realtime, inference_mode=inference_mode, render=render)
+        if windowed == "window":
+            cv2.destroyAllWindows()
+        
+        comparison = {'clip': clip}
+        for key in ('cpu_time_s', 'cpu_utilization', 'throughput_fps'):
+            comparison[key] = {mode: run[key] for mode, run in runs.items()}
+        for stage in ('control', 'glass_to_decision', 'glass_to_actuation'):
+            comparison[f'{stage}_p50_ms'] = {mode: run['stages'][stage].get('p50_ms') for mode, run in runs.items()}
+            comparison[f'{stage}_p95_ms'] = {mode: run['stages'][stage].get('p95_ms') for mode, run in runs.items()}
+        windowed_cpu, headless_cpu = comparison['cpu_time_s']['windowed'], comparison['cpu_time_s']['headless']
+        comparison['cpu_saved'] = round(1 - headless_cpu / windowed_cpu, 3) if windowed_cpu else None
+        results['clips'].append({'comparison': comparison, 'runs': runs})
+        
+        print(f"  {'':<28}{'windowed':>12}{'headless':>12}")
+        print(f"  {'CPU utilization':<28}{comparison['cpu_utilization']['windowed']:>12}"
+              f"{comparison['cpu_utilization']['headless']:>12}")
+        print(f"  {'throughput fps':<28}{comparison['throughput_fps']['windowed']:>12}"
+              f"{comparison['throughput_fps']['headless']:>12}")
+        for stage in ('control', 'glass_to_decision', 'glass_to_actuation'):
+            for quantile in ('p50', 'p95'):
+                values = comparison[f'{stage}_{quantile}_ms']
+                print(f"  {stage + ' ' + quantile + ' ms':<28}{str(values['windowed']):>12}{str(values['headless']):>12}")
+        if comparison['cpu_saved'] is not None:
+            saved = comparison['cpu_saved']
+            print(f"  Headless uses {abs(saved) * 100:.1f}% {'less' if saved >= 0 else 'more'} CPU time")
+    
+    if app.inference_pool is not None:
+        app.inference_pool.close()
+    
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nBenchmark results written to {output_path}")
+    return results
@@ -0,0 +1,134 @@
+"""Overlay drawing cost: cached HUD sprites and the batched skeleton renderer"""
+import time
+import json
+import platform
+import cv2
+import numpy as np
+
+import Magic_Hand_AI as app
+from .common import latency_summary
+from .synthetic import synthetic_hands
+
+def draw_hud_scene(frame, renderer, step):
+    """The main loop's HUD with two hands, both bars and all labels, values changing like in use"""
+    h, w = frame.shape[:2]
+    volume = (step * 7) % 101
+    index = (step // 15) % len(app.speed_values)
+    speed = app.speed_values[index]
+    bar_y = (h - 200) // 2
+    
+    renderer.label(frame, "Left hand", (160, 245), size=0.5, thickness=1)
+    renderer.label(frame, "Right hand", (20 + step % 40, 5), size=0.5, thickness=1)  # Clipped at the frame edge
+    renderer.label(frame, f"{volume}%", (320, 150), size=0.6, thickness=2)
+    renderer.bar(frame, w - 50, bar_y, 30, 200, int(200 * (volume / 100)), (0, 255, 0))
+    renderer.label(frame, f"{volume}%", (w - 35, bar_y + 215), 0.5, 1)
+    renderer.label(frame, "Increase" if step % 20 < 10 else "Decrease", (w - 35, bar_y - 15), 0.5, 1)
+    renderer.label(frame, f"{speed}x", (200, 180), size=0.6, thickness=2)
+    renderer.bar(frame, 50, bar_y, 30, 200, int(200 * (index / (len(app.speed_values) - 1))), (255, 165, 0))
+    renderer.label(frame, f"{speed}x", (65, bar_y + 215), 0.5, 1)
+    renderer.label(frame, "▲", (65, bar_y - 15), 0.7, 2)
+    renderer.label(frame, "Speed up", (65, bar_y - 35), 0.5, 1)
+    renderer.text(frame, f"FPS: {28 + step % 5}", (w - 80, 20), 0.6, (255, 255, 255), 1)
+    renderer.text(frame, "Using Chrome", (10, 20), 0.5, (255, 255, 255), 1)
+    renderer.text(frame, "YouTube: Connected", (10, h - 10), 0.5, (0, 255, 0), 1)
+
+def benchmark_hud(output_path, frames=2000, size=(360, 640)):
+    """Per-frame HUD cost drawing directly vs from cached sprites, and how far apart their pixels are"""
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 256, (*size, 3), dtype=np.uint8)
+    renderers = {'direct': app.HudRenderer(), 'cached': app.CachedHudRenderer()}
+    frames_out = {name: np.empty_like(background) for name in renderers}
+    samples = {name: [] for name in renderers}
+    max_difference = 0
+    different_pixels = 0
+    
+    for step in range(frames):
+        for name, renderer in renderers.items():
+            frame = frames_out[name]
+            np.copyto(frame, background)
+            start = time.perf_counter()
+            draw_hud_scene(frame, renderer, step)
+            samples[name].append(time.perf_counter() - start)
+        difference = cv2.absdiff(frames_out['direct'], frames_out['cached'])
+        max_difference = max(max_difference, int(difference.max()))
+        different_pixels = max(different_pixels, int(np.count_nonzero(difference.max(axis=2))))
+    
+    cached = renderers['cached']
+    results = {'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'platform': platform.platform(),
+               'frame_size': list(size), 'frames': frames,
+               'max_pixel_difference': max_difference, 'max_different_pixels_per_frame': different_pixels,
+               'cache': {'hits': cached.hits, 'misses': cached.misses, 'sprites': len(cached.sprites)}}
+    print(f"\n{'renderer':<10}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name in renderers:
+        results[name] = latency_summary(samples[name])
+        print(f"{name:<10}{results[name]['mean_ms']:>10}{results[name]['p50_ms']:>10}{results[name]['p99_ms']:>10}")
+    results['speedup_p50'] = round(results['direct']['p50_ms'] / max(results['cached']['p50_ms'], 1e-6), 2)
+    print(f"Speedup (p50): {results['speedup_p50']}x, at most {different_pixels} pixels per frame differ "
+          f"by up to {max_difference} intensity levels")
+    
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"HUD benchmark results written to {output_path}")
+    return results
+
+def landmark_list_from_array(points):
+    """Rebuild a NormalizedLandmarkList from a (21, 3) array (mp_drawing only accepts protobufs)"""
+    from mediapipe.framework.formats import landmark_pb2
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in points.tolist():
+        landmark_list.landmark.add(x=x, y=y, z=z)
+    return landmark_list
+
+def benchmark_skeleton(output_path, frames=1000, size=(360, 640)):
+    """Per-frame cost of drawing two hand skeletons with mp_drawing vs SkeletonRenderer, and their pixel difference"""
+    solutions = app.load_mediapipe().solutions
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 256, (*size, 3), dtype=np.uint8)
+    landmark_style = solutions.drawing_styles.get_default_hand_landmarks_style()
+    connection_style = solutions.drawing_styles.get_default_hand_connections_style()
+    
+    def draw_mediapipe(frame, hands):
+        # What the main loop did before: one protobuf and one draw_landmarks call per hand
+        for landmarks in hands:
+            solutions.drawing_utils.draw_landmarks(frame, landmark_list_from_array(landmarks),
+                                                   solutions.hands.HAND_CONNECTIONS, landmark_style, connection_style)
+    
+    renderers = {'mediapipe': draw_mediapipe, 'full': app.SkeletonRenderer("full").draw,
+                 'reduced': app.SkeletonRenderer("reduced").draw}
+    frames_out = {name: np.empty_like(background) for name in renderers}
+    samples = {name: [] for name in renderers}
+    different_pixels = []
+    
+    for step in range(frames):
+        hands = synthetic_hands(step)
+        for name, draw in renderers.items():
+            frame = frames_out[name]
+            np.copyto(frame, background)
+            start = time.perf_counter()
+            draw(frame, hands)
+            samples[name].append(time.perf_counter() - start)
+        difference = cv2.absdiff(frames_out['mediapipe'], frames_out['full']).max(axis=2)
+        different_pixels.append(np.count_nonzero(difference))
+    
+    drawn_pixels = int(np.count_nonzero(cv2.absdiff(frames_out['mediapipe'], background).max(axis=2)))
+    results = {'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'platform': platform.platform(),
+               'frame_size': list(size), 'frames': frames, 'hands': 2,
+               'full_vs_mediapipe': {'mean_different_pixels': round(float(np.mean(different_pixels)), 1),
+                                     'max_different_pixels': int(max(different_pixels)),
+                                     'skeleton_pixels_last_frame': drawn_pixels}}
+    print(f"\n{'renderer':<12}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name in renderers:
+        results[name] = latency_summary(samples[name])
+        print(f"{name:<12}{results[name]['mean_ms']:>10}{results[name]['p50_ms']:>10}{results[name]['p99_ms']:>10}")
+    for name in ('full', 'reduced'):
+        results[f'speedup_p50_{name}'] = round(results['mediapipe']['p50_ms'] / max(results[name]['p50_ms'], 1e-6), 2)
+        results[f'saved_p50_ms_{name}'] = round(results['mediapipe']['p50_ms'] - results[name]['p50_ms'], 3)
+    print(f"Speedup (p50): {results['speedup_p50_full']}x full, {results['speedup_p50_reduced']}x reduced, "
+          f"{results['saved_p50_ms_full']} / {results['saved_p50_ms_reduced']} ms less per frame; "
+          f"full differs from mediapipe in {results['full_vs_mediapipe']['mean_different_pixels']} pixels per frame "
+          f"on average (skeleton covers about {drawn_pixels})")
+    
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Skeleton benchmark results written to {output_path}")
+    return results
@@ -0,0 +1,39 @@
+"""Synthetic hand landmarks for the benchmarks and tests"""
+import numpy as np
+
+# Open right hand in normalized image coordinates (wrist at the bottom)
+SYNTHETIC_HAND_POSE = np.array([
+    (0.50, 0.80), (0.43, 0.75), (0.38, 0.68), (0.35, 0.61), (0.32, 0.55),
+    (0.45, 0.58), (0.44, 0.48), (0.435, 0.42), (0.43, 0.37),
+    (0.50, 0.57), (0.50, 0.46), (0.50, 0.39), (0.50, 0.33),
+    (0.55, 0.59), (0.56, 0.49), (0.565, 0.43), (0.57, 0.38),
+    (0.60, 0.62), (0.62, 0.55), (0.63, 0.50), (0.64, 0.46),
+], dtype=np.float32)
+
+def synthetic_hands(step):
+    """(2, 21, 3) landmarks of two hands moving around the frame, the second one partly leaving it at times"""
+    angle = step * 0.05
+    hands = np.zeros((2, 21, 3), dtype=np.float32)
+    offsets = ((-0.22 + 0.05 * np.cos(angle), 0.05 * np.sin(angle)),
+               (0.2 + 0.25 * np.sin(angle * 0.7), 0.15 * np.cos(angle)))
+    for hand, offset in enumerate(offsets):
+        hands[hand, :, :2] = SYNTHETIC_HAND_POSE + offset
+    hands[1, :, 0] = 1.0 - hands[1, :, 0]  # Mirrored, like a left hand
+    return hands
+
+def synthetic_landmark_track(fps, duration=5.0, noise=0.004, timestamp_jitter=0.0, seed=0):
+    """Smoothly moving (2, 21, 3) landmarks with detector-like noise, sampled at `fps` -> (times, truth, measured)"""
+    rng = np.random.default_rng(seed)
+    shape = (2, 21, 3)
+    # The motion itself does not depend on the seed's sampling, only on the channel parameters
+    motion = np.random.default_rng(1234)
+    frequency = motion.uniform(0.2, 1.5, shape)
+    amplitude = motion.uniform(0.05, 0.2, shape)
+    phase = motion.uniform(0, 2 * np.pi, shape)
+
+    times = np.arange(0.0, duration, 1.0 / fps)
+    times = times + rng.uniform(-timestamp_jitter, timestamp_jitter, len(times))
+    times.sort()
+    truth = 0.5 + amplitude * np.sin(2 * np.pi * frequency * times[:, None, None, None] + phase)
+    measured = truth + rng.normal(0.0, noise, truth.shape)
+    return times, truth, measured
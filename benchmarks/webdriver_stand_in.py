@@ -0,0 +1,116 @@
+"""Local stand-in WebDriver server that behaves like a browser showing a <video>"""
+import time
+import json
+import threading
+import http.server
+
+class StandInWebDriverHandler(http.server.BaseHTTPRequestHandler):
+    """Minimal W3C WebDriver endpoint that acts like a browser showing a <video>, for testing the browser channel
+
+    Server attributes: latency (seconds added to every command), drop_after (end every session after this many
+    speed commands, like a crashed browser), speeds (speeds received, in order).
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes, don't wait for delayed ACKs
+    ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+    def _reply(self, value, status=200):
+        body = json.dumps({'value': value}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, error, message):
+        self._reply({'error': error, 'message': message, 'stacktrace': ""}, status)
+
+    def _session(self, parts):
+        with self.server.lock:
+            session = self.server.sessions.get(parts[1]) if len(parts) > 1 else None
+        if session is None:
+            self._error(404, "invalid session id", "session deleted or browser closed")
+        return session
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._reply({'ready': True, 'message': "stand-in"})
+        else:
+            self._error(404, "unknown command", self.path)
+
+    def do_DELETE(self):
+        parts = self.path.strip("/").split("/")
+        with self.server.lock:
+            self.server.sessions.pop(parts[1] if len(parts) > 1 else None, None)
+        self._reply(None)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        parts = self.path.strip("/").split("/")
+        time.sleep(self.server.latency)
+
+        if parts == ["session"]:
+            with self.server.lock:
+                self.server.session_count += 1
+                session_id = f"stand-in-{self.server.session_count}"
+                self.server.sessions[session_id] = {'injected': False, 'speed': 1.0}
+            self._reply({'sessionId': session_id, 'capabilities': {'browserName': "chrome"}})
+            return
+
+        session = self._session(parts)
+        if session is None:
+            return
+        command = "/".join(parts[2:])
+        if command == "url":
+            session['injected'] = False  # New page, the controller script is gone
+            self._reply(None)
+        elif command == "element":
+            self._reply({self.ELEMENT_KEY: "video"})
+        elif command == "elements":
+            self._reply([])
+        elif command == "execute/sync":
+            self._execute(session, payload.get('script', ""), payload.get('args', []))
+        else:
+            self._error(404, "unknown command", command)
+
+    def _execute(self, session, script, args):
+        if "typeof window.setYouTubeSpeed" in script:
+            self._reply("function" if session['injected'] else "undefined")
+        elif "ai-speed-controller" in script:
+            session['injected'] = True
+            self._reply(None)
+        elif "setYouTubeSpeed.apply" in script:
+            if not session['injected']:
+                self._error(500, "javascript error", "window.setYouTubeSpeed is not a function")
+                return
+            session['speed'] = float(args[0])
+            with self.server.lock:
+                self.server.speeds.append(session['speed'])
+                if self.server.drop_after and len(self.server.speeds) % self.server.drop_after == 0:
+                    self.server.sessions.clear()  # Browser "crashed" after answering this command
+            self._reply(True)
+        elif "!!document.querySelector('video')" in script or "document.readyState" in script:
+            self._reply(True)
+        elif ".paused" in script:
+            self._reply(True)  # "!video.paused": the video plays
+        elif "playbackRate" in script:
+            self._reply(session['speed'])
+        else:
+            self._reply(None)
+
+    def log_message(self, format, *args):
+        pass  # Keep the console clean
+
+def start_stand_in_webdriver(latency=0.02, drop_after=0):
+    """Run a StandInWebDriverHandler server on a free local port (background thread), return the server"""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInWebDriverHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.drop_after = drop_after
+    server.lock = threading.Lock()
+    server.sessions = {}
+    server.session_count = 0
+    server.speeds = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,113 @@
+"""ActuatorScheduler worker on an injected clock: latest wins, rate limit, debounce and retry backoff"""
+import time
+
+import pytest
+
+import Magic_Hand_AI as app
+
+class Clock:
+    """Scheduler clock that only moves when the test advances it"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+@pytest.fixture
+def scheduler(clock):
+    scheduler = app.ActuatorScheduler(registry=app.MetricsRegistry())
+    scheduler.clock = clock
+    yield scheduler
+    scheduler.stop()
+
+def advance(scheduler, clock, seconds):
+    """Move the clock and wake the worker, like time passing while it waits"""
+    with scheduler.condition:
+        clock.now += seconds
+        scheduler.condition.notify_all()
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "worker did not get there in time"
+        time.sleep(0.001)
+
+def settle():
+    """Give the worker the chance to (wrongly) call a handler that isn't due yet"""
+    time.sleep(0.05)
+
+def recorder(clock, failures=0):
+    """Handler that records (clock time, value) and raises for the first `failures` calls"""
+    calls = []
+
+    def handler(value):
+        calls.append((clock.now, value))
+        if len(calls) <= failures:
+            raise RuntimeError("actuator unavailable")
+    return handler, calls
+
+def test_latest_value_wins(scheduler, clock):
+    handler, calls = recorder(clock)
+    action = scheduler.register('volume', handler)
+    for value in (10, 20, 30):
+        scheduler.post('volume', value)
+    scheduler.start()
+    wait_for(lambda: calls)
+    settle()
+    assert calls == [(0.0, 30)]
+    assert action.coalesced.value == 2
+
+    scheduler.post('volume', 30)  # Already applied: nothing to do
+    settle()
+    assert calls == [(0.0, 30)]
+
+def test_min_interval_spaces_the_calls(scheduler, clock):
+    handler, calls = recorder(clock)
+    scheduler.register('volume', handler, min_interval=0.5)
+    scheduler.start()
+    scheduler.post('volume', 10)
+    wait_for(lambda: len(calls) == 1)
+
+    advance(scheduler, clock, 0.25)
+    scheduler.post('volume', 20)
+    settle()
+    assert len(calls) == 1
+    advance(scheduler, clock, 0.25)
+    wait_for(lambda: len(calls) == 2)
+    assert calls == [(0.0, 10), (0.5, 20)]
+
+def test_debounce_waits_for_the_value_to_hold(scheduler, clock):
+    handler, calls = recorder(clock)
+    scheduler.register('speed', handler, debounce=0.5)
+    scheduler.start()
+    scheduler.post('speed', 1.25)
+    advance(scheduler, clock, 0.25)
+    scheduler.post('speed', 1.5)  # Changed before it held: the hold starts again
+    advance(scheduler, clock, 0.25)
+    scheduler.post('speed', 1.5)  # Same value: keeps the running hold
+    settle()
+    assert calls == []
+    advance(scheduler, clock, 0.25)
+    wait_for(lambda: calls)
+    assert calls == [(0.75, 1.5)]
+
+def test_failed_calls_are_retried_with_backoff(scheduler, clock):
+    handler, calls = recorder(clock, failures=3)
+    action = scheduler.register('speed', handler, retry_delay=0.5, max_retry_delay=1.0)
+    scheduler.start()
+    scheduler.post('speed', 2.0)
+    wait_for(lambda: len(calls) == 1)
+
+    # 0.5s, then doubled to 1.0s, then capped at max_retry_delay
+    for step, expected_calls in ((0.25, 1), (0.25, 2), (0.5, 2), (0.5, 3), (1.0, 4)):
+        advance(scheduler, clock, step)
+        wait_for(lambda: len(calls) >= expected_calls)
+        settle()
+        assert len(calls) == expected_calls
+    assert calls == [(0.0, 2.0), (0.5, 2.0), (1.5, 2.0), (2.5, 2.0)]
+    assert action.failed.value == 3 and action.applied.value == 1
+    assert scheduler.flush() and action.failures == 0
@@ -0,0 +1,105 @@
+"""Autotuner scoring: speed filter prediction switch and labelled recordings"""
+import json
+import types
+
+import numpy as np
+import pytest
+
+import Magic_Hand_AI as app
+from benchmarks.synthetic import SYNTHETIC_HAND_POSE
+
+LABELS = {'volume': [[0.0, 40], [1.0, 78]], 'speed': [[4.0, 1.0], [5.0, 1.75]]}
+
+def labelled_records(count=240, fps=30):
+    """Both index fingers moving apart between 1 and 2 s, then only the left hand opening between 5 and 6 s"""
+    records = np.zeros(count, dtype=app.RECORDING_DTYPE)
+    for number, record in enumerate(records):
+        now = number / fps
+        record['sequence'] = number
+        record['capture_time'] = 100.0 + now
+        record['scores'] = 0.9
+        if number < count // 2:
+            record['num_hands'] = 2
+            record['handedness'] = [0, 1]
+            gap = np.interp(now, [1.0, 2.0], [0.2, 0.4])
+            for hand, side in enumerate((-1, 1)):
+                record['landmarks'][hand, :, :2] = SYNTHETIC_HAND_POSE - SYNTHETIC_HAND_POSE[8] + (0.5 + side * gap / 2, 0.4)
+        else:
+            record['num_hands'] = 1
+            record['handedness'] = [0, -1]
+            pose = SYNTHETIC_HAND_POSE.copy()
+            pose[4] = pose[8] + (np.interp(now, [5.0, 6.0], [0.10, 0.22]), 0.0)
+            record['landmarks'][0, :, :2] = pose
+    return records
+
+@pytest.fixture
+def control_settings():
+    """Restore the filter and controller options the tests change"""
+    saved = (dict(app.speed_filter_options), dict(app.volume_filter_options),
+             {name: getattr(app.speed_controller, name)
+              for name in ('step_distance', 'dead_band', 'hysteresis', 'max_step_rate')})
+    yield
+    app.speed_filter_options.update(saved[0])
+    app.volume_filter_options.update(saved[1])
+    for name, value in saved[2].items():
+        setattr(app.speed_controller, name, value)
+    app.autotune_recordings = []
+    app.reset_control_state()
+
+def test_speed_filter_predict_is_explicit():
+    values = [0.1, 0.12, 0.15, 0.19]
+    predicting = app.AdvancedSmoothFilter(responsiveness=0.3, predict=True)
+    filtering = app.AdvancedSmoothFilter(responsiveness=0.9, predict=False)
+    reference = app.AdvancedSmoothFilter(responsiveness=0.9)
+    for value in values:
+        predicted, filtered = predicting.update(value), filtering.update(value)
+        assert filtered == reference.update(value) == filtering.value
+    assert predicted > predicting.value  # Ahead of the filtered value while the distance grows
+
+def test_score_actuation_labels():
+    events, stats = app.replay_landmarks(labelled_records())
+    labels = {actuator: sorted(map(tuple, targets)) for actuator, targets in LABELS.items()}
+    delays, overshoot, spurious = app.score_actuation_labels(events, labels, stats['duration_s'])
+    # Volume: 40 right away, 78 a second after the fingers start moving apart. Speed: the first left-hand frame
+    # steps down (away from the 1.0x target), 1.75x is never reached before the end
+    assert delays == pytest.approx([0.0, 1.0, 0.0, stats['duration_s'] - 5.0], abs=1e-6)
+    assert overshoot == 0
+    assert spurious == 1
+
+def test_score_counts_overshoot_and_moving_away():
+    events = [{'time': 1.0, 'actuator': 'volume', 'value': 70},
+              {'time': 1.1, 'actuator': 'volume', 'value': 85},   # Past 70 + tolerance
+              {'time': 1.2, 'actuator': 'volume', 'value': 72},
+              {'time': 1.3, 'actuator': 'volume', 'value': 60}]   # Away from the target after reaching it
+    delays, overshoot, spurious = app.score_actuation_labels(events, {'volume': [(0.5, 70)]}, 2.0)
+    assert delays == pytest.approx([0.5])
+    assert overshoot == 1
+    assert spurious == 2
+
+def test_recordings_are_scored_through_replay(tmp_path, control_settings):
+    path = tmp_path / "session.mhl"
+    recorder = app.LandmarkRecorder(str(path)).start()
+    for record in labelled_records():
+        recorder.record(types.SimpleNamespace(sequence=record['sequence'], capture_time=record['capture_time'],
+                                              num_hands=record['num_hands'], used_roi=False,
+                                              handedness=record['handedness'], hand_scores=record['scores'],
+                                              hand_landmarks=record['landmarks']))
+    recorder.close()
+    (tmp_path / "session.mhl.labels.json").write_text(json.dumps(LABELS))
+
+    options = vars(app.parse_arguments([]))
+    without_recordings = app.score_control_settings(options, seeds=(0,))
+    app.load_autotune_recordings([str(path)], options)
+    with_recordings = app.score_control_settings(options, seeds=(0,))
+    assert with_recordings['spurious'] == without_recordings['spurious'] + 1
+    assert with_recordings['latency_ms'] != without_recordings['latency_ms']
+    
+    # A slower volume filter reaches the labelled volume later
+    slow = app.score_control_settings(dict(options, volume_filter_alpha=0.05, volume_filter_min_alpha=0.05,
+                                           volume_filter_max_alpha=0.05), seeds=(0,))
+    assert slow['latency_ms'] > with_recordings['latency_ms']
+
+def test_unknown_label(tmp_path):
+    (tmp_path / "session.mhl.labels.json").write_text(json.dumps({'brightness': [[0.0, 1]]}))
+    with pytest.raises(ValueError):
+        app.load_recording_labels(str(tmp_path / "session.mhl"))
@@ -0,0 +1,82 @@
+"""Cached function handles of the Playwright and DevTools backends: resolved again only when they went stale"""
+import pytest
+
+import Magic_Hand_AI as app
+
+STALE = "Execution context was destroyed, most likely because of a navigation"
+
+class Handle:
+    """Stands in for a Playwright JSHandle, raises the queued errors, then returns the call's arguments"""
+    def __init__(self, errors):
+        self.errors = errors
+        self.calls = 0
+
+    async def evaluate(self, expression, args):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return args
+
+class Page:
+    def __init__(self):
+        self.errors = []
+        self.handles = []
+
+    async def evaluate_handle(self, expression):
+        self.handles.append(Handle(self.errors))
+        return self.handles[-1]
+
+@pytest.fixture
+def playwright():
+    backend = app.PlaywrightBackend()
+    backend.command_errors = (RuntimeError, TimeoutError)  # Set by _launch, which needs Playwright itself
+    backend.page = Page()
+    yield backend
+    backend.loop.call_soon_threadsafe(backend.loop.stop)
+
+def test_playwright_stale_handle_is_resolved_again(playwright):
+    assert playwright.call("setYouTubeSpeed", 1.5) == [1.5]
+    playwright.page.errors.append(RuntimeError(STALE))
+    assert playwright.call("setYouTubeSpeed", 2.0) == [2.0]
+    assert [handle.calls for handle in playwright.page.handles] == [2, 1]
+
+def test_playwright_script_error_is_raised_once(playwright):
+    playwright.call("setYouTubeSpeed", 1.5)
+    playwright.page.errors.append(RuntimeError("Error: no video element"))
+    with pytest.raises(RuntimeError, match="no video element"):
+        playwright.call("setYouTubeSpeed", 2.0)
+    assert [handle.calls for handle in playwright.page.handles] == [2]  # Not sent a second time
+
+def devtools_backend(monkeypatch, replies):
+    """DevToolsBackend whose callFunctionOn replies come from the list (then a plain result), no browser"""
+    backend = app.DevToolsBackend()
+    calls = []
+
+    def command(method, params=None, timeout=15.0):
+        calls.append(method)
+        if method == "Runtime.evaluate":
+            return {'result': {'type': "function", 'objectId': f"function-{len(calls)}"}}
+        reply = replies.pop(0) if replies else {'result': {'value': params['arguments'][0]['value']}}
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+    monkeypatch.setattr(backend, "command", command)
+    return backend, calls
+
+def test_devtools_stale_object_is_resolved_again(monkeypatch):
+    replies = []
+    backend, calls = devtools_backend(monkeypatch, replies)
+    assert backend.call("setYouTubeSpeed", 1.5) == 1.5
+    replies.append(RuntimeError("Runtime.callFunctionOn: Could not find object with given id"))
+    assert backend.call("setYouTubeSpeed", 2.0) == 2.0
+    assert calls == ["Runtime.evaluate", "Runtime.callFunctionOn", "Runtime.callFunctionOn",
+                     "Runtime.evaluate", "Runtime.callFunctionOn"]
+
+def test_devtools_script_error_is_raised_once(monkeypatch):
+    replies = []
+    backend, calls = devtools_backend(monkeypatch, replies)
+    backend.call("setYouTubeSpeed", 1.5)
+    replies.append({'exceptionDetails': {'text': "Uncaught", 'exception': {'description': "Error: no video element"}}})
+    with pytest.raises(RuntimeError, match="no video element"):
+        backend.call("setYouTubeSpeed", 2.0)
+    assert calls == ["Runtime.evaluate", "Runtime.callFunctionOn", "Runtime.callFunctionOn"]
@@ -0,0 +1,88 @@
+"""Browser worker handlers against the stand-in WebDriver server"""
+import pytest
+
+pytest.importorskip("selenium")
+
+import Magic_Hand_AI as app
+from benchmarks.webdriver_stand_in import start_stand_in_webdriver
+
+@pytest.fixture
+def server(monkeypatch):
+    """Stand-in WebDriver with the controller injected into the page, like after setup_selenium"""
+    server = start_stand_in_webdriver(latency=0)
+    settings = {'browser_type': "chrome", 'remote_url': f"http://127.0.0.1:{server.server_address[1]}"}
+    monkeypatch.setattr(app, "browser_backend", "selenium")
+    monkeypatch.setattr(app, "browser_settings", settings)
+    monkeypatch.setattr(app, "video_url", "about:blank")
+    monkeypatch.setattr(app, "browser", app.create_browser(settings))
+    app.browser.open(app.video_url)
+    assert app.inject_controller_script()
+    monkeypatch.setattr(app, "selenium_active", True)
+    yield server
+    app.browser.close()
+    server.shutdown()
+    server.server_close()
+
+def session(server):
+    """The one live session of the stand-in browser"""
+    (state,) = server.sessions.values()
+    return state
+
+def test_send_youtube_speed(server):
+    app.send_youtube_speed(1.5)
+    app.send_youtube_speed(2.0)
+    assert server.speeds == [1.5, 2.0]
+    assert session(server)['speed'] == 2.0
+    assert app.selenium_active
+
+def test_send_youtube_speed_after_reload_reinjects(server):
+    session(server)['injected'] = False  # Page reloaded, the controller is gone
+    with pytest.raises(ConnectionError):
+        app.send_youtube_speed(1.5)
+    assert not app.selenium_active
+    
+    # The retry reconnects: same session, controller put back
+    app.send_youtube_speed(1.5)
+    assert server.session_count == 1
+    assert server.speeds == [1.5]
+    assert app.selenium_active
+
+def test_reconnect_browser_relaunches_crashed_session(server):
+    reconnects = app.BROWSER_RECONNECTS.value
+    server.sessions.clear()  # Browser crashed
+    assert app.reconnect_browser()
+    assert server.session_count == 2
+    assert session(server)['injected']
+    assert app.BROWSER_RECONNECTS.value == reconnects + 1
+    
+    app.send_youtube_speed(0.75)
+    assert server.speeds == [0.75]
+
+def test_reconnect_browser_without_settings(server, monkeypatch):
+    server.sessions.clear()
+    monkeypatch.setattr(app, "browser_settings", None)
+    assert not app.reconnect_browser()
+
+def test_check_browser_health_reinjects_controller(server):
+    reinjections = app.CONTROLLER_REINJECTIONS.value
+    app.check_browser_health(0.0)
+    assert app.CONTROLLER_REINJECTIONS.value == reinjections  # Healthy page, nothing to do
+    
+    session(server)['injected'] = False
+    app.check_browser_health(0.0)
+    assert session(server)['injected']
+    assert app.CONTROLLER_REINJECTIONS.value == reinjections + 1
+    assert server.session_count == 1
+
+def test_check_browser_health_reconnects_crashed_session(server):
+    server.sessions.clear()
+    app.check_browser_health(0.0)
+    assert server.session_count == 2
+    assert app.selenium_active
+
+def test_check_browser_health_unreachable(server, monkeypatch):
+    server.sessions.clear()
+    monkeypatch.setattr(app, "browser_settings", None)
+    with pytest.raises(ConnectionError):
+        app.check_browser_health(0.0)
+    assert not app.selenium_active
@@ -0,0 +1,97 @@
+"""FilterBank smoothing and the per-side landmark filtering of processed frames"""
+import numpy as np
+import pytest
+
+import Magic_Hand_AI as app
+
+def step_response(bank, seconds=2.0, fps=30, target=1.0):
+    """Start every channel at 0, then measure `target` at `fps` -> filtered values of each frame"""
+    bank.update(np.zeros(bank.shape), 0.0)
+    return [bank.update(np.full(bank.shape, target), frame / fps) for frame in range(1, int(seconds * fps) + 1)]
+
+@pytest.mark.parametrize("model", app.FilterBank.MODELS)
+def test_converges_to_a_constant(model):
+    filtered = step_response(app.FilterBank(3, model=model, beta=0.0, measurement_noise=1e-3))
+    assert 0.0 < filtered[0][0] < 1.0  # Smoothed, not taken as is
+    np.testing.assert_allclose(filtered[-1], 1.0, atol=1e-3)
+
+def test_kalman_follows_constant_velocity():
+    bank = app.FilterBank(1, model="kalman", process_noise=1.0, measurement_noise=1e-3)
+    for frame in range(61):
+        bank.update([0.5 * frame / 30], frame / 30)
+    assert bank.value[0] == pytest.approx(1.0, abs=1e-3)
+    assert bank.velocity[0] == pytest.approx(0.5, abs=1e-2)
+
+def test_parameters_per_channel():
+    bank = app.FilterBank(2, min_cutoff=[0.5, 5.0], beta=0.0)
+    first = step_response(bank, seconds=1 / 30)[0]
+    assert first[0] < first[1]  # The lower cutoff smooths more
+
+def test_mask_leaves_other_channels_alone():
+    bank = app.FilterBank(2, beta=0.0)
+    bank.update([0.0, 0.0], 0.0)
+    filtered = bank.update([1.0, 1.0], 0.1, mask=[True, False])
+    assert 0.0 < filtered[0] < 1.0
+    assert filtered[1] == 1.0  # Passed through, not filtered
+    assert bank.value[1] == 0.0 and bank.last_time[1] == 0.0
+
+    # The skipped channel continues from its old state
+    filtered = bank.update([1.0, 1.0], 0.2)
+    assert 0.0 < filtered[1] < filtered[0]
+
+def test_reset_takes_the_next_measurement_as_is():
+    bank = app.FilterBank(2, beta=0.0)
+    bank.update([0.0, 0.0], 0.0)
+    bank.reset([True, False])
+    filtered = bank.update([1.0, 1.0], 0.1)
+    assert filtered[0] == 1.0 and 0.0 < filtered[1] < 1.0
+
+    bank.reset()
+    np.testing.assert_array_equal(bank.update([2.0, 3.0], 0.2), [2.0, 3.0])
+
+def test_repeated_timestamp_keeps_the_state():
+    bank = app.FilterBank(1, model="kalman")
+    bank.update([0.0], 1.0)
+    bank.update([1.0], 1.0)
+    assert bank.value[0] == 0.0 and bank.velocity[0] == 0.0
+
+LEFT, RIGHT = 0, 1
+
+def hand(x):
+    """(21, 3) landmarks of a hand around x"""
+    return np.full((21, 3), (x, 0.5, 0.0), dtype=np.float32)
+
+def frame(capture_time, hands):
+    """Processed slot with the (side, landmarks) hands in detection order"""
+    slot = app.FrameSlot(0)
+    slot.capture_time = capture_time
+    slot.num_hands = len(hands)
+    for index, (side, landmarks) in enumerate(hands):
+        slot.handedness[index] = side
+        slot.hand_landmarks[index] = landmarks
+    return slot
+
+@pytest.fixture
+def landmark_filter(monkeypatch):
+    monkeypatch.setattr(app, "landmark_filter", app.create_landmark_filter("one_euro", beta=0.0))
+    return app.landmark_filter
+
+def test_hands_are_filtered_by_side(landmark_filter):
+    first = frame(0.0, [(RIGHT, hand(0.8)), (LEFT, hand(0.2))])
+    app.smooth_hand_landmarks(first)
+    np.testing.assert_allclose(landmark_filter.value[LEFT], hand(0.2))
+    np.testing.assert_allclose(landmark_filter.value[RIGHT], hand(0.8))
+
+    # Detected the other way round: each hand still continues from its own side's state
+    second = frame(0.1, [(LEFT, hand(0.3)), (RIGHT, hand(0.7))])
+    app.smooth_hand_landmarks(second)
+    left_x, right_x = second.hand_landmarks[0, 0, 0], second.hand_landmarks[1, 0, 0]
+    assert 0.2 < left_x < 0.3
+    assert 0.7 < right_x < 0.8
+
+def test_hand_that_left_the_view_starts_fresh(landmark_filter):
+    app.smooth_hand_landmarks(frame(0.0, [(LEFT, hand(0.2)), (RIGHT, hand(0.8))]))
+    app.smooth_hand_landmarks(frame(0.1, [(RIGHT, hand(0.8))]))
+    back = frame(0.2, [(RIGHT, hand(0.8)), (LEFT, hand(0.4))])
+    app.smooth_hand_landmarks(back)
+    np.testing.assert_allclose(back.hand_landmarks[1], hand(0.4))  # Not blended with where it left
@@ -0,0 +1,84 @@
+"""FrameRing: latest-wins hand-off between stages, slot recycling and stale frame drops"""
+import threading
+import time
+
+import pytest
+
+import Magic_Hand_AI as app
+
+SIZE = 4
+
+@pytest.fixture
+def ring():
+    return app.FrameRing(size=SIZE)
+
+def pending(ring):
+    return sum(slot is not None for slot in ring.pending.values())
+
+def captured(ring, age=0.0):
+    """Acquire a slot captured `age` seconds ago"""
+    slot = ring.acquire(timeout=0)
+    slot.capture_time = time.perf_counter() - age
+    return slot
+
+def test_latest_frame_wins(ring):
+    dropped = app.Counter("dropped", "")
+    first, second = captured(ring), captured(ring)
+    ring.publish(first, 'captured', drop_counter=dropped)
+    ring.publish(second, 'captured', drop_counter=dropped)
+    assert dropped.value == 1
+    assert len(ring.free) == SIZE - 1 and pending(ring) == 1  # The replaced frame is free again
+
+    assert ring.take('captured', timeout=0) is second
+    assert ring.take('captured', timeout=0) is None
+    assert len(ring.free) == SIZE - 1 and pending(ring) == 0
+
+def test_slots_are_recycled(ring):
+    slots = [captured(ring) for _ in range(SIZE)]
+    assert ring.acquire(timeout=0) is None
+
+    slots[0].end_of_input = True
+    ring.publish(slots[0], 'processed')
+    assert ring.take('processed', timeout=0) is slots[0]
+    ring.release(slots[0])
+    assert len(ring.free) == 1
+    slot = ring.acquire(timeout=0)
+    assert slot is slots[0] and not slot.end_of_input
+
+    for slot in slots:
+        ring.release(slot)
+    assert len(ring.free) == SIZE and len({id(slot) for slot in ring.free}) == SIZE
+
+def test_publish_waits_for_the_pending_frame(ring, monkeypatch):
+    monkeypatch.setattr(app, "processing_active", True)
+    first, second = captured(ring), captured(ring)
+    ring.publish(first, 'captured')
+    publisher = threading.Thread(target=ring.publish, args=(second, 'captured'), kwargs={'wait': True})
+    publisher.start()
+    publisher.join(timeout=0.2)
+    assert publisher.is_alive()  # Nothing dropped while the stage hasn't taken the first frame
+
+    assert ring.take('captured', timeout=0) is first
+    publisher.join(timeout=2.0)
+    assert ring.take('captured', timeout=0) is second
+
+def test_stale_frames_are_dropped(ring):
+    ring.max_age = 0.5
+    stale = app.FRAMES_STALE['processed'].value
+
+    ring.publish(captured(ring, age=1.0), 'processed')
+    assert ring.take('processed', timeout=0.01) is None
+    assert app.FRAMES_STALE['processed'].value == stale + 1
+    assert len(ring.free) == SIZE and pending(ring) == 0  # Straight back to the free list
+
+    fresh = captured(ring)
+    ring.publish(fresh, 'processed')
+    assert ring.take('processed', timeout=0) is fresh
+
+    # The end of the input always gets through
+    end = captured(ring, age=1.0)
+    end.end_of_input = True
+    ring.publish(end, 'processed')
+    assert ring.take('processed', timeout=0) is end
+    assert app.FRAMES_STALE['processed'].value == stale + 1
+    assert len(ring.free) == SIZE - 2
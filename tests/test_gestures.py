@@ -0,0 +1,102 @@
+"""Gesture registry against geometry worked out by hand"""
+import math
+
+import numpy as np
+import pytest
+
+import Magic_Hand_AI as app
+from benchmarks.synthetic import SYNTHETIC_HAND_POSE
+
+W, H = 640, 360
+LEFT, RIGHT = 0, 1
+
+def open_hand(shift=(0.0, 0.0), scale=1.0, mirrored=False):
+    """(21, 3) landmarks of an open hand, scaled around its wrist"""
+    points = SYNTHETIC_HAND_POSE.copy()
+    points = points[app.WRIST] + scale * (points - points[app.WRIST]) + shift
+    if mirrored:
+        points[:, 0] = 1.0 - points[:, 0]
+    hand = np.zeros((21, 3), dtype=np.float32)
+    hand[:, :2] = points
+    return hand
+
+LEFT_HAND = open_hand(shift=(-0.2, 0.0))
+RIGHT_HAND = open_hand(shift=(-0.15, 0.05), scale=0.6, mirrored=True)
+
+def distance(a, b):
+    """Distance between two normalized landmarks in frame widths"""
+    return math.hypot(a[0] - b[0], (a[1] - b[1]) * H / W)
+
+def angle(a, b, c):
+    """Angle a-b-c in degrees, measured in pixels"""
+    u = ((a[0] - b[0]) * W, (a[1] - b[1]) * H)
+    v = ((c[0] - b[0]) * W, (c[1] - b[1]) * H)
+    cosine = (u[0] * v[0] + u[1] * v[1]) / (math.hypot(*u) * math.hypot(*v))
+    return math.degrees(math.acos(cosine))
+
+def fired(hands, sides, registry=None):
+    """Gestures that fire for the hands (in detection order) and their sides"""
+    landmarks = np.zeros((app.MAX_HANDS, 21, 3), dtype=np.float32)
+    handedness = np.full(app.MAX_HANDS, -1, dtype=np.int8)
+    for index, (hand, side) in enumerate(zip(hands, sides)):
+        landmarks[index], handedness[index] = hand, side
+    return (registry or app.gesture_registry).evaluate(landmarks, handedness, len(hands), W, H)[1]
+
+def test_no_hands_fire_nothing():
+    assert fired([], []) == {}
+
+def test_one_left_hand_controls_speed():
+    gestures = fired([LEFT_HAND], [LEFT])
+    assert list(gestures) == ['speed']
+    hand, value = gestures['speed']
+    assert hand == 0
+    assert value == pytest.approx(distance(LEFT_HAND[app.THUMB_TIP], LEFT_HAND[app.INDEX_TIP]), rel=1e-5)
+
+def test_one_right_hand_fires_nothing():
+    assert fired([RIGHT_HAND], [RIGHT]) == {}
+
+@pytest.mark.parametrize("order", [(LEFT, RIGHT), (RIGHT, LEFT)])
+def test_two_hands_control_volume_and_speed(order):
+    hands = {LEFT: LEFT_HAND, RIGHT: RIGHT_HAND}
+    gestures = fired([hands[side] for side in order], order)
+    assert set(gestures) == {'volume', 'speed'}
+
+    volume = distance(LEFT_HAND[app.INDEX_TIP], RIGHT_HAND[app.INDEX_TIP])
+    assert gestures['volume'][1] == pytest.approx(volume, rel=1e-5)
+    # Speed follows the left hand wherever the detector lists it
+    hand, value = gestures['speed']
+    assert hand == order.index(LEFT)
+    assert value == pytest.approx(distance(LEFT_HAND[app.THUMB_TIP], LEFT_HAND[app.INDEX_TIP]), rel=1e-5)
+
+def test_last_matching_hand_gives_the_value():
+    second = open_hand(shift=(0.2, 0.0), scale=0.8)
+    hand, value = fired([LEFT_HAND, second], [LEFT, LEFT])['speed']
+    assert hand == 1
+    assert value == pytest.approx(distance(second[app.THUMB_TIP], second[app.INDEX_TIP]), rel=1e-5)
+
+# Feature, its value for (left hand, right hand) worked out by hand
+FEATURES = [
+    (("distance", app.THUMB_TIP, app.INDEX_TIP),
+     [distance(hand[app.THUMB_TIP], hand[app.INDEX_TIP]) for hand in (LEFT_HAND, RIGHT_HAND)]),
+    (("angle", app.THUMB_TIP, app.WRIST, app.INDEX_TIP),
+     [angle(hand[app.THUMB_TIP], hand[app.WRIST], hand[app.INDEX_TIP]) for hand in (LEFT_HAND, RIGHT_HAND)]),
+    (("extended", "index"), [1.0, 1.0]),
+    (("between_hands", app.INDEX_TIP, app.WRIST), [distance(LEFT_HAND[app.INDEX_TIP], RIGHT_HAND[app.WRIST])] * 2),
+    (("left",), [1.0, 0.0]),
+    (("right",), [0.0, 1.0]),
+    (("hands",), [2.0, 2.0]),
+]
+
+@pytest.mark.parametrize("feature, values", FEATURES, ids=[feature[0] for feature, _ in FEATURES])
+def test_range_rule_of_each_feature_kind(feature, values):
+    registry = app.GestureRegistry()
+    for hand, value in enumerate(values):
+        # Each rule's range holds only the value of one hand (or of both when they share it)
+        registry.register(f"hand_{hand}", feature, None, rules={feature: (value - 1e-3, value + 1e-3)})
+    registry.register('out_of_range', feature, None, rules={feature: (max(values) + 0.5, math.inf)})
+    gestures = fired([LEFT_HAND, RIGHT_HAND], [LEFT, RIGHT], registry)
+
+    assert 'out_of_range' not in gestures
+    for hand, value in enumerate(values):
+        matching = [other for other, other_value in enumerate(values) if abs(other_value - value) <= 1e-3]
+        assert gestures[f"hand_{hand}"] == (matching[-1], pytest.approx(value, rel=1e-4))
@@ -0,0 +1,70 @@
+"""HandDetector roi mode: one box per hand, kept while the hand fits it"""
+import numpy as np
+import pytest
+
+import Magic_Hand_AI as app
+
+W, H = 640, 360
+
+class Model:
+    """Stands in for a single-hand MediaPipe model, only counts resets"""
+    def __init__(self):
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+def hand(center_x, center_y, size=100):
+    """21 landmarks spread over a size x size pixel square, frame-normalized"""
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[:, 0] = (center_x + np.linspace(-size / 2, size / 2, 21)) / W
+    points[:, 1] = (center_y + np.linspace(size / 2, -size / 2, 21)) / H
+    return points
+
+@pytest.fixture
+def detector():
+    detector = app.HandDetector(mode="roi", roi_padding=0.5)
+    detector.roi_hands = [Model() for _ in range(app.MAX_HANDS)]
+    return detector
+
+def test_each_hand_gets_its_own_box(detector):
+    landmarks = np.stack([hand(150, 180), hand(480, 180)])
+    detector._assign_boxes(landmarks, 2, W, H)
+    (left, top, right, bottom), (left2, _, right2, _) = detector.roi_boxes
+    assert right < left2  # Two boxes, not one around both hands
+    assert left <= 150 - 50 - 50 and right >= 150 + 50 + 50 and top <= 180 - 100 and bottom >= 180 + 100
+    assert [model.resets for model in detector.roi_hands] == [1, 1]
+
+def test_box_and_tracking_are_kept_while_the_hand_fits(detector):
+    detector._assign_boxes(np.stack([hand(320, 180)]), 1, W, H)
+    box, model = detector.roi_boxes[0], detector.roi_hands[0]
+    detector._follow_hand(0, hand(330, 185), W, H)
+    assert detector.roi_boxes[0] == box and model.resets == 1
+
+    detector._follow_hand(0, hand(365, 180), W, H)  # Re-centered by less than half the hand: still tracking
+    assert detector.roi_boxes[0] != box and model.resets == 1
+    assert detector._box_fits(detector.roi_boxes[0], hand(365, 180), W, H)
+
+    detector._follow_hand(0, hand(520, 180), W, H)  # Jumped: re-centered and reset
+    assert model.resets == 2
+    assert detector._box_fits(detector.roi_boxes[0], hand(520, 180), W, H)
+
+def test_box_too_big_for_the_hand_is_replaced(detector):
+    detector._assign_boxes(np.stack([hand(320, 180, size=160)]), 1, W, H)
+    assert not detector._box_fits(detector.roi_boxes[0], hand(320, 180, size=60), W, H)
+
+def test_redetected_hands_keep_their_box_and_model(detector):
+    detector._assign_boxes(np.stack([hand(150, 180), hand(480, 180)]), 2, W, H)
+    boxes, models = list(detector.roi_boxes), list(detector.roi_hands)
+
+    # Full-frame detection lists the hands the other way round, the right one moved out of its box
+    detector._assign_boxes(np.stack([hand(560, 110), hand(155, 180)]), 2, W, H)
+    assert detector.roi_boxes[1] == boxes[0] and detector.roi_hands[1] is models[0]
+    assert models[0].resets == 1  # Still tracking
+    assert detector.roi_hands[0] is models[1] and models[1].resets == 2
+    assert detector._box_fits(detector.roi_boxes[0], hand(560, 110), W, H)
+
+def test_map_roi_to_frame():
+    landmarks = np.array([[[0.0, 0.0, 0.1], [1.0, 0.5, -0.2]]], dtype=np.float32)
+    app.HandDetector._map_roi_to_frame(landmarks, (320, 90, 480, 270), W, H)
+    np.testing.assert_allclose(landmarks[0], [[0.5, 0.25, 0.025], [0.75, 0.5, -0.05]], rtol=1e-6)
@@ -0,0 +1,45 @@
+"""IdleScheduler: low-rate detection while nobody is in view, full rate as soon as a hand shows up"""
+import Magic_Hand_AI as app
+
+FPS = 32  # Frame times and the idle interval are exact in binary floating point
+
+def run(scheduler, frames, hands_from=None, start=0):
+    """Feed camera frames at FPS like hand_processor -> capture times of the frames that ran detection"""
+    detected = []
+    for frame in range(start, start + frames):
+        now = frame / FPS
+        if scheduler.should_detect(now):
+            detected.append(now)
+            scheduler.update(hands_from is not None and frame >= hands_from, now)
+    return detected
+
+def test_goes_idle_after_handless_frames():
+    scheduler = app.IdleScheduler(idle_after_frames=10, idle_rate=4.0)
+    assert len(run(scheduler, 9)) == 9 and not scheduler.idle
+    run(scheduler, 1, start=9)
+    assert scheduler.idle and app.DETECTOR_IDLE.value == 1
+
+def test_idle_detects_at_the_idle_rate():
+    scheduler = app.IdleScheduler(idle_after_frames=10, idle_rate=4.0)
+    run(scheduler, 10)
+    detected = run(scheduler, 2 * FPS, start=10)
+    # Every 0.25s, i.e. on every 8th frame
+    assert len(detected) == 8
+    assert all(later - earlier == 0.25 for earlier, later in zip(detected, detected[1:]))
+    assert scheduler.time_until_next_detection(detected[-1]) == 0.25
+
+def test_back_to_full_rate_on_the_first_hand():
+    scheduler = app.IdleScheduler(idle_after_frames=10, idle_rate=4.0)
+    run(scheduler, 10)
+    assert scheduler.idle
+    transitions = app.IDLE_TRANSITIONS.value
+    detected = run(scheduler, FPS, hands_from=20, start=10)
+
+    # Idle detections on frames 17 and 25, the hand (in view from frame 20) is found on 25: every frame after it
+    assert detected == [17 / FPS] + [frame / FPS for frame in range(25, 10 + FPS)]
+    assert not scheduler.idle and app.DETECTOR_IDLE.value == 0
+    assert app.IDLE_TRANSITIONS.value == transitions + 1
+
+def test_zero_frames_disables_idle_mode():
+    scheduler = app.IdleScheduler(idle_after_frames=0)
+    assert len(run(scheduler, 100)) == 100 and not scheduler.idle
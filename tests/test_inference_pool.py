@@ -0,0 +1,102 @@
+"""Inference worker pool: dead and hung workers, giving up on the pool"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import Magic_Hand_AI as app
+
+FRAME_SHAPE = (48, 64, 3)
+
+@pytest.fixture
+def pool():
+    pool = app.InferenceWorkerPool(1, result_timeout=2.0, max_restarts=1)
+    pool.start(FRAME_SHAPE)
+    yield pool
+    pool.close()
+
+def take_frame(pool, sequence):
+    """Pretend the worker just took frame `sequence`"""
+    slot_index = pool.free_slots.popleft()
+    pool.submitted[sequence] = slot_index
+    pool.states[0][1] = time.monotonic()
+    pool.states[0][0] = sequence
+
+def test_healthy_workers_are_left_alone(pool):
+    take_frame(pool, 7)
+    assert pool.check() == []
+    assert pool.restarts == 0
+    assert not pool.has_free_slot()
+
+def test_dead_worker_is_restarted_and_its_frame_lost(pool):
+    lost = app.INFERENCE_TASKS_LOST.value
+    take_frame(pool, 7)
+    process = pool.processes[0]
+    process.kill()
+    process.join()
+    assert pool.check() == [7]
+    assert pool.has_free_slot()
+    assert pool.processes[0] is not process and pool.processes[0].is_alive()
+    assert app.INFERENCE_TASKS_LOST.value == lost + 1
+    assert not pool.failed
+
+def test_hung_worker_is_restarted(pool):
+    take_frame(pool, 3)
+    pool.states[0][1] -= 3.0  # On this frame for longer than result_timeout
+    process = pool.processes[0]
+    assert pool.check() == [3]
+    assert not process.is_alive()
+    assert pool.processes[0].is_alive()
+
+def test_pool_fails_after_max_restarts(pool):
+    for _ in range(2):
+        pool.processes[0].kill()
+        pool.processes[0].join()
+        pool.check()
+    assert pool.failed
+    assert not pool.processes[0].is_alive()  # Not restarted any more
+
+def test_late_result_of_a_lost_frame_is_ignored(pool):
+    take_frame(pool, 5)
+    pool.states[0][1] -= 3.0
+    assert pool.check() == [5]
+    pool.done_queue.put((5, 0, 0, np.zeros((0, 21, 3)), np.zeros(0), np.zeros(0), 0.0, 0.0, 0.0))
+    assert pool.poll(timeout=1.0) is None
+    assert len(pool.free_slots) == 1
+
+def test_dispatch_error_falls_back_to_in_process_inference(monkeypatch):
+    def broken_submit(self, frame, sequence):
+        raise RuntimeError("shared memory gone")
+    monkeypatch.setattr(app.InferenceWorkerPool, 'submit', broken_submit)
+    monkeypatch.setattr(app, 'inference_workers', 1)
+    monkeypatch.setattr(app, 'inference_pool', None)
+    monkeypatch.setattr(app, 'frame_ring', app.FrameRing())
+    monkeypatch.setattr(app, 'idle_scheduler', app.IdleScheduler(idle_after_frames=0))
+    monkeypatch.setattr(app, 'processing_active', True)
+    processor = threading.Thread(target=app.hand_processor, daemon=True)
+    processor.start()
+    
+    processed = []
+    sequence = 0
+    deadline = time.monotonic() + 30
+    try:
+        while len(processed) < 3 and time.monotonic() < deadline:
+            slot = app.frame_ring.acquire()
+            slot.frame_buffer((120, 160, 3)).fill(0)
+            slot.sequence = sequence
+            slot.capture_time = time.perf_counter()
+            app.frame_ring.publish(slot, 'captured')  # Latest wins, like the camera
+            sequence += 1
+            result = app.frame_ring.take('processed', timeout=1.0)
+            if result is not None:
+                processed.append(result.sequence)
+                app.frame_ring.release(result)
+    finally:
+        app.processing_active = False
+        processor.join(timeout=5.0)
+    
+    assert len(processed) == 3 and 0 not in processed  # The frame that hit the error is dropped, later ones aren't
+    assert not processor.is_alive()
+    ring = app.frame_ring
+    assert len(ring.free) + sum(slot is not None for slot in ring.pending.values()) == len(ring.slots)
@@ -0,0 +1,109 @@
+"""LandmarkRecorder files read back through LandmarkRecording"""
+import types
+
+import numpy as np
+import pytest
+
+import Magic_Hand_AI as app
+
+RECORD_SIZE = app.RECORDING_DTYPE.itemsize
+INDEX_SIZE = app.RECORDING_INDEX_DTYPE.itemsize
+
+def make_slot(sequence):
+    """Processed slot with one or two hands whose landmarks encode the sequence number"""
+    num_hands = 1 + sequence % 2
+    landmarks = np.zeros((app.MAX_HANDS, 21, 3), dtype=np.float32)
+    landmarks[:num_hands] = sequence / 1000 + np.arange(21 * 3, dtype=np.float32).reshape(21, 3) / 100
+    return types.SimpleNamespace(sequence=sequence, capture_time=100.0 + sequence / 30, num_hands=num_hands,
+                                 used_roi=sequence % 3 == 0, handedness=np.array([0, 1], dtype=np.int8),
+                                 hand_scores=np.array([0.9, 0.8], dtype=np.float32), hand_landmarks=landmarks)
+
+def write_recording(path, count=40, block_records=16):
+    recorder = app.LandmarkRecorder(str(path), block_records=block_records, metadata={'source': "test"}).start()
+    for sequence in range(count):
+        recorder.record(make_slot(sequence))
+    recorder.close()
+    return path
+
+def header_size(path):
+    data = path.read_bytes()
+    return 12 + int(np.frombuffer(data[8:12], '<u4')[0])
+
+@pytest.fixture
+def recording_path(tmp_path):
+    return write_recording(tmp_path / "session.mhl")
+
+def test_round_trip(recording_path):
+    recording = app.LandmarkRecording(str(recording_path))
+    assert len(recording) == 40
+    assert [len(block) for block in recording.blocks] == [16, 16, 8]
+    assert all(index is not None for index in recording.index)
+    assert recording.metadata['source'] == "test"
+    assert recording.verify() == []
+    for sequence in (0, 15, 16, 39):
+        record, slot = recording[sequence], make_slot(sequence)
+        assert record['sequence'] == sequence
+        assert record['capture_time'] == slot.capture_time
+        assert record['num_hands'] == slot.num_hands
+        assert record['flags'] == slot.used_roi
+        np.testing.assert_array_equal(record['handedness'], slot.handedness)
+        np.testing.assert_array_equal(record['scores'], slot.hand_scores)
+        np.testing.assert_array_equal(record['landmarks'], slot.hand_landmarks)
+    assert recording[-1]['sequence'] == 39
+    with pytest.raises(IndexError):
+        recording[40]
+    recording.close()
+
+def test_slicing(recording_path):
+    recording = app.LandmarkRecording(str(recording_path))
+    assert list(recording[3:10]['sequence']) == list(range(3, 10))  # Inside one block
+    assert list(recording[10:35]['sequence']) == list(range(10, 35))  # Across index blocks
+    assert list(recording[5:30:4]['sequence']) == list(range(5, 30, 4))
+    assert list(recording[::-1]['sequence']) == list(range(39, -1, -1))
+    assert len(recording[20:10]) == 0
+    assert list(recording['sequence']) == list(range(40))
+    recording.close()
+
+def test_between(recording_path):
+    recording = app.LandmarkRecording(str(recording_path))
+    records = recording.between(100.0 + 10 / 30, 100.0 + 20 / 30)
+    assert list(records['sequence']) == list(range(10, 20))  # End time excluded
+    assert list(recording.between(100.0 + 31.5 / 30, 1000.0)['sequence']) == list(range(32, 40))
+    assert len(recording.between(0.0, 99.0)) == 0
+    assert len(recording.between(200.0, 300.0)) == 0
+    recording.close()
+
+def test_crc_detects_corrupted_block(recording_path):
+    data = bytearray(recording_path.read_bytes())
+    # A landmark byte of the fifth record in the second block
+    position = header_size(recording_path) + 16 * RECORD_SIZE + INDEX_SIZE + 4 * RECORD_SIZE + RECORD_SIZE - 10
+    data[position] ^= 0xFF
+    recording_path.write_bytes(bytes(data))
+    
+    recording = app.LandmarkRecording(str(recording_path))
+    assert len(recording) == 40
+    assert recording.verify() == [1]
+    assert recording.summary()['corrupt_blocks'] == [1]
+    recording.close()
+
+@pytest.mark.parametrize("extra_bytes", [0, 10])
+def test_truncated_recording(recording_path, extra_bytes):
+    # Crash while writing the last block: 5 whole records (and part of the next one) without an index block
+    size = header_size(recording_path) + 2 * (16 * RECORD_SIZE + INDEX_SIZE) + 5 * RECORD_SIZE + extra_bytes
+    recording_path.write_bytes(recording_path.read_bytes()[:size])
+    
+    recording = app.LandmarkRecording(str(recording_path))
+    assert len(recording) == 37
+    assert [len(block) for block in recording.blocks] == [16, 16, 5]
+    assert recording.index[-1] is None
+    assert recording.verify() == []
+    assert list(recording[30:]['sequence']) == list(range(30, 37))
+    assert list(recording.between(100.0 + 34 / 30, 1000.0)['sequence']) == [34, 35, 36]
+    assert recording.summary()['unindexed_records'] == 5
+    recording.close()
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"something else entirely")
+    with pytest.raises(ValueError):
+        app.LandmarkRecording(str(path))
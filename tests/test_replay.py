@@ -0,0 +1,50 @@
+"""Offline replay of recorded landmarks"""
+import numpy as np
+
+import Magic_Hand_AI as app
+from benchmarks.synthetic import synthetic_hands
+
+def synthetic_records(count=300, fps=30):
+    """Two moving hands (volume), then only one (speed), in RECORDING_DTYPE layout"""
+    records = np.zeros(count, dtype=app.RECORDING_DTYPE)
+    for number, record in enumerate(records):
+        record['sequence'] = number
+        record['capture_time'] = 100.0 + number / fps
+        record['num_hands'] = 2 if number < count // 2 else 1
+        record['handedness'] = [0, 1]
+        record['scores'] = 0.9
+        record['landmarks'] = synthetic_hands(number)
+    return records
+
+def test_replay_is_deterministic():
+    records = synthetic_records()
+    first, stats = app.replay_landmarks(records)
+    second, _ = app.replay_landmarks(records)
+    assert stats['events']['volume'] > 0
+    assert app.compare_actuation_events(second, first) == []
+
+def test_replay_does_not_register_metrics():
+    metric_count = len(app.metrics.metrics)
+    app.replay_landmarks(synthetic_records(count=30))
+    app.replay_landmarks(synthetic_records(count=30))
+    assert len(app.metrics.metrics) == metric_count
+    assert app.metrics.render_prometheus().count('magic_hand_actuator_applied_total{actuator="volume"}') == 1
+
+def test_replay_leaves_the_live_actuators_alone(monkeypatch):
+    calls = []
+    monkeypatch.setattr(app, "adjust_system_volume", lambda target: calls.append(target) or target)
+    monkeypatch.setattr(app, "system_volume", 37)
+    live = (app.actuator_scheduler, app.browser_scheduler, app.live_control.set_volume)
+    connected = app.BROWSER_CONNECTED.value
+    app.replay_landmarks(synthetic_records())
+    assert (app.actuator_scheduler, app.browser_scheduler, app.live_control.set_volume) == live
+    assert all(action.pending is None for scheduler in live[:2] for action in scheduler.actions.values())
+    assert app.system_volume == 37 and calls == []
+    assert app.BROWSER_CONNECTED.value == connected
+
+def test_compare_actuation_events_reports_differences():
+    events, _ = app.replay_landmarks(synthetic_records())
+    changed = [dict(event) for event in events]
+    changed[0]['value'] = changed[0]['value'] + 1
+    assert [difference['event'] for difference in app.compare_actuation_events(changed, events)] == [0]
+    assert app.compare_actuation_events(events[:-1], events)[-1]['got_events'] == len(events) - 1
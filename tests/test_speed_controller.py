@@ -0,0 +1,80 @@
+"""SpeedController steps and the labelled speed scenarios"""
+import pytest
+
+import Magic_Hand_AI as app
+
+# Speed filter defaults (--speed-filter-*), so a --config can't change the expected steps
+FILTER_OPTIONS = {'alpha': 0.2, 'responsiveness': 0.85, 'min_alpha': 0.05, 'max_alpha': 0.5,
+                  'prediction_factor': 0.4, 'max_deviation': 0.12, 'predict': True}
+
+@pytest.mark.parametrize("name, net_steps, updates", [
+    ("hold", 0, 0),
+    ("wobble", 0, 0),
+    ("open_slow", 3, 3),
+    ("open_fast", 3, 3),
+    ("pinch_fast", -3, 3),
+    ("open_close", 0, 6),
+])
+def test_speed_scenarios(name, net_steps, updates):
+    times, distances, expected, movement_start = app.speed_scenarios()[name]
+    result, net = app.simulate_speed_trace(times, distances, filter_options=FILTER_OPTIONS)
+    assert net == expected == net_steps
+    assert len(result) == updates
+    if movement_start is not None:
+        assert result[0][0] >= movement_start
+
+def controller(**options):
+    options = {'step_distance': 0.04, 'dead_band': 0.0, 'hysteresis': 0.015, 'max_step_rate': 1000.0, **options}
+    speed = app.SpeedController(app.speed_values, initial_index=3, **options)
+    speed.update(0.10, 0.0)
+    return speed
+
+def test_dead_band_ignores_wobble():
+    speed = controller(dead_band=0.01)
+    for step, distance in enumerate([0.109, 0.091, 0.1095, 0.0905]):
+        assert speed.update(distance, step + 1.0) is None
+    assert speed.tracked == pytest.approx(0.10)
+    
+    # Beyond the dead band the tracked distance follows, lagging by the dead band
+    speed.update(0.13, 5.0)
+    assert speed.tracked == pytest.approx(0.12)
+
+def test_step_boundary_includes_half_the_hysteresis():
+    speed = controller()
+    assert speed.update(0.127, 1.0) is None  # Halfway (0.02) plus half the hysteresis (0.0075) not reached
+    assert speed.update(0.128, 2.0) == 4
+    assert speed.anchor == pytest.approx(0.14)
+
+def test_hysteresis_keeps_the_step_on_the_way_back():
+    speed = controller()
+    assert speed.update(0.128, 1.0) == 4
+    # Below the midpoint between the two steps, but not by half the hysteresis band yet
+    assert speed.update(0.115, 2.0) is None
+    assert speed.update(0.113, 3.0) is None
+    assert speed.update(0.112, 4.0) == 3
+
+def test_without_hysteresis_midpoint_is_the_boundary():
+    speed = controller(hysteresis=0.0)
+    assert speed.update(0.121, 1.0) == 4
+    assert speed.update(0.119, 2.0) == 3
+
+def test_max_step_rate():
+    speed = controller(max_step_rate=4.0)
+    steps = []
+    for tick in range(1, 101):
+        now = tick / 100
+        if speed.update(0.40, now) is not None:
+            steps.append(now)
+    assert len(steps) == 4  # 1.0x -> 2.0x, then the fastest speed
+    assert speed.speed == app.speed_values[-1]
+    assert all(later - earlier >= 0.25 for earlier, later in zip(steps, steps[1:]))
+    assert steps[-1] - steps[0] < 0.25 * 3 + 0.05  # Each step as soon as it's allowed again
+
+def test_fastest_speed_follows_the_hand():
+    speed = controller(max_step_rate=1000.0)
+    for tick in range(1, 10):
+        speed.update(0.40, float(tick))
+    assert speed.index == len(app.speed_values) - 1
+    assert speed.anchor == pytest.approx(0.40)
+    # Turning back steps down after the usual distance, not after unwinding the whole way past the top
+    assert speed.update(0.372, 20.0) == len(app.speed_values) - 2